@@ -0,0 +1,155 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from gazetteer import normalize_tokens
+
+# Palavras ignoradas nos nomes (não identificam o estabelecimento)
+STOP_WORDS = {'de', 'da', 'do', 'das', 'dos', 'e', 'a', 'o', 'the', 'and', '&'}
+
+# Palavras com pelo menos este tamanho aceitam um erro de digitação (distância 1)
+FUZZY_MIN_LENGTH = 5
+
+# Pesos da confiança (mesmos do cálculo original)
+WEIGHT_FULL_NAME = 0.6
+WEIGHT_PARTIAL_NAME = 0.3
+WEIGHT_CITY = 0.2
+WEIGHT_NEIGHBORHOOD = 0.15
+WEIGHT_CATEGORY = 0.05
+
+# Conceitos avaliados para cada estabelecimento (colunas da matriz de conceitos)
+FULL_NAME, PARTIAL_NAME, CITY, NEIGHBORHOOD, CATEGORY = range(5)
+CONCEPTS = 5
+
+
+def _deletions(token: str) -> Set[str]:
+    """Variações com uma letra a menos (base da comparação com distância 1)"""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def ad_tokens(ad: Dict) -> Set[str]:
+    """Palavras normalizadas do texto e do anunciante de um anúncio"""
+    return set(normalize_tokens(f"{ad.get('ad_text', '')} {ad.get('advertiser_name', '')}"))
+
+
+class AdMatcher:
+    """Compara muitos anúncios com um ou mais estabelecimentos de uma vez
+
+    Cada estabelecimento vira um conjunto de termos (palavras do nome, da cidade,
+    do bairro e da categoria, sem acentos). Cada anúncio é normalizado uma única
+    vez em uma linha de uma matriz anúncios × termos; a correspondência e a
+    confiança de todos os pares saem de um produto de matrizes. Termos com 5 ou
+    mais letras aceitam um erro de digitação ("pizaria" encontra "pizzaria").
+    """
+
+    def __init__(self, establishments: Iterable[Dict]):
+        self.establishments = list(establishments)
+        self._term_index: Dict[str, int] = {}
+        self._fuzzy_index: Dict[str, Set[int]] = {}  # variação -> termos
+        self._exact_index: Dict[str, Set[int]] = {}  # palavra -> termos
+
+        # Por conceito: lista de (estabelecimento, conceito, termos exigidos, exige todos?)
+        requirements = []
+        for index, info in enumerate(self.establishments):
+            name_terms = self._terms(info.get('name', ''))
+            significant = [term for term, word in zip(name_terms, self._words(info.get('name', '')))
+                           if len(word) > 3]
+            requirements.append((index, FULL_NAME, name_terms, True))
+            requirements.append((index, PARTIAL_NAME, significant, False))
+            requirements.append((index, CITY, self._terms(info.get('city', '')), True))
+            requirements.append((index, NEIGHBORHOOD, self._terms(info.get('neighborhood', '')), True))
+            requirements.append((index, CATEGORY, self._terms(info.get('category', '')), True))
+
+        # Matriz termos × conceitos e número de termos que cada conceito precisa
+        num_terms = len(self._term_index)
+        num_columns = len(self.establishments) * CONCEPTS
+        self._requirement_matrix = np.zeros((max(num_terms, 1), max(num_columns, 1)), dtype=np.int32)
+        self._required = np.full(max(num_columns, 1), np.iinfo(np.int32).max, dtype=np.int32)
+        for index, concept, terms, require_all in requirements:
+            if not terms:
+                continue
+            column = index * CONCEPTS + concept
+            for term in set(terms):
+                self._requirement_matrix[term, column] = 1
+            self._required[column] = len(set(terms)) if require_all else 1
+
+    @staticmethod
+    def _words(text: str) -> List[str]:
+        return [word for word in normalize_tokens(text) if word not in STOP_WORDS]
+
+    def _terms(self, text: str) -> List[int]:
+        """Registra as palavras do texto como termos e devolve seus índices"""
+        terms = []
+        for word in self._words(text):
+            term = self._term_index.get(word)
+            if term is None:
+                term = self._term_index[word] = len(self._term_index)
+                self._exact_index.setdefault(word, set()).add(term)
+                if len(word) >= FUZZY_MIN_LENGTH:
+                    for variant in _deletions(word):
+                        self._fuzzy_index.setdefault(variant, set()).add(term)
+            terms.append(term)
+        return terms
+
+    def _lookup(self, token: str) -> Set[int]:
+        """Termos que a palavra do anúncio satisfaz (igual ou a uma letra de distância)"""
+        terms = set(self._exact_index.get(token, ()))
+        if len(token) >= FUZZY_MIN_LENGTH:
+            for variant in _deletions(token):
+                # Letra a mais no anúncio
+                if len(variant) >= FUZZY_MIN_LENGTH:
+                    terms.update(self._exact_index.get(variant, ()))
+                # Letra trocada
+                terms.update(self._fuzzy_index.get(variant, ()))
+        if len(token) >= FUZZY_MIN_LENGTH - 1:
+            # Letra a menos no anúncio
+            terms.update(self._fuzzy_index.get(token, ()))
+        return terms
+
+    def term_matrix(self, ads: List[Dict]) -> np.ndarray:
+        """Matriz anúncios × termos (1 quando o anúncio contém o termo)"""
+        matrix = np.zeros((len(ads), max(len(self._term_index), 1)), dtype=np.int32)
+        cache: Dict[str, Set[int]] = {}
+        rows, columns = [], []
+        for row, ad in enumerate(ads):
+            found = set()
+            for token in ad_tokens(ad):
+                terms = cache.get(token)
+                if terms is None:
+                    terms = cache[token] = self._lookup(token)
+                found.update(terms)
+            rows.extend([row] * len(found))
+            columns.extend(found)
+        matrix[rows, columns] = 1
+        return matrix
+
+    def score(self, ads: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Correspondência (bool) e confiança de cada anúncio × estabelecimento"""
+        shape = (len(ads), len(self.establishments))
+        if not ads or not self.establishments:
+            return np.zeros(shape, dtype=bool), np.zeros(shape)
+
+        hits = self.term_matrix(ads) @ self._requirement_matrix
+        satisfied = (hits >= self._required)[:, :shape[1] * CONCEPTS].reshape(shape[0], shape[1], CONCEPTS)
+
+        full_name = satisfied[:, :, FULL_NAME]
+        partial_name = satisfied[:, :, PARTIAL_NAME]
+        name_match = full_name | partial_name
+        location = satisfied[:, :, CITY] | satisfied[:, :, NEIGHBORHOOD]
+
+        matches = name_match | (location & satisfied[:, :, CATEGORY])
+        confidence = (
+            np.where(full_name, WEIGHT_FULL_NAME, np.where(partial_name, WEIGHT_PARTIAL_NAME, 0.0))
+            + WEIGHT_CITY * satisfied[:, :, CITY]
+            + WEIGHT_NEIGHBORHOOD * satisfied[:, :, NEIGHBORHOOD]
+            + WEIGHT_CATEGORY * satisfied[:, :, CATEGORY]
+        )
+        return matches, np.minimum(confidence, 1.0)
+
+    def match(self, ads: List[Dict], establishment: int = 0) -> List[Tuple[bool, float]]:
+        """(corresponde?, confiança) de cada anúncio para um estabelecimento"""
+        matches, confidence = self.score(ads)
+        return [
+            (bool(matches[row, establishment]), round(float(confidence[row, establishment]), 3))
+            for row in range(len(ads))
+        ]
@@ -0,0 +1,419 @@
+import hashlib
+import logging
+import re
+import threading
+import urllib.parse
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from bs4 import BeautifulSoup, FeatureNotFound, Tag
+
+from config import ScraperConfig
+
+logger = logging.getLogger(__name__)
+
+# Palavras que indicam que a linha não é o nome do anunciante
+NON_ADVERTISER_WORDS = [
+    'biblioteca', 'anúncios', 'filtros', 'resultado',
+    'ativo', 'lançados', 'veiculação', 'plataformas'
+]
+
+# Palavras que encerram a captura do texto do anúncio
+AD_TEXT_STOP_WORDS = [
+    'ifood.com', 'facebook.com', 'identificação da biblioteca',
+    'veiculação iniciada', 'plataformas', 'ver detalhes'
+]
+
+# Domínios considerados como link de destino do anúncio
+LINK_DOMAINS = ['ifood.com', 'instagram.com', 'whatsapp']
+
+# Frases que indicam que a busca não retornou anúncios
+NO_RESULTS_PHRASES = ['nenhum resultado', 'no results', '0 resultado', 'sem anúncios']
+
+SPONSORED_MARKERS = ('Patrocinado', 'Sponsored')
+AD_INFO_MARKERS = ('Identificação da biblioteca', 'Veiculação iniciada')
+
+# Executor de processos para o parsing de snapshots (criado sob demanda)
+_parse_executor = None
+_parse_executor_lock = threading.Lock()
+
+
+def empty_ad_data() -> Dict:
+    """Estrutura padrão de um anúncio extraído"""
+    return {
+        'advertiser_name': '',
+        'ad_text': '',
+        'ad_type': '',
+        'start_date': '',
+        'end_date': '',
+        'impressions': '',
+        'spend': '',
+        'demographics': {},
+        'locations': [],
+        'image_urls': [],
+        'video_urls': [],
+        'link_url': '',
+        'ad_id': '',
+        'platforms': [],
+        'scraped_at': datetime.now().isoformat()
+    }
+
+
+def extract_advertiser_name(lines: List[str], links: List[Dict]) -> str:
+    """Nome do anunciante a partir das linhas do texto e dos links do anúncio"""
+    # Estratégia 1: Procura por texto antes de "Patrocinado"
+    for i, line in enumerate(lines):
+        if 'Patrocinado' in line and i > 0:
+            potential_name = lines[i-1].strip()
+            if potential_name and len(potential_name) > 2 and len(potential_name) < 100:
+                return potential_name
+
+    # Estratégia 2: Procura por links do Facebook
+    for link in links:
+        href = link.get('href') or ''
+        text = (link.get('text') or '').strip()
+        if 'facebook.com' in href and text and len(text) > 2:
+            return text
+
+    # Estratégia 3: Procura na primeira linha válida
+    for line in lines[:10]:  # Verifica as primeiras 10 linhas
+        line = line.strip()
+        if (len(line) > 2 and len(line) < 100 and
+            not any(word in line.lower() for word in NON_ADVERTISER_WORDS)):
+            return line
+
+    return ''
+
+
+def extract_ad_text(lines: List[str],
+                    paragraphs: Union[List[str], Callable[[], List[str]]] = None) -> str:
+    """Texto do anúncio: linhas após "Patrocinado" até encontrar links ou metadata"""
+    capturing = False
+    captured_lines = []
+
+    for line in lines:
+        line = line.strip()
+
+        if 'Patrocinado' in line:
+            capturing = True
+            continue
+
+        if capturing:
+            # Para de capturar se encontrar metadata ou links
+            if any(stop_word in line.lower() for stop_word in AD_TEXT_STOP_WORDS):
+                break
+
+            # Adiciona linha se for texto relevante
+            if line and len(line) > 5 and not line.startswith('#'):
+                captured_lines.append(line)
+
+            # Limita a quantidade de texto
+            if len(captured_lines) >= 5:
+                break
+
+    ad_text = ' '.join(captured_lines)
+
+    # Se não conseguiu capturar assim, usa parágrafos com texto significativo
+    if not ad_text and paragraphs is not None:
+        if callable(paragraphs):
+            paragraphs = paragraphs()
+        texts = []
+        for text in paragraphs[:3]:
+            text = (text or '').strip()
+            if (len(text) > 30 and len(text) < 500 and
+                'Identificação da biblioteca' not in text and
+                'Veiculação iniciada' not in text):
+                texts.append(text)
+        ad_text = ' '.join(texts)
+
+    return ad_text[:500]  # Limita a 500 caracteres
+
+
+def extract_ad_id(element_text: str, lines: List[str]) -> str:
+    """ID da biblioteca de anúncios"""
+    if 'Identificação da biblioteca:' in element_text:
+        for line in lines:
+            if 'Identificação da biblioteca:' in line:
+                return line.replace('Identificação da biblioteca:', '').strip()
+    return ''
+
+
+def has_useful_data(ad_data: Dict) -> bool:
+    return bool(ad_data['advertiser_name'] or (ad_data['ad_text'] and len(ad_data['ad_text']) > 30))
+
+
+def build_ad_data(element_text: str, links: List[Dict], image_srcs: List[str],
+                  paragraphs: Union[List[str], Callable[[], List[str]]] = None) -> Dict:
+    """Monta os dados de um anúncio a partir do conteúdo já coletado do elemento
+
+    ``links`` é uma lista de {'href', 'text'} e ``paragraphs`` são os textos de
+    parágrafos usados quando não há texto após "Patrocinado" (pode ser uma função,
+    para que a coleta só aconteça quando necessária). Retorna {} quando o elemento
+    não tem dados úteis.
+    """
+    ad_data = empty_ad_data()
+    element_text = (element_text or '').strip()
+    lines = element_text.split('\n')
+
+    ad_data['ad_id'] = extract_ad_id(element_text, lines)
+    ad_data['advertiser_name'] = extract_advertiser_name(lines, links)
+    ad_data['ad_text'] = extract_ad_text(lines, paragraphs)
+
+    # Extrai data de início
+    if 'Veiculação iniciada em' in element_text:
+        for line in lines:
+            if 'Veiculação iniciada em' in line:
+                ad_data['start_date'] = line.strip()
+                break
+
+    # Extrai URLs de imagens
+    image_urls = [src for src in image_srcs if src and ('scontent' in src or 'fbcdn' in src)]
+    ad_data['image_urls'] = image_urls[:3]  # Limita a 3 imagens
+
+    # Extrai link de destino
+    for link in links:
+        href = link.get('href') or ''
+        if any(domain in href for domain in LINK_DOMAINS):
+            ad_data['link_url'] = href
+            break
+
+    # Só retorna se encontrou dados úteis
+    return ad_data if has_useful_data(ad_data) else {}
+
+
+def build_match_data(payload: Dict) -> Dict:
+    """Monta só os campos usados na verificação de correspondência (sem imagens, links e datas)"""
+    if not payload:
+        return {}
+
+    element_text = (payload.get('text') or '').strip()
+    lines = element_text.split('\n')
+    ad_data = {
+        'advertiser_name': extract_advertiser_name(lines, payload.get('links') or []),
+        'ad_text': extract_ad_text(lines, payload.get('paragraphs') or []),
+        'ad_id': extract_ad_id(element_text, lines)
+    }
+    return ad_data if has_useful_data(ad_data) else {}
+
+
+def build_ad_data_from_payload(payload: Dict) -> Dict:
+    """Monta os dados de um anúncio a partir do JSON devolvido pelo script de extração"""
+    if not payload:
+        return {}
+    return build_ad_data(
+        payload.get('text', ''),
+        payload.get('links') or [],
+        payload.get('images') or [],
+        payload.get('paragraphs') or []
+    )
+
+
+class AdDedupeIndex:
+    """Índice dos anúncios já vistos em uma requisição
+    
+    A chave é a identificação da biblioteca de anúncios; sem ela, um hash do
+    anunciante e do início do texto normalizados. Cada anúncio pode guardar um
+    valor (ex.: o resultado da correspondência) para não ser processado de novo
+    quando aparece em outra estratégia ou página.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self.duplicates = 0
+
+    @staticmethod
+    def key_for(ad_data: Dict) -> str:
+        ad_id = re.sub(r'\D', '', ad_data.get('ad_id') or '')
+        if ad_id:
+            return f"id:{ad_id}"
+        text = f"{(ad_data.get('advertiser_name') or '')[:50]}_{(ad_data.get('ad_text') or '')[:100]}"
+        text = re.sub(r'\s+', '', text.lower())
+        return f"hash:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
+    def add(self, ad_data: Dict, value: Any = True) -> bool:
+        """Registra o anúncio; retorna False se ele já tinha sido visto"""
+        key = self.key_for(ad_data)
+        if key in self._values:
+            self.duplicates += 1
+            return False
+        self._values[key] = value
+        return True
+
+    def get(self, ad_data: Dict, default: Any = None) -> Any:
+        """Valor guardado para o anúncio (ou ``default`` se ainda não foi visto)"""
+        return self._values.get(self.key_for(ad_data), default)
+
+    def __contains__(self, ad_data: Dict) -> bool:
+        return self.key_for(ad_data) in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def unique_ads(extracted_ads: List[Dict], index: Optional[AdDedupeIndex] = None) -> List[Dict]:
+    """Remove anúncios vazios e duplicados mantendo a ordem da página
+    
+    ``index`` permite compartilhar os anúncios já vistos entre várias buscas.
+    """
+    ads_data = []
+    if index is None:
+        index = AdDedupeIndex()
+
+    for i, ad_data in enumerate(extracted_ads):
+        if ad_data and (ad_data.get('advertiser_name') or ad_data.get('ad_text')):
+            if index.add(ad_data):
+                ads_data.append(ad_data)
+
+                # Log melhorado
+                advertiser = ad_data.get('advertiser_name', 'N/A')
+                text_preview = ad_data.get('ad_text', '')[:50]
+                ad_id = ad_data.get('ad_id', 'N/A')
+                logger.info(f"Anúncio {len(ads_data)} extraído: {advertiser} | ID: {ad_id} | Texto: {text_preview}...")
+            else:
+                logger.debug(f"Anúncio {i+1} ignorado (duplicata)")
+        else:
+            logger.debug(f"Anúncio {i+1} sem dados válidos")
+
+    return ads_data
+
+
+def debug_ads_for_page(page_text: str, current_url: str) -> List[Dict]:
+    """Resultado devolvido quando a página carregou mas nenhum anúncio foi extraído"""
+    # Verifica se há indicação de que não há anúncios
+    if any(phrase in page_text.lower() for phrase in NO_RESULTS_PHRASES):
+        logger.info("Página indica que não há anúncios para os critérios especificados")
+        return []
+
+    # Cria um anúncio de debug apenas se necessário
+    return [{
+        'advertiser_name': 'Debug - Análise da página',
+        'ad_text': 'Página carregada mas nenhum anúncio específico foi extraído',
+        'debug_info': f"URL: {current_url}",
+        'page_sample': page_text[:300] + "...",
+        'scraped_at': datetime.now().isoformat()
+    }]
+
+
+def _make_soup(html: str) -> BeautifulSoup:
+    try:
+        return BeautifulSoup(html, 'lxml')
+    except FeatureNotFound:
+        return BeautifulSoup(html, 'html.parser')
+
+
+def find_ad_containers(soup: BeautifulSoup, max_results: int = 50) -> List[Tag]:
+    """Localiza os containers de anúncio em um snapshot da página
+
+    Mesma regra da busca por "Patrocinado" feita no navegador: a partir de cada
+    texto patrocinado sobe até 5 níveis procurando o container com os dados do
+    anúncio. O texto de cada ancestral é calculado uma única vez.
+    """
+    text_cache = {}
+
+    def text_of(tag: Tag) -> str:
+        key = id(tag)
+        if key not in text_cache:
+            text_cache[key] = tag.get_text()
+        return text_cache[key]
+
+    containers = []
+    seen = set()
+    for marker in soup.find_all(string=lambda s: s and any(m in s for m in SPONSORED_MARKERS)):
+        container = marker.parent
+        for _ in range(5):
+            if container is None or container.parent is None:
+                break
+            container = container.parent
+            container_text = text_of(container)
+            if any(m in container_text for m in AD_INFO_MARKERS) or len(container_text) > 200:
+                key = container_text[:100]
+                if key not in seen:
+                    seen.add(key)
+                    containers.append(container)
+                break
+        if len(containers) >= max_results:
+            break
+
+    return containers
+
+
+def _own_text(tag: Tag) -> str:
+    return ''.join(tag.find_all(string=True, recursive=False))
+
+
+def payload_from_container(container: Tag, base_url: str = "https://www.facebook.com/") -> Dict:
+    """Converte um container do snapshot no mesmo payload do script de extração"""
+    links = [
+        {'href': urllib.parse.urljoin(base_url, a.get('href') or ''), 'text': a.get_text(' ', strip=True)}
+        for a in container.find_all('a')
+    ]
+    images = [img.get('src') or '' for img in container.find_all('img')]
+
+    paragraphs = []
+    for tag in container.find_all(['p', 'div']):
+        if tag.name == 'p' or len(_own_text(tag)) > 30:
+            paragraphs.append(tag.get_text(' ', strip=True))
+            if len(paragraphs) >= 3:
+                break
+
+    return {
+        'text': container.get_text('\n', strip=True),
+        'links': links,
+        'images': images,
+        'paragraphs': paragraphs
+    }
+
+
+def parse_page_source(html: str, max_results: int = 50, match_only: bool = False) -> List[Dict]:
+    """Extrai os anúncios de um snapshot HTML (mesmos dicts de extract_ad_data)
+
+    Com ``match_only`` devolve só anunciante, texto e ID (build_match_data).
+    """
+    soup = _make_soup(html)
+    build = build_match_data if match_only else build_ad_data_from_payload
+    return [
+        build(payload_from_container(container))
+        for container in find_ad_containers(soup, max_results)
+    ]
+
+
+def parse_search_snapshot(html: str, current_url: str, max_results: int = 50) -> List[Dict]:
+    """Processa o snapshot de uma página de busca até a lista final de anúncios"""
+    ads_data = unique_ads(parse_page_source(html, max_results))
+    if ads_data:
+        logger.info(f"Total de anúncios únicos extraídos: {len(ads_data)}")
+        return ads_data
+
+    logger.warning("Nenhum anúncio válido encontrado no snapshot")
+    soup = _make_soup(html)
+    body = soup.body or soup
+    return debug_ads_for_page(body.get_text('\n', strip=True), current_url)
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Executor de processos compartilhado para o parsing de snapshots"""
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            _parse_executor = ProcessPoolExecutor(max_workers=ScraperConfig.PARSER_WORKERS or None)
+        return _parse_executor
+
+
+def submit_page_source(html: str, max_results: int = 50, match_only: bool = False) -> Future:
+    """Agenda a extração dos anúncios de um snapshot em outro processo"""
+    return get_parse_executor().submit(parse_page_source, html, max_results, match_only)
+
+
+def submit_search_snapshot(html: str, current_url: str, max_results: int = 50) -> Future:
+    """Agenda o parsing de um snapshot em outro processo"""
+    return get_parse_executor().submit(parse_search_snapshot, html, current_url, max_results)
+
+
+def shutdown_parse_executor():
+    """Encerra os processos de parsing"""
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is not None:
+            _parse_executor.shutdown(wait=False, cancel_futures=True)
+            _parse_executor = None
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark do localizador de anúncios (FIND_AD_CANDIDATES_SCRIPT)
+
+Gera páginas grandes no formato da biblioteca de anúncios e compara o script
+antigo (querySelectorAll('*') lendo textContent de cada elemento e de até 5
+ancestrais) com o localizador atual baseado em TreeWalker. Os scripts rodam no
+Chrome quando ele está disponível; a versão equivalente em Python (usada no
+parsing de snapshots) é medida sempre.
+
+Uso: python bench_candidate_finder.py [--ads 50 200 500] [--repeat 3]
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+from bs4 import BeautifulSoup
+
+from ad_parser import find_ad_containers
+
+# Script usado antes em search_ads_by_keywords e na busca focada
+LEGACY_FIND_SCRIPT = """
+    const ads = [];
+    const allElements = document.querySelectorAll('*');
+
+    allElements.forEach(elem => {
+        const text = elem.textContent || '';
+        if (text.includes('Patrocinado') || text.includes('Sponsored')) {
+            let container = elem;
+            for (let i = 0; i < 5; i++) {
+                container = container.parentElement;
+                if (!container) break;
+
+                const containerText = container.textContent || '';
+                if (containerText.includes('Identificação da biblioteca') ||
+                    containerText.length > 200) {
+                    ads.push(container);
+                    break;
+                }
+            }
+        }
+    });
+
+    const unique = [];
+    const seen = new Set();
+
+    ads.forEach(ad => {
+        const key = ad.textContent.substring(0, 100);
+        if (!seen.has(key)) {
+            seen.add(key);
+            unique.push(ad);
+        }
+    });
+
+    return unique.slice(0, arguments[0]);
+"""
+
+# Executa um script dentro do navegador e mede só o tempo de execução em JavaScript
+TIMED_WRAPPER = """
+    const source = arguments[0];
+    const args = Array.prototype.slice.call(arguments, 1);
+    const fn = new Function(source);
+    const start = performance.now();
+    const result = fn.apply(null, args);
+    return [performance.now() - start, result.length];
+"""
+
+
+def build_fixture_page(num_ads: int, filler_per_ad: int = 40, depth: int = 12) -> str:
+    """Monta uma página com ``num_ads`` anúncios aninhados e conteúdo de preenchimento"""
+    cards = []
+    for i in range(num_ads):
+        filler = ''.join(
+            f'<div class="f"><span>Texto de preenchimento {i}-{j} com algumas palavras</span></div>'
+            for j in range(filler_per_ad)
+        )
+        inner = (
+            f'<div><a href="https://www.facebook.com/anunciante{i}">Anunciante {i}</a></div>'
+            f'<div><span>Patrocinado</span></div>'
+            f'<div><p>Oferta especial número {i} para clientes da região, aproveite hoje!</p></div>'
+            f'<div>Identificação da biblioteca: {100000 + i}</div>'
+            f'<div>Veiculação iniciada em 1 de jan de 2024</div>'
+            f'<img src="https://scontent.fbcdn.net/v/{i}.jpg">'
+        )
+        card = inner
+        for _ in range(depth):
+            card = f'<div class="x1lliihq">{card}</div>'
+        cards.append(f'<div class="card">{card}{filler}</div>')
+
+    return f"<html><head><meta charset='utf-8'></head><body><div id='root'>{''.join(cards)}</div></body></html>"
+
+
+def legacy_find_containers(soup: BeautifulSoup, max_results: int = 50):
+    """Equivalente em Python do script antigo (quadrático no tamanho do DOM)"""
+    ads = []
+    for elem in soup.find_all(True):
+        text = elem.get_text()
+        if 'Patrocinado' in text or 'Sponsored' in text:
+            container = elem
+            for _ in range(5):
+                container = container.parent
+                if container is None or container.name == '[document]':
+                    break
+                container_text = container.get_text()
+                if 'Identificação da biblioteca' in container_text or len(container_text) > 200:
+                    ads.append(container)
+                    break
+
+    unique = []
+    seen = set()
+    for ad in ads:
+        key = ad.get_text()[:100]
+        if key not in seen:
+            seen.add(key)
+            unique.append(ad)
+    return unique[:max_results]
+
+
+def best_of(repeat: int, fn):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_python(html: str, num_ads: int, repeat: int):
+    soup = BeautifulSoup(html, 'html.parser')
+    legacy_time, legacy = best_of(repeat, lambda: legacy_find_containers(soup, num_ads))
+    new_time, new = best_of(repeat, lambda: find_ad_containers(soup, num_ads))
+    return legacy_time * 1000, len(legacy), new_time * 1000, len(new)
+
+
+def start_browser():
+    """Inicia o Chrome do scraper; retorna None se não estiver disponível"""
+    try:
+        from facebook_ads_scraper import FacebookAdsLibraryScraper
+        scraper = FacebookAdsLibraryScraper(headless=True)
+        scraper.setup_driver()
+        return scraper
+    except Exception as e:
+        print(f"⚠️  Chrome indisponível, medindo apenas a versão em Python: {e}")
+        return None
+
+
+def bench_browser(driver, html: str, num_ads: int, repeat: int):
+    from facebook_ads_scraper import FIND_AD_CANDIDATES_SCRIPT
+
+    with tempfile.NamedTemporaryFile('w', suffix='.html', delete=False, encoding='utf-8') as f:
+        f.write(html)
+        path = f.name
+
+    try:
+        driver.get('file://' + os.path.abspath(path))
+        results = {}
+        for name, script, args in (
+            ('legacy', LEGACY_FIND_SCRIPT, [num_ads]),
+            ('treewalker', FIND_AD_CANDIDATES_SCRIPT, [num_ads, False]),
+        ):
+            timings = [driver.execute_script(TIMED_WRAPPER, script, *args) for _ in range(repeat)]
+            results[name] = (min(t[0] for t in timings), timings[0][1])
+        return results
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do localizador de anúncios")
+    parser.add_argument('--ads', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-browser', action='store_true', help="Mede apenas a versão em Python")
+    args = parser.parse_args()
+
+    scraper = None if args.no_browser else start_browser()
+
+    print("=== Benchmark do localizador de anúncios ===\n")
+    print(f"{'anúncios':>9} {'HTML (KB)':>10} | {'motor':<10} {'antigo (ms)':>12} {'novo (ms)':>10} {'ganho':>7} | encontrados")
+
+    try:
+        for num_ads in args.ads:
+            html = build_fixture_page(num_ads)
+            size_kb = len(html.encode('utf-8')) / 1024
+
+            legacy_ms, legacy_n, new_ms, new_n = bench_python(html, num_ads, args.repeat)
+            print(f"{num_ads:>9} {size_kb:>10.0f} | {'python':<10} {legacy_ms:>12.1f} {new_ms:>10.1f} "
+                  f"{legacy_ms / max(new_ms, 1e-6):>6.1f}x | {legacy_n} / {new_n}")
+
+            if scraper:
+                results = bench_browser(scraper.driver, html, num_ads, args.repeat)
+                legacy_ms, legacy_n = results['legacy']
+                new_ms, new_n = results['treewalker']
+                print(f"{num_ads:>9} {size_kb:>10.0f} | {'chrome':<10} {legacy_ms:>12.1f} {new_ms:>10.1f} "
+                      f"{legacy_ms / max(new_ms, 1e-6):>6.1f}x | {legacy_n} / {new_n}")
+    finally:
+        if scraper:
+            scraper.close()
+
+
+if __name__ == "__main__":
+    main()
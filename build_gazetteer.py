@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Gera o gazetteer_br.json usado por parse_maps_address
+
+Fontes (instaladas só para gerar o arquivo, não em produção):
+- brutils (MIT): os 5570 municípios com código IBGE, por UF
+- geonamescache (MIT, dados GeoNames CC-BY 4.0): nomes com acentos e população
+
+Os bairros são uma lista curada dos mais comuns nas principais cidades.
+
+Uso: pip install brutils geonamescache && python build_gazetteer.py
+"""
+
+import json
+import os
+import unicodedata
+import importlib.resources
+
+OUTPUT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer_br.json")
+
+STATES = {
+    'AC': 'Acre', 'AL': 'Alagoas', 'AP': 'Amapá', 'AM': 'Amazonas', 'BA': 'Bahia',
+    'CE': 'Ceará', 'DF': 'Distrito Federal', 'ES': 'Espírito Santo', 'GO': 'Goiás',
+    'MA': 'Maranhão', 'MT': 'Mato Grosso', 'MS': 'Mato Grosso do Sul', 'MG': 'Minas Gerais',
+    'PA': 'Pará', 'PB': 'Paraíba', 'PR': 'Paraná', 'PE': 'Pernambuco', 'PI': 'Piauí',
+    'RJ': 'Rio de Janeiro', 'RN': 'Rio Grande do Norte', 'RS': 'Rio Grande do Sul',
+    'RO': 'Rondônia', 'RR': 'Roraima', 'SC': 'Santa Catarina', 'SP': 'São Paulo',
+    'SE': 'Sergipe', 'TO': 'Tocantins'
+}
+
+# Códigos admin1 do GeoNames para o Brasil
+GEONAMES_ADMIN1 = {
+    '01': 'AC', '02': 'AL', '03': 'AP', '04': 'AM', '05': 'BA', '06': 'CE', '07': 'DF',
+    '08': 'ES', '11': 'MS', '13': 'MA', '14': 'MT', '15': 'MG', '16': 'PA', '17': 'PB',
+    '18': 'PR', '20': 'PI', '21': 'RJ', '22': 'RN', '23': 'RS', '24': 'RO', '25': 'RR',
+    '26': 'SC', '27': 'SP', '28': 'SE', '29': 'GO', '30': 'PE', '31': 'TO'
+}
+
+# Bairros comuns por cidade (nome da cidade como no IBGE, UF)
+NEIGHBORHOODS = {
+    ('São Paulo', 'SP'): [
+        'Bela Vista', 'Vila Olímpia', 'Pinheiros', 'Vila Madalena', 'Morumbi', 'Moema',
+        'Itaim Bibi', 'Jardins', 'Jardim Paulista', 'Jardim Europa', 'Jardim América',
+        'Consolação', 'Higienópolis', 'Perdizes', 'Pompeia', 'Lapa', 'Santa Cecília',
+        'República', 'Sé', 'Liberdade', 'Aclimação', 'Cambuci', 'Vila Mariana',
+        'Paraíso', 'Saúde', 'Jabaquara', 'Ipiranga', 'Mooca', 'Tatuapé', 'Brás',
+        'Belenzinho', 'Penha', 'Santana', 'Tucuruvi', 'Casa Verde', 'Freguesia do Ó',
+        'Butantã', 'Campo Belo', 'Brooklin', 'Vila Nova Conceição', 'Campo Limpo',
+        'Santo Amaro', 'Interlagos', 'Itaquera', 'Vila Leopoldina', 'Barra Funda',
+        'Bom Retiro', 'Vila Prudente', 'Alto de Pinheiros', 'Vila Guilherme',
+        'Água Branca', 'Cerqueira César', 'Sumaré', 'Vila Formosa', 'Cidade Ademar'
+    ],
+    ('Rio de Janeiro', 'RJ'): [
+        'Copacabana', 'Ipanema', 'Leblon', 'Botafogo', 'Flamengo', 'Laranjeiras',
+        'Catete', 'Glória', 'Lapa', 'Santa Teresa', 'Tijuca', 'Vila Isabel', 'Grajaú',
+        'Maracanã', 'Méier', 'Barra da Tijuca', 'Recreio dos Bandeirantes',
+        'Jacarepaguá', 'Gávea', 'Jardim Botânico', 'Humaitá', 'Urca', 'Leme',
+        'São Conrado', 'Lagoa', 'Cosme Velho', 'São Cristóvão', 'Penha', 'Madureira',
+        'Campo Grande', 'Bangu', 'Ilha do Governador', 'Olaria', 'Ramos',
+        'Engenho Novo', 'Andaraí', 'Taquara', 'Freguesia', 'Vargem Grande', 'Benfica'
+    ],
+    ('Belo Horizonte', 'MG'): [
+        'Savassi', 'Funcionários', 'Lourdes', 'Santo Agostinho', 'Sion', 'Serra',
+        'Santa Efigênia', 'Floresta', 'Santa Tereza', 'Pampulha', 'Buritis',
+        'Barro Preto', 'Cidade Nova', 'Gutierrez', 'Prado', 'Belvedere', 'Mangabeiras',
+        'Anchieta', 'Cruzeiro', 'Carmo', 'Castelo', 'Padre Eustáquio', 'Venda Nova'
+    ],
+    ('Porto Alegre', 'RS'): [
+        'Moinhos de Vento', 'Bom Fim', 'Cidade Baixa', 'Menino Deus', 'Petrópolis',
+        'Bela Vista', 'Mont Serrat', 'Auxiliadora', 'Rio Branco', 'Independência',
+        'Floresta', 'São João', 'Higienópolis', 'Tristeza', 'Ipanema', 'Cristal',
+        'Partenon', 'Santana', 'Três Figueiras', 'Centro Histórico', 'Azenha'
+    ],
+    ('Curitiba', 'PR'): [
+        'Batel', 'Água Verde', 'Bigorrilho', 'Champagnat', 'Mercês', 'Cabral',
+        'Juvevê', 'Alto da XV', 'Cristo Rei', 'Jardim Botânico', 'Rebouças',
+        'Portão', 'Santa Felicidade', 'Boqueirão', 'Bacacheri', 'Ecoville',
+        'Mossunguê', 'Hauer', 'Centro Cívico', 'São Francisco'
+    ],
+    ('Salvador', 'BA'): [
+        'Barra', 'Ondina', 'Rio Vermelho', 'Pituba', 'Itaigara', 'Caminho das Árvores',
+        'Graça', 'Vitória', 'Canela', 'Campo Grande', 'Pelourinho', 'Comércio',
+        'Itapuã', 'Stella Maris', 'Imbuí', 'Costa Azul', 'Brotas', 'Nazaré',
+        'Paralela', 'Patamares', 'Piatã', 'Amaralina'
+    ],
+    ('Recife', 'PE'): [
+        'Boa Viagem', 'Pina', 'Boa Vista', 'Espinheiro', 'Graças', 'Aflitos',
+        'Casa Forte', 'Parnamirim', 'Madalena', 'Torre', 'Derby', 'Imbiribeira',
+        'Santo Amaro', 'Casa Amarela', 'Várzea', 'Recife Antigo', 'Setúbal'
+    ],
+    ('Fortaleza', 'CE'): [
+        'Aldeota', 'Meireles', 'Mucuripe', 'Praia de Iracema', 'Cocó', 'Varjota',
+        'Papicu', 'Dionísio Torres', 'Fátima', 'Benfica', 'Parquelândia',
+        'Montese', 'Messejana', 'Cambeba', 'Edson Queiroz', 'Guararapes', 'Joaquim Távora'
+    ],
+    ('Brasília', 'DF'): [
+        'Asa Sul', 'Asa Norte', 'Lago Sul', 'Lago Norte', 'Sudoeste', 'Noroeste',
+        'Octogonal', 'Cruzeiro', 'Guará', 'Taguatinga', 'Águas Claras', 'Ceilândia',
+        'Samambaia', 'Sobradinho', 'Gama', 'Núcleo Bandeirante', 'Vicente Pires',
+        'Park Way', 'Jardim Botânico', 'Planaltina'
+    ],
+    ('Florianópolis', 'SC'): [
+        'Trindade', 'Córrego Grande', 'Santa Mônica', 'Itacorubi', 'Agronômica',
+        'Coqueiros', 'Estreito', 'Canasvieiras', 'Jurerê', 'Ingleses',
+        'Lagoa da Conceição', 'Campeche', 'Rio Tavares', 'Santo Antônio de Lisboa',
+        'Pantanal', 'Saco Grande', 'João Paulo', 'Barra da Lagoa'
+    ],
+    ('Goiânia', 'GO'): [
+        'Setor Bueno', 'Setor Oeste', 'Setor Marista', 'Setor Sul', 'Setor Central',
+        'Jardim Goiás', 'Setor Pedro Ludovico', 'Setor Aeroporto', 'Setor Nova Suíça',
+        'Jardim América', 'Parque Amazônia', 'Setor Campinas', 'Setor Universitário'
+    ],
+    ('Belém', 'PA'): [
+        'Nazaré', 'Umarizal', 'Batista Campos', 'Reduto', 'Cidade Velha', 'Marco',
+        'Pedreira', 'São Brás', 'Cremação', 'Jurunas', 'Guamá', 'Fátima', 'Campina'
+    ],
+    ('Manaus', 'AM'): [
+        'Adrianópolis', 'Vieiralves', 'Aleixo', 'Ponta Negra', 'Parque 10 de Novembro',
+        'Chapada', 'Flores', 'Dom Pedro', 'Cidade Nova', 'São Francisco', 'Japiim',
+        'Planalto', 'Tarumã'
+    ],
+    ('Campinas', 'SP'): [
+        'Cambuí', 'Taquaral', 'Barão Geraldo', 'Nova Campinas', 'Guanabara',
+        'Castelo', 'Bosque', 'Botafogo', 'Jardim Chapadão', 'Sousas', 'Joaquim Egídio'
+    ],
+    ('Niterói', 'RJ'): [
+        'Icaraí', 'Ingá', 'São Francisco', 'Santa Rosa', 'Boa Viagem', 'Charitas',
+        'Camboinhas', 'Piratininga', 'Itaipu', 'Fonseca', 'São Domingos'
+    ],
+    ('Vitória', 'ES'): [
+        'Praia do Canto', 'Jardim Camburi', 'Jardim da Penha', 'Mata da Praia',
+        'Enseada do Suá', 'Bento Ferreira', 'Santa Lúcia', 'Praia do Suá'
+    ],
+    ('Natal', 'RN'): [
+        'Ponta Negra', 'Tirol', 'Petrópolis', 'Lagoa Nova', 'Capim Macio',
+        'Candelária', 'Alecrim', 'Ribeira', 'Areia Preta'
+    ],
+    ('João Pessoa', 'PB'): [
+        'Tambaú', 'Manaíra', 'Cabo Branco', 'Bessa', 'Altiplano', 'Miramar',
+        'Bancários', 'Torre', 'Tambauzinho', 'Jaguaribe'
+    ],
+    ('Maceió', 'AL'): [
+        'Pajuçara', 'Ponta Verde', 'Jatiúca', 'Mangabeiras', 'Cruz das Almas',
+        'Farol', 'Stella Maris', 'Jaraguá', 'Poço'
+    ],
+    ('São Luís', 'MA'): [
+        'Renascença', 'Calhau', 'Ponta da Areia', 'Cohama', 'Olho d\'Água',
+        'São Francisco', 'Turu', 'Jardim Renascença', 'Praia Grande'
+    ],
+    ('Santos', 'SP'): [
+        'Gonzaga', 'Boqueirão', 'Ponta da Praia', 'Embaré', 'Aparecida',
+        'José Menino', 'Pompéia', 'Vila Mathias', 'Campo Grande', 'Valongo'
+    ]
+}
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def load_package_json(package: str, name: str):
+    return json.loads(importlib.resources.files(package).joinpath(name).read_text(encoding='utf-8'))
+
+
+def geonames_by_name():
+    """(nome normalizado sem apóstrofos, UF) -> (nome com acentos, população)"""
+    cities = load_package_json('geonamescache.data', 'cities500.json')
+    result = {}
+    for city in cities.values():
+        if city['countrycode'] != 'BR':
+            continue
+        uf = GEONAMES_ADMIN1.get(city['admin1code'])
+        key = (normalize(city['name']).replace("'", ''), uf)
+        if key not in result or city['population'] > result[key][1]:
+            result[key] = (city['name'], city['population'])
+    return result
+
+
+def display_name(normalized_name: str) -> str:
+    """Nome com maiúsculas quando o GeoNames não tem a grafia acentuada"""
+    small = {'de', 'da', 'do', 'das', 'dos', 'e'}
+    words = normalized_name.split(' ')
+    return ' '.join(word if word in small and i else word[:1].upper() + word[1:] for i, word in enumerate(words))
+
+
+def main():
+    municipalities = load_package_json('brutils.data', 'cities_code.json')
+    geonames = geonames_by_name()
+
+    rows = []
+    with_accents = 0
+    for uf, cities in sorted(municipalities.items()):
+        for name, ibge_code in sorted(cities.items()):
+            match = geonames.get((name.replace("'", ''), uf))
+            if match and normalize(match[0]).replace("'", '') == name.replace("'", ''):
+                display, population = match
+                with_accents += 1
+            else:
+                display, population = display_name(name), 0
+            rows.append([display, uf, ibge_code, population])
+
+    neighborhoods = [
+        [neighborhood, city, uf]
+        for (city, uf), names in NEIGHBORHOODS.items()
+        for neighborhood in names
+    ]
+
+    data = {
+        'states': [[uf, name] for uf, name in STATES.items()],
+        'municipalities': rows,
+        'neighborhoods': neighborhoods
+    }
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"{len(rows)} municípios ({with_accents} com grafia do GeoNames), "
+          f"{len(neighborhoods)} bairros, {len(STATES)} estados -> {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
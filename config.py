@@ -1,13 +1,31 @@
 import os
-from dataclasses import dataclass
-from typing import List, Dict
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple
 
 @dataclass
 class ScraperConfig:
     # Configurações do navegador
     HEADLESS: bool = True
     BROWSER_TIMEOUT: int = 30
-    SCROLL_PAUSE_TIME: int = 2
+    SCROLL_PAUSE_TIME: int = 2  # Espera máxima por novos anúncios após cada scroll
+    MAX_SCROLLS: int = 20
+    AD_WAIT_TIMEOUT: float = 8.0  # Espera máxima pelo primeiro anúncio
+    
+    # Configurações do ChromeDriver
+    # Caminho local usado sem consultar a internet (instalado pelo Dockerfile)
+    CHROMEDRIVER_PATH: str = os.getenv("CHROMEDRIVER_PATH", "/usr/local/bin/chromedriver")
+    CHROMEDRIVER_CACHE_FILE: str = os.path.join("cache", "chromedriver_path.json")
+    
+    # Modo "página leve": bloqueia imagens, vídeos e fontes (os atributos src continuam no DOM)
+    LEAN_PAGE_BLOCKED_URLS: Tuple[str, ...] = (
+        "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*",
+        "*.mp4*", "*.webm*", "*video*.fbcdn.net*",
+        "*.woff*", "*.ttf*", "*.otf*"
+    )
+    
+    # Aquecimento: abre e prepara o navegador antes de aceitar requisições
+    WARMUP_ON_START: bool = True
+    WARMUP_URL: str = "https://www.facebook.com/ads/library/"
     
     # Configurações de rate limiting
     MIN_DELAY: float = 1.0
@@ -16,30 +34,99 @@ class ScraperConfig:
     
     # Configurações de proxy (opcional)
     USE_PROXY: bool = False
-    PROXY_LIST: List[str] = []
+    PROXY_LIST: List[str] = field(default_factory=list)
     
     # Configurações de busca
     MAX_RESULTS_PER_SEARCH: int = 100
-    MAX_CONCURRENT_SEARCHES: int = 3
+    MAX_CONCURRENT_SEARCHES: int = int(os.getenv("MAX_CONCURRENT_SEARCHES", "3"))  # Drivers por processo
+    TABS_PER_DRIVER: int = 4  # Buscas simultâneas em abas de um mesmo Chrome
+    PARALLEL_STRATEGIES: bool = True  # Estratégias de check_establishment em abas paralelas
+    
+    # Modo de extração: "js" (um script por página), "html" (parsing do snapshot
+    # da página em outro processo) ou "element" (um anúncio por vez)
+    EXTRACTION_MODE: str = "js"
+    PARSER_WORKERS: int = 0  # 0 = um processo por núcleo
+    
+    # Servidor de produção (gunicorn.conf.py): processos com o seu próprio pool de drivers.
+    # 0 = MAX_TOTAL_DRIVERS / MAX_CONCURRENT_SEARCHES processos (cada Chrome ocupa centenas de MB)
+    WEB_WORKERS: int = int(os.getenv("WEB_WORKERS", "0"))
+    MAX_TOTAL_DRIVERS: int = int(os.getenv("MAX_TOTAL_DRIVERS", "4"))  # Chromes no container, somando os processos
+    WEB_BIND: str = os.getenv("WEB_BIND", "0.0.0.0:5000")
+    # Threads por processo além das requisições admitidas para os drivers (health,
+    # ready, stats, consulta de jobs e os lotes, que ocupam uma thread enquanto respondem)
+    WEB_EXTRA_THREADS: int = int(os.getenv("WEB_EXTRA_THREADS", "4"))
+    # Tempo total para um processo encerrar (jobs e buscas em andamento, Chromes)
+    SHUTDOWN_TIMEOUT: float = 60.0
     
-    # Configurações de cache
+    # Configurações do pool de drivers
+    DRIVER_POOL_WAIT_TIMEOUT: float = 60.0
+    # Prazo padrão por endpoint, em segundos (abaixo do timeout de 60s dos clientes).
+    # O cliente pode informar outro em "deadline_seconds" ou no cabeçalho X-Request-Timeout.
+    DEADLINE_HAS_ADS_SECONDS: float = 45.0
+    DEADLINE_CHECK_ESTABLISHMENT_SECONDS: float = 55.0
+    DEADLINE_SEARCH_ADS_SECONDS: float = 55.0
+    DEADLINE_ANALYZE_COMPETITION_SECONDS: float = 55.0
+    DEADLINE_CHECK_ADVERTISER_SECONDS: float = 55.0
+    DEADLINE_JOB_SECONDS: float = 300.0
+    DEADLINE_MAX_SECONDS: float = 600.0
+    # Controle de admissão: requisições aguardando driver por driver do pool (acima disso, 429)
+    ADMISSION_QUEUE_PER_DRIVER: int = int(os.getenv("ADMISSION_QUEUE_PER_DRIVER", "2"))
+    # Reciclagem: o driver é substituído em segundo plano após N navegações
+    # ou quando o Chrome passa do limite de memória (requer psutil)
+    RECYCLE_AFTER_NAVIGATIONS: int = 200
+    RECYCLE_MAX_RSS_MB: int = 1500
+    
+    # Configurações de cache (resultados de busca não vazios)
+    CACHE_ENABLED: bool = True
     CACHE_DURATION_HOURS: int = 24
+    # Estabelecimentos sem anúncios (resultado negativo) expiram antes
+    CACHE_NEGATIVE_TTL_HOURS: int = 6
     CACHE_DIR: str = "cache"
+    CACHE_MAX_ENTRIES: int = 5000
+    # Formato em disco: gzip opcional e limpeza periódica (TTL + limite de bytes)
+    CACHE_COMPRESS: bool = True
+    CACHE_MAX_BYTES: int = 500 * 1024 * 1024
+    CACHE_SWEEP_INTERVAL: int = 600
+    # Backend do cache: "file", "memory" ou "redis" (compartilhado entre containers)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "file")
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Duração do lock de uma busca sem prazo e espera máxima de um container pela
+    # mesma busca em outro (com prazo, o lock dura o prazo de quem faz a busca)
+    CACHE_LOCK_TIMEOUT: float = DEADLINE_MAX_SECONDS
+    
+    # Lote de endereços em /api/has-ads/batch
+    BATCH_MAX_ADDRESSES: int = 5000
+    
+    # Jobs assíncronos (/api/jobs): banco SQLite no volume de dados e workers em background
+    JOBS_DB_PATH: str = os.getenv("JOBS_DB_PATH", os.path.join("data", "jobs.db"))
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "0"))  # Por processo; 0 = um por driver
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETENTION_DAYS: int = 7
+    
+    # Municípios, estados e bairros usados para interpretar endereços (gerado por build_gazetteer.py)
+    GAZETTEER_FILE: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer_br.json")
     
     # Configurações de logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "scraper.log"
     
+    # Artefatos de depuração (screenshot + HTML): opcionais e por amostragem.
+    # Quando ligados, buscas sem nenhum anúncio sempre geram artefatos.
+    DEBUG_ARTIFACTS_ENABLED: bool = False
+    DEBUG_ARTIFACTS_SAMPLE_RATE: float = 0.0
+    DEBUG_ARTIFACTS_DIR: str = os.path.join("logs", "debug")
+    DEBUG_ARTIFACTS_MAX_BYTES: int = 200 * 1024 * 1024
+    
     # Seletores CSS (podem precisar ser atualizados)
-    AD_SELECTORS: List[str] = [
+    AD_SELECTORS: List[str] = field(default_factory=lambda: [
         "[data-testid='ad-card']",
         "[data-testid='political-ad']",
         ".x1lliihq",
         "[role='article']"
-    ]
+    ])
     
     # Padrões de busca
-    SEARCH_PATTERNS: Dict[str, List[str]] = {
+    SEARCH_PATTERNS: Dict[str, List[str]] = field(default_factory=lambda: {
         'restaurante': [
             'restaurante {location}',
             'comida {location}',
@@ -57,4 +144,4 @@ class ScraperConfig:
             'atendimento {location}',
             'empresa {location}'
         ]
-    }
\ No newline at end of file
+    })
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""
+Configuração do pytest para os scripts de teste
+
+O banco de jobs é criado ao importar facebook_ads_scraper, com o caminho lido de
+config.py na importação: o ambiente precisa estar definido antes de qualquer
+teste importar os módulos do projeto, para não gravar data/jobs.db no repositório.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault('JOBS_DB_PATH', os.path.join(tempfile.mkdtemp(prefix='jobs-test-'), 'jobs.db'))
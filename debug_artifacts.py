@@ -0,0 +1,164 @@
+import os
+import uuid
+import random
+import logging
+import threading
+from datetime import datetime
+from queue import Queue, Full
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DebugArtifactWriter:
+    """Grava screenshots e HTML de depuração por amostragem, em segundo plano
+
+    Cada captura recebe um nome próprio (data, rótulo e id aleatório), então
+    requisições simultâneas não sobrescrevem os arquivos umas das outras. A
+    gravação acontece em uma thread separada e o diretório é mantido abaixo de
+    ``max_bytes`` apagando as capturas mais antigas.
+    """
+
+    def __init__(self, directory: str = "logs/debug", enabled: bool = False,
+                 sample_rate: float = 0.0, max_bytes: int = 200 * 1024 * 1024,
+                 max_pending: int = 20):
+        self.directory = directory
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+
+        self._queue: Queue = Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._total_bytes = None
+        self.captured = 0
+        self.dropped = 0
+
+    def should_capture(self, force: bool = False) -> bool:
+        """Decide se esta requisição gera artefatos (``force`` ignora a amostragem)"""
+        if not self.enabled:
+            return False
+        return force or random.random() < self.sample_rate
+
+    def capture(self, driver, label: str, force: bool = False, html: Optional[str] = None) -> Optional[str]:
+        """Captura screenshot e HTML da página atual e agenda a gravação
+
+        Retorna o nome base dos arquivos ou None quando a captura não foi feita.
+        """
+        if not self.should_capture(force):
+            return None
+
+        try:
+            png = driver.get_screenshot_as_png()
+            if html is None:
+                html = driver.page_source
+        except Exception as e:
+            logger.debug(f"Falha ao capturar artefatos de depuração: {e}")
+            return None
+
+        return self._enqueue(label, png, html)
+
+    def capture_html(self, html: str, label: str, force: bool = False) -> Optional[str]:
+        """Agenda a gravação de um snapshot HTML já obtido (sem acessar o navegador)"""
+        if not self.should_capture(force):
+            return None
+        return self._enqueue(label, None, html)
+
+    def _enqueue(self, label: str, png: Optional[bytes], html: Optional[str]) -> Optional[str]:
+        base_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{label}_{uuid.uuid4().hex[:8]}"
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((base_name, png, html))
+        except Full:
+            # Não bloqueia a requisição se o disco não está dando conta
+            with self._lock:
+                self.dropped += 1
+            return None
+        return base_name
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="debug-artifacts", daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            base_name, png, html = self._queue.get()
+            try:
+                self._write(base_name, png, html)
+            except Exception as e:
+                logger.error(f"Erro ao gravar artefatos de depuração: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, base_name: str, png: Optional[bytes], html: Optional[str]):
+        os.makedirs(self.directory, exist_ok=True)
+        written = 0
+
+        if png:
+            path = os.path.join(self.directory, f"{base_name}.png")
+            with open(path, 'wb') as f:
+                f.write(png)
+            written += len(png)
+
+        if html:
+            data = html.encode('utf-8')
+            path = os.path.join(self.directory, f"{base_name}.html")
+            with open(path, 'wb') as f:
+                f.write(data)
+            written += len(data)
+
+        with self._lock:
+            self.captured += 1
+            if self._total_bytes is None:
+                self._total_bytes = self._directory_size()
+            else:
+                self._total_bytes += written
+
+        logger.info(f"Artefatos de depuração salvos: {os.path.join(self.directory, base_name)}.*")
+
+        if self._total_bytes > self.max_bytes:
+            self._rotate()
+
+    def _directory_size(self) -> int:
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                total += entry.stat().st_size
+        return total
+
+    def _rotate(self):
+        """Apaga as capturas mais antigas até o diretório caber no limite"""
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        total = sum(entry.stat().st_size for entry in entries)
+
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                continue
+
+        with self._lock:
+            self._total_bytes = total
+
+    def flush(self):
+        """Aguarda a gravação das capturas pendentes"""
+        self._queue.join()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'sample_rate': self.sample_rate,
+                'captured': self.captured,
+                'dropped': self.dropped,
+                'pending': self._queue.qsize()
+            }
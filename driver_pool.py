@@ -0,0 +1,381 @@
+import math
+import time
+import threading
+import logging
+from collections import deque
+from contextlib import contextmanager
+from queue import Queue, Empty
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Nenhum driver ficou disponível dentro do tempo de espera"""
+
+
+class PoolSaturatedError(Exception):
+    """A fila de espera por drivers está cheia; ``retry_after`` estima quando tentar de novo"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PooledDriver:
+    """Slot do pool: um scraper com seu próprio Chrome e um lock exclusivo"""
+
+    def __init__(self, slot_id: int, scraper):
+        self.slot_id = slot_id
+        self.scraper = scraper
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.checked_out_at = None
+        self.recycling = False
+
+
+class DriverPool:
+    """Pool de WebDrivers pré-iniciados e isolados
+
+    Cada slot tem um FacebookAdsLibraryScraper com o seu próprio Chrome, de modo
+    que requisições simultâneas não disputam a mesma página. O scraper é obtido
+    com checkout/checkin (ou com o context manager ``acquire``) e fica exclusivo
+    da requisição até ser devolvido.
+    """
+
+    def __init__(self, factory: Callable, size: int = 3, wait_timeout: float = 60.0,
+                 warm_up: bool = False, recycle_after_navigations: int = 0,
+                 recycle_max_rss_mb: float = 0):
+        if size < 1:
+            raise ValueError("O pool precisa de pelo menos um driver")
+
+        self.factory = factory
+        self.size = size
+        self.wait_timeout = wait_timeout
+        self.warm_up = warm_up
+        self.recycle_after_navigations = recycle_after_navigations
+        self.recycle_max_rss_mb = recycle_max_rss_mb
+
+        self._slots: List[PooledDriver] = [PooledDriver(i, factory()) for i in range(size)]
+        self._idle: Queue = Queue()
+        for slot in self._slots:
+            self._idle.put(slot)
+
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self._total_checkouts = 0
+        self._total_timeouts = 0
+        self._total_wait_time = 0.0
+        self._total_recycles = 0
+        # Carga recente: requisições aguardando, devoluções no último minuto e médias móveis
+        self._waiting = 0
+        self._checkin_times: deque = deque(maxlen=1000)
+        self._recent_wait = 0.0
+        self._recent_hold = 0.0
+
+    def start(self):
+        """Inicia os drivers de todos os slots em paralelo"""
+        with self._start_lock:
+            if self._started:
+                return
+
+            start_time = time.time()
+            threads = [
+                threading.Thread(target=self._start_slot, args=(slot,), daemon=True)
+                for slot in self._slots
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self._started = True
+            ready = sum(1 for slot in self._slots if slot.scraper.driver)
+            logger.info(f"Pool de drivers iniciado: {ready}/{self.size} prontos em {time.time() - start_time:.2f}s")
+
+    def _start_slot(self, slot: PooledDriver):
+        """Inicia o Chrome de um slot (falhas são toleradas; o scraper inicia sob demanda)"""
+        try:
+            self._start_scraper(slot.scraper)
+        except Exception as e:
+            logger.error(f"Erro ao iniciar driver do slot {slot.slot_id}: {e}")
+    
+    def _start_scraper(self, scraper):
+        if self.warm_up:
+            scraper.warm_up()
+        elif not scraper.driver:
+            scraper.setup_driver()
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledDriver:
+        """Retira um slot livre do pool, aguardando no máximo ``timeout`` segundos"""
+        if self._closed:
+            raise PoolTimeoutError("Pool de drivers encerrado")
+
+        if timeout is None:
+            timeout = self.wait_timeout
+
+        wait_start = time.time()
+        with self._stats_lock:
+            self._waiting += 1
+        try:
+            slot = self._idle.get(timeout=timeout)
+        except Empty:
+            with self._stats_lock:
+                self._total_timeouts += 1
+            raise PoolTimeoutError(f"Nenhum driver disponível após {timeout:g}s")
+        finally:
+            with self._stats_lock:
+                self._waiting -= 1
+
+        slot.lock.acquire()
+        slot.checkouts += 1
+        slot.checked_out_at = time.time()
+
+        with self._stats_lock:
+            wait = slot.checked_out_at - wait_start
+            self._total_checkouts += 1
+            self._total_wait_time += wait
+            self._recent_wait = self._ewma(self._recent_wait, wait)
+
+        return slot
+
+    def checkin(self, slot: PooledDriver):
+        """Devolve um slot ao pool"""
+        reason = self._recycle_reason(slot)
+        now = time.time()
+        with self._stats_lock:
+            if slot.checked_out_at:
+                self._recent_hold = self._ewma(self._recent_hold, now - slot.checked_out_at)
+            self._checkin_times.append(now)
+        slot.checked_out_at = None
+        slot.lock.release()
+        self._idle.put(slot)
+        
+        if reason and not slot.recycling and not self._closed:
+            slot.recycling = True
+            threading.Thread(target=self._recycle_slot, args=(slot, reason), daemon=True).start()
+    
+    def _recycle_reason(self, slot: PooledDriver) -> Optional[str]:
+        """Motivo para reciclar o driver do slot, ou None se ele ainda está saudável"""
+        scraper = slot.scraper
+        if not scraper.driver:
+            return None
+        
+        navigations = getattr(scraper, 'navigation_count', 0)
+        if self.recycle_after_navigations and navigations >= self.recycle_after_navigations:
+            return f"{navigations} navegações"
+        
+        if self.recycle_max_rss_mb:
+            memory_mb = scraper.get_browser_memory_mb()
+            if memory_mb and memory_mb > self.recycle_max_rss_mb:
+                return f"{memory_mb:.0f} MB de memória"
+        
+        return None
+    
+    def _recycle_slot(self, slot: PooledDriver, reason: str):
+        """Prepara um driver novo em segundo plano e troca pelo antigo
+        
+        O slot continua atendendo requisições com o driver antigo enquanto o novo
+        inicia; a troca só espera a requisição em andamento terminar (lock do slot),
+        então nenhuma requisição paga o tempo de reinício.
+        """
+        logger.info(f"Reciclando driver do slot {slot.slot_id} ({reason})")
+        try:
+            replacement = self.factory()
+            self._start_scraper(replacement)
+        except Exception as e:
+            logger.error(f"Erro ao preparar driver substituto do slot {slot.slot_id}: {e}")
+            slot.recycling = False
+            return
+        
+        with slot.lock:
+            if self._closed:
+                old_scraper = replacement
+            else:
+                old_scraper = slot.scraper
+                slot.scraper = replacement
+            slot.recycling = False
+        
+        try:
+            old_scraper.close()
+        except Exception as e:
+            logger.error(f"Erro ao fechar driver antigo do slot {slot.slot_id}: {e}")
+        
+        with self._stats_lock:
+            self._total_recycles += 1
+        logger.info(f"Driver do slot {slot.slot_id} substituído")
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """Context manager que entrega um scraper exclusivo e o devolve ao final"""
+        slot = self.checkout(timeout)
+        try:
+            yield slot.scraper
+        finally:
+            self.checkin(slot)
+
+    @staticmethod
+    def _ewma(current: float, sample: float, alpha: float = 0.2) -> float:
+        return sample if not current else current + alpha * (sample - current)
+
+    @property
+    def idle(self) -> int:
+        """Drivers livres neste momento"""
+        return self._idle.qsize()
+
+    @property
+    def waiting(self) -> int:
+        """Requisições bloqueadas esperando um driver livre"""
+        with self._stats_lock:
+            return self._waiting
+
+    def throughput(self, window: float = 60.0) -> float:
+        """Drivers devolvidos por segundo na janela recente"""
+        now = time.time()
+        with self._stats_lock:
+            recent = [t for t in self._checkin_times if now - t <= window]
+        if not recent:
+            return 0.0
+        # Janela curta logo após o início: não superestima a vazão
+        span = max(now - recent[0], self._recent_hold, 1.0)
+        return len(recent) / span
+
+    def estimate_wait(self, position: int) -> float:
+        """Segundos estimados até atender a requisição na posição ``position`` da fila"""
+        rate = self.throughput()
+        if rate > 0:
+            return position / rate
+        with self._stats_lock:
+            hold = self._recent_hold
+        # Sem devoluções recentes: cada rodada do pool leva o tempo médio de uso de um driver
+        return math.ceil(position / self.size) * hold if hold else 0.0
+
+    def stats(self) -> Dict:
+        """Estatísticas de uso do pool"""
+        with self._stats_lock:
+            total_checkouts = self._total_checkouts
+            avg_wait = self._total_wait_time / total_checkouts if total_checkouts else 0.0
+
+            return {
+                'size': self.size,
+                'idle': self.idle,
+                'in_use': sum(1 for slot in self._slots if slot.checked_out_at),
+                'drivers_running': sum(1 for slot in self._slots if slot.scraper.driver),
+                'total_checkouts': total_checkouts,
+                'total_timeouts': self._total_timeouts,
+                'total_recycles': self._total_recycles,
+                'recycling': sum(1 for slot in self._slots if slot.recycling),
+                'avg_wait_seconds': round(avg_wait, 3),
+                'waiting': self._waiting,
+                'recent_wait_seconds': round(self._recent_wait, 3),
+                'recent_hold_seconds': round(self._recent_hold, 3)
+            }
+
+    def close(self, timeout: Optional[float] = None):
+        """Fecha todos os drivers, aguardando os que estão em uso
+
+        ``timeout`` (padrão: ``wait_timeout``) é a espera total, dividida entre os
+        slots; os drivers ainda em uso depois disso são fechados mesmo assim.
+        """
+        self._closed = True
+        wait_until = time.monotonic() + (self.wait_timeout if timeout is None else timeout)
+        for slot in self._slots:
+            acquired = slot.lock.acquire(timeout=max(wait_until - time.monotonic(), 0))
+            try:
+                slot.scraper.close()
+            except Exception as e:
+                logger.error(f"Erro ao fechar driver do slot {slot.slot_id}: {e}")
+            finally:
+                if acquired:
+                    slot.lock.release()
+
+
+class AdmissionController:
+    """Fila limitada de requisições à espera de um driver
+
+    Cada requisição admitida ocupa um lugar até terminar; são aceitas no máximo
+    ``size`` do pool (em execução) mais ``max_queue`` (aguardando). Acima disso
+    ``admit`` recusa na hora com PoolSaturatedError, em vez de deixar a
+    requisição esperar até o cliente desistir. O ``retry_after`` vem da vazão
+    recente do pool.
+    """
+
+    def __init__(self, pool: DriverPool, max_queue: int, min_retry_after: int = 1, max_retry_after: int = 300):
+        self.pool = pool
+        self.max_queue = max_queue
+        self.min_retry_after = min_retry_after
+        self.max_retry_after = max_retry_after
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    @property
+    def limit(self) -> int:
+        return self.pool.size + self.max_queue
+
+    def queue_depth(self) -> int:
+        """Requisições esperando um driver (inclui jobs e lotes, que não passam pela admissão)"""
+        return self.pool.waiting
+
+    def _full(self) -> bool:
+        # Sem driver livre, uma nova requisição entraria atrás das que já aguardam
+        return self._active >= self.limit or (self.pool.idle == 0 and self.queue_depth() >= self.max_queue)
+
+    def saturated(self) -> bool:
+        with self._lock:
+            return self._full()
+
+    def retry_after(self) -> int:
+        """Segundos para esvaziar a fila atual na vazão recente do pool
+
+        Sem histórico de vazão (serviço recém-iniciado) usa metade do tempo de
+        espera do pool.
+        """
+        estimate = self.pool.estimate_wait(max(self.queue_depth(), 1)) or self.pool.wait_timeout / 2
+        return int(min(max(math.ceil(estimate), self.min_retry_after), self.max_retry_after))
+
+    @contextmanager
+    def admit(self):
+        """Reserva um lugar na fila ou recusa com PoolSaturatedError"""
+        with self._lock:
+            if self._full():
+                self._rejected += 1
+                rejected = True
+            else:
+                self._active += 1
+                self._admitted += 1
+                rejected = False
+
+        if rejected:
+            retry_after = self.retry_after()
+            logger.warning(f"Fila de drivers cheia ({self.queue_depth()} aguardando); tente em {retry_after}s")
+            raise PoolSaturatedError("Serviço sobrecarregado, tente novamente mais tarde", retry_after)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            active = self._active
+            admitted = self._admitted
+            rejected = self._rejected
+            saturated = self._full()
+        queue_depth = self.queue_depth()
+        return {
+            'active': active,
+            'limit': self.limit,
+            'max_queue': self.max_queue,
+            'queue_depth': queue_depth,
+            'saturated': saturated,
+            'estimated_wait_seconds': round(self.pool.estimate_wait(queue_depth + 1), 2),
+            'throughput_per_minute': round(self.pool.throughput() * 60, 2),
+            'admitted': admitted,
+            'rejected': rejected
+        }
@@ -8,26 +8,290 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
+import csv
+import io
 import json
+import os
+import threading
 import urllib.parse
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait as wait_futures
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import pandas as pd
-from flask import Flask, request, jsonify
+from flask import Flask, Response, has_request_context, request, jsonify
 from flask_cors import CORS
+from config import ScraperConfig
+from driver_pool import AdmissionController, DriverPool, PoolSaturatedError, PoolTimeoutError
+from debug_artifacts import DebugArtifactWriter
+from utils import Deadline, DeadlineExceeded, SingleFlight, create_cache_manager, normalize_query
+from gazetteer import get_gazetteer
+from ad_matcher import AdMatcher
+from job_store import JobRunner, JobStore
+from ad_parser import (
+    AdDedupeIndex, build_ad_data, build_ad_data_from_payload, build_match_data, unique_ads, debug_ads_for_page,
+    submit_page_source, submit_search_snapshot, shutdown_parse_executor
+)
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Artefatos de depuração compartilhados por todos os scrapers do processo
+debug_artifacts = DebugArtifactWriter(
+    directory=ScraperConfig.DEBUG_ARTIFACTS_DIR,
+    enabled=ScraperConfig.DEBUG_ARTIFACTS_ENABLED,
+    sample_rate=ScraperConfig.DEBUG_ARTIFACTS_SAMPLE_RATE,
+    max_bytes=ScraperConfig.DEBUG_ARTIFACTS_MAX_BYTES
+)
+
+# Carrega o gazetteer na importação (antes de o servidor criar processos filhos)
+get_gazetteer()
+
+# Agrupamento de buscas idênticas simultâneas (por palavras-chave e por endereço)
+keyword_flights = SingleFlight()
+establishment_flights = SingleFlight()
+
+# Cache dos resultados de busca (disco com TTL + LRU, memória ou Redis)
+search_cache = create_cache_manager(
+    backend=ScraperConfig.CACHE_BACKEND,
+    cache_dir=ScraperConfig.CACHE_DIR,
+    ttl_seconds=ScraperConfig.CACHE_DURATION_HOURS * 3600,
+    max_entries=ScraperConfig.CACHE_MAX_ENTRIES,
+    compress=ScraperConfig.CACHE_COMPRESS,
+    max_bytes=ScraperConfig.CACHE_MAX_BYTES,
+    sweep_interval=ScraperConfig.CACHE_SWEEP_INTERVAL,
+    redis_url=ScraperConfig.REDIS_URL,
+    lock_timeout=ScraperConfig.CACHE_LOCK_TIMEOUT
+) if ScraperConfig.CACHE_ENABLED else None
+
+
+def is_cacheable(ads: List[Dict]) -> bool:
+    """Só resultados com anúncios reais vão para o cache (nada vazio ou de depuração)"""
+    return bool(ads) and not ads[0].get('debug_info')
+
+def location_cache_key(location: str, business_type: str, max_results: int) -> str:
+    """Chave do cache das buscas por localização e tipo de negócio"""
+    return search_cache.get_cache_key(
+        normalize_query(business_type), normalize_query(location), namespace=f"location:{max_results}"
+    )
+
+# Caminho do ChromeDriver resolvido (memória do processo)
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+def _is_executable(path: str) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+def _find_windows_executable(driver_path: str) -> str:
+    """Corrige o caminho devolvido pelo webdriver-manager no Windows"""
+    driver_dir = os.path.dirname(driver_path)
+    # Procurar pelo executável real
+    for directory in (driver_dir, os.path.join(driver_dir, 'chromedriver-win32')):
+        if not os.path.exists(directory):
+            continue
+        for file in os.listdir(directory):
+            if file.endswith('.exe') and 'chromedriver' in file.lower():
+                return os.path.join(directory, file)
+    return driver_path
+
+def resolve_chromedriver_path() -> str:
+    """Resolve o caminho do ChromeDriver uma única vez
+    
+    Ordem: caminho local configurado (funciona offline), caminho salvo em disco
+    por uma execução anterior e, por último, download via webdriver-manager.
+    """
+    global _chromedriver_path
+    
+    with _chromedriver_lock:
+        if _chromedriver_path and os.path.exists(_chromedriver_path):
+            return _chromedriver_path
+        
+        cache_file = ScraperConfig.CHROMEDRIVER_CACHE_FILE
+        
+        if _is_executable(ScraperConfig.CHROMEDRIVER_PATH):
+            _chromedriver_path = ScraperConfig.CHROMEDRIVER_PATH
+            logger.info(f"ChromeDriver local: {_chromedriver_path}")
+            return _chromedriver_path
+        
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached_path = json.load(f).get('driver_path', '')
+            if os.path.exists(cached_path):
+                _chromedriver_path = cached_path
+                logger.info(f"ChromeDriver do cache em disco: {_chromedriver_path}")
+                return _chromedriver_path
+        except (OSError, ValueError):
+            pass
+        
+        from webdriver_manager.chrome import ChromeDriverManager
+        
+        driver_path = ChromeDriverManager().install()
+        logger.info(f"ChromeDriver baixado em: {driver_path}")
+        
+        if os.name == 'nt':  # Windows
+            driver_path = _find_windows_executable(driver_path)
+        
+        if not os.path.exists(driver_path):
+            raise FileNotFoundError(f"ChromeDriver não encontrado em: {driver_path}")
+        
+        try:
+            os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'driver_path': driver_path,
+                    'resolved_at': datetime.now().isoformat()
+                }, f)
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar o caminho do ChromeDriver: {e}")
+        
+        logger.info(f"ChromeDriver executável: {driver_path}")
+        _chromedriver_path = driver_path
+        return _chromedriver_path
+
+def format_timings(timings: Dict[str, float]) -> str:
+    """Formata as fases de inicialização para o log"""
+    total = sum(timings.values())
+    phases = ', '.join(f"{phase}={seconds:.2f}s" for phase, seconds in timings.items())
+    return f"{phases}, total={total:.2f}s"
+
+# Coleta, em uma única chamada, o conteúdo de todos os anúncios recebidos em arguments[0].
+# Com arguments[1] verdadeiro coleta só o necessário para a correspondência
+# (sem imagens e só os links do Facebook, usados para o nome do anunciante).
+EXTRACT_ADS_SCRIPT = """
+    const PARAGRAPH_XPATH = ".//p | .//div[string-length(text()) > 30]";
+    const matchOnly = !!arguments[1];
+    
+    return Array.from(arguments[0] || []).map(el => {
+        if (!el) return null;
+        
+        const linkSelector = matchOnly ? 'a[href*="facebook.com"]' : 'a';
+        const links = Array.from(el.querySelectorAll(linkSelector)).map(a => ({
+            href: a.href || '',
+            text: a.innerText || ''
+        }));
+        const images = matchOnly ? [] : Array.from(el.querySelectorAll('img')).map(img => img.getAttribute('src') || '');
+        
+        const paragraphs = [];
+        const snapshot = document.evaluate(PARAGRAPH_XPATH, el, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let i = 0; i < Math.min(snapshot.snapshotLength, 3); i++) {
+            paragraphs.push(snapshot.snapshotItem(i).innerText || '');
+        }
+        
+        return {text: el.innerText || '', links: links, images: images, paragraphs: paragraphs};
+    });
+"""
+
+# Conta os anúncios carregados (um por "Identificação da biblioteca") e mede a página
+PAGE_STATE_SCRIPT = """
+    const count = (marker) => document.evaluate(
+        "count(//text()[contains(., '" + marker + "')])",
+        document, null, XPathResult.NUMBER_TYPE, null
+    ).numberValue;
+    const adCount = count('Identificação da biblioteca') + count('Library ID');
+    
+    return {
+        ad_count: adCount,
+        height: document.body ? document.body.scrollHeight : 0,
+        // Só procura o aviso de "nenhum resultado" enquanto não há anúncios
+        no_results: adCount === 0 && (count('Nenhum resultado') + count('No results')) > 0
+    };
+"""
+
+# Localiza os containers de anúncio em uma única passada pelos textos da página.
+# Um TreeWalker visita só os nós de texto com "Patrocinado"/"Sponsored" e, a partir
+# de cada um, sobe até 5 ancestrais procurando o container com os dados do anúncio.
+# O texto de cada ancestral é lido uma única vez (cache), em vez de ler o
+# textContent de todos os elementos da página e de seus ancestrais.
+# arguments[0]: máximo de anúncios; arguments[1]: exige link, imagem ou dados do
+# anúncio e descarta containers grandes demais.
+FIND_AD_CANDIDATES_SCRIPT = """
+    const maxResults = arguments[0] || 50;
+    const strict = !!arguments[1];
+    const INFO_MARKERS = ['Identificação da biblioteca', 'Veiculação iniciada'];
+    
+    if (!document.body) return [];
+    
+    const textCache = new Map();
+    const textOf = (el) => {
+        let text = textCache.get(el);
+        if (text === undefined) {
+            text = el.textContent || '';
+            textCache.set(el, text);
+        }
+        return text;
+    };
+    const hasInfo = (text) => INFO_MARKERS.some(marker => text.includes(marker));
+    
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, {
+        acceptNode: (node) => {
+            const value = node.nodeValue;
+            return (value.includes('Patrocinado') || value.includes('Sponsored'))
+                ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_SKIP;
+        }
+    });
+    
+    const visited = new Set();
+    const seenKeys = new Set();
+    const containers = [];
+    let node;
+    
+    while ((node = walker.nextNode()) && containers.length < maxResults) {
+        let container = node.parentElement;
+        for (let i = 0; i < 5 && container; i++) {
+            container = container.parentElement;
+            if (!container) break;
+            
+            const text = textOf(container);
+            if (!hasInfo(text) && text.length <= 200) continue;
+            
+            // Outro texto patrocinado já levou a este container
+            if (visited.has(container)) break;
+            visited.add(container);
+            
+            if (strict) {
+                const hasLink = container.querySelector('a[href*="facebook.com"], a[href*="ifood.com"]');
+                const hasImage = container.querySelector('img');
+                if (text.length >= 2000 || !(hasLink || hasImage || hasInfo(text))) break;
+            }
+            
+            // Remove duplicatas baseado no conteúdo
+            const key = text.substring(0, 100);
+            if (!seenKeys.has(key)) {
+                seenKeys.add(key);
+                containers.push(container);
+            }
+            break;
+        }
+    }
+    
+    return containers;
+"""
+
+class SearchError(Exception):
+    """Uma busca falhou (navegador, rede ou página que não carregou)
+    
+    Diferente de uma busca concluída sem anúncios: só esta pode ir para o cache.
+    """
+
+
 class FacebookAdsLibraryScraper:
-    def __init__(self, headless=True, use_proxy=False):
+    def __init__(self, headless=True, use_proxy=False, extraction_mode=None):
         self.base_url = "https://www.facebook.com/ads/library/"
         self.session = requests.Session()
         self.driver = None
         self.headless = headless
         self.use_proxy = use_proxy
+        self.startup_timings = {}
+        self.extraction_mode = extraction_mode or ScraperConfig.EXTRACTION_MODE
+        self.lean_page = False
+        self.navigation_count = 0
+        # Prazo da requisição em andamento (use_deadline); sem prazo por padrão
+        self.deadline = Deadline(None)
+        self._page_load_timeout = None
         
         # Headers para parecer mais humano
         self.headers = {
@@ -43,9 +307,10 @@ class FacebookAdsLibraryScraper:
     
     def setup_driver(self):
         """Configura o WebDriver do Selenium"""
-        from webdriver_manager.chrome import ChromeDriverManager
         from selenium.webdriver.chrome.service import Service
-        import os
+        
+        timings = {}
+        phase_start = time.time()
         
         chrome_options = Options()
         
@@ -67,6 +332,12 @@ class FacebookAdsLibraryScraper:
         chrome_options.add_argument("--disable-logging")
         chrome_options.add_argument("--disable-gpu-logging")
         chrome_options.add_argument("--silent")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        
+        # Abas em segundo plano continuam carregando na velocidade normal
+        chrome_options.add_argument("--disable-background-timer-throttling")
+        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+        chrome_options.add_argument("--disable-renderer-backgrounding")
         
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
@@ -77,48 +348,142 @@ class FacebookAdsLibraryScraper:
             pass
         
         try:
-            # Instalar ChromeDriver com correção para Windows
-            driver_path = ChromeDriverManager().install()
-            logger.info(f"ChromeDriver baixado em: {driver_path}")
-            
-            # Corrigir o caminho do ChromeDriver no Windows
-            if os.name == 'nt':  # Windows
-                driver_dir = os.path.dirname(driver_path)
-                # Procurar pelo executável real
-                for file in os.listdir(driver_dir):
-                    if file.endswith('.exe') and 'chromedriver' in file.lower():
-                        driver_path = os.path.join(driver_dir, file)
-                        break
-                else:
-                    # Se não encontrar, tentar na subpasta chromedriver-win32
-                    win32_dir = os.path.join(driver_dir, 'chromedriver-win32')
-                    if os.path.exists(win32_dir):
-                        for file in os.listdir(win32_dir):
-                            if file.endswith('.exe') and 'chromedriver' in file.lower():
-                                driver_path = os.path.join(win32_dir, file)
-                                break
-            
-            logger.info(f"ChromeDriver executável: {driver_path}")
-            
-            # Verificar se o arquivo existe
-            if not os.path.exists(driver_path):
-                raise FileNotFoundError(f"ChromeDriver não encontrado em: {driver_path}")
+            # Caminho do ChromeDriver resolvido uma única vez por processo
+            driver_path = resolve_chromedriver_path()
+            timings['resolve_driver'] = time.time() - phase_start
             
+            phase_start = time.time()
             service = Service(driver_path)
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.lean_page = False
+            self.navigation_count = 0
+            timings['launch_chrome'] = time.time() - phase_start
             
             # Scripts para evitar detecção
+            phase_start = time.time()
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             self.driver.execute_script("Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]})")
             self.driver.execute_script("Object.defineProperty(navigator, 'languages', {get: () => ['pt-BR', 'pt', 'en']})")
+            timings['stealth_scripts'] = time.time() - phase_start
             
-            logger.info("ChromeDriver configurado com sucesso")
+            self.startup_timings = timings
+            logger.info(f"ChromeDriver configurado com sucesso ({format_timings(timings)})")
             return self.driver
             
         except Exception as e:
             logger.error(f"Erro ao configurar ChromeDriver: {e}")
             raise
     
+    def warm_up(self):
+        """Inicia o navegador e carrega a biblioteca de anúncios antes do primeiro uso
+        
+        A primeira navegação paga DNS, TLS e o carregamento dos scripts do Facebook;
+        fazendo isso antes de aceitar tráfego, a primeira requisição não paga esse custo.
+        """
+        if not self.driver:
+            self.setup_driver()
+        
+        phase_start = time.time()
+        try:
+            self.navigate(ScraperConfig.WARMUP_URL)
+            self.startup_timings['warmup_navigation'] = time.time() - phase_start
+        except Exception as e:
+            logger.warning(f"Falha no aquecimento do navegador: {e}")
+        
+        logger.info(f"Navegador aquecido ({format_timings(self.startup_timings)})")
+    
+    def set_lean_page(self, enabled: bool):
+        """Liga/desliga o bloqueio de imagens, vídeos e fontes no navegador atual
+        
+        Usa a interceptação de rede do Chrome (CDP), então pode ser alternado entre
+        requisições sem reiniciar o driver. Os anúncios continuam com as URLs das
+        imagens, que vêm dos atributos src.
+        """
+        if not self.driver or self.lean_page == enabled:
+            return
+        
+        if self._set_blocked_urls(enabled):
+            self.lean_page = enabled
+            logger.debug(f"Modo página leve {'ativado' if enabled else 'desativado'}")
+    
+    def _set_blocked_urls(self, enabled: bool) -> bool:
+        """Aplica o bloqueio de recursos na aba atual (o CDP atua por aba)"""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {
+                'urls': list(ScraperConfig.LEAN_PAGE_BLOCKED_URLS) if enabled else []
+            })
+            return True
+        except Exception as e:
+            logger.warning(f"Não foi possível alterar o modo página leve: {e}")
+            return False
+    
+    @contextmanager
+    def use_deadline(self, deadline: Deadline):
+        """Aplica o prazo da requisição às esperas e laços do scraper enquanto ativo"""
+        previous = self.deadline
+        self.deadline = deadline
+        try:
+            yield self
+        finally:
+            self.deadline = previous
+    
+    def navigate(self, url: str, wait: bool = True):
+        """Abre uma URL na aba atual e contabiliza a navegação (usado na reciclagem do driver)
+        
+        Com ``wait=False`` a navegação é apenas disparada, sem aguardar o carregamento.
+        O carregamento espera no máximo BROWSER_TIMEOUT (ou o que resta do prazo);
+        ao estourar, segue com o conteúdo já carregado.
+        """
+        self.navigation_count += 1
+        if not wait:
+            self.driver.execute_script("window.location.href = arguments[0];", url)
+            return
+        
+        self.deadline.check('carregar a página')
+        timeout = max(self.deadline.clamp(ScraperConfig.BROWSER_TIMEOUT), 1)
+        try:
+            if timeout != self._page_load_timeout:
+                self.driver.set_page_load_timeout(timeout)
+                self._page_load_timeout = timeout
+        except Exception as e:
+            logger.debug(f"Não foi possível ajustar o timeout de carregamento: {e}")
+        
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            logger.warning(f"Carregamento da página excedeu {timeout:g}s; usando o conteúdo já carregado")
+            try:
+                self.driver.execute_script("window.stop();")
+            except Exception:
+                pass
+    
+    def get_browser_memory_mb(self) -> Optional[float]:
+        """Memória (RSS) do ChromeDriver e de todos os processos do Chrome, em MB
+        
+        Retorna None se o psutil não estiver instalado ou o processo não existir.
+        """
+        if not self.driver:
+            return None
+        try:
+            import psutil
+        except ImportError:
+            return None
+        
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total / (1024 * 1024)
+        except Exception as e:
+            logger.debug(f"Não foi possível medir a memória do navegador: {e}")
+            return None
+    
     def build_search_url(self, query: str, country: str = "BR", 
                         active_status: str = "active", 
                         ad_type: str = "all",
@@ -141,48 +506,70 @@ class FacebookAdsLibraryScraper:
     def human_delay(self, min_seconds=1, max_seconds=3):
         """Adiciona delay aleatório para simular comportamento humano"""
         delay = random.uniform(min_seconds, max_seconds)
-        time.sleep(delay)
+        time.sleep(self.deadline.clamp(delay))
+    
+    def get_page_state(self, driver) -> Dict:
+        """Quantidade de anúncios carregados e altura atual da página"""
+        return driver.execute_script(PAGE_STATE_SCRIPT) or {'ad_count': 0, 'height': 0, 'no_results': False}
     
-    def scroll_page(self, driver, scroll_pause_time=2):
-        """Faz scroll na página para carregar mais conteúdo"""
-        last_height = driver.execute_script("return document.body.scrollHeight")
+    def wait_for_ads(self, driver, timeout: float = None) -> Dict:
+        """Aguarda o primeiro anúncio (ou o aviso de "nenhum resultado") aparecer na página"""
+        if timeout is None:
+            timeout = ScraperConfig.AD_WAIT_TIMEOUT
+        timeout = self.deadline.clamp(timeout)
         
-        while True:
+        state = {'ad_count': 0, 'height': 0, 'no_results': False}
+        
+        def ads_ready(d):
+            nonlocal state
+            state = self.get_page_state(d)
+            return state['ad_count'] > 0 or state['no_results']
+        
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.25).until(ads_ready)
+        except TimeoutException:
+            logger.warning(f"Nenhum anúncio apareceu em {timeout}s")
+        return state
+    
+    def scroll_page(self, driver, scroll_pause_time=2, target_count: Optional[int] = None):
+        """Faz scroll na página para carregar mais conteúdo
+        
+        Em vez de dormir um tempo fixo, cada scroll espera no máximo
+        ``scroll_pause_time`` segundos até a quantidade de anúncios ou a altura da
+        página crescer. Para quando nada novo carrega, quando ``target_count``
+        anúncios já estão na página ou quando o prazo da requisição termina.
+        """
+        state = self.get_page_state(driver)
+        
+        for _ in range(ScraperConfig.MAX_SCROLLS):
+            if target_count and state['ad_count'] >= target_count:
+                logger.info(f"{state['ad_count']} anúncios carregados, scroll encerrado")
+                break
+            if self.deadline.expired():
+                logger.warning(f"Prazo esgotado durante o scroll; usando os {state['ad_count']} anúncios carregados")
+                break
+            
             # Scroll para baixo
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             
-            # Aguarda carregar
-            time.sleep(scroll_pause_time)
+            # Aguarda novos anúncios ou aumento da página
+            last_state = state
             
-            # Calcula nova altura
-            new_height = driver.execute_script("return document.body.scrollHeight")
+            def page_grew(d):
+                nonlocal state
+                state = self.get_page_state(d)
+                return state['ad_count'] > last_state['ad_count'] or state['height'] > last_state['height']
             
-            if new_height == last_height:
+            try:
+                WebDriverWait(driver, self.deadline.clamp(scroll_pause_time), poll_frequency=0.2).until(page_grew)
+            except TimeoutException:
                 break
-            
-            last_height = new_height
+        
+        return state
     
     def extract_ad_data(self, ad_element) -> Dict:
-        """Extrai dados de um anúncio específico"""
+        """Extrai dados de um anúncio específico (uma chamada ao WebDriver por campo)"""
         try:
-            ad_data = {
-                'advertiser_name': '',
-                'ad_text': '',
-                'ad_type': '',
-                'start_date': '',
-                'end_date': '',
-                'impressions': '',
-                'spend': '',
-                'demographics': {},
-                'locations': [],
-                'image_urls': [],
-                'video_urls': [],
-                'link_url': '',
-                'ad_id': '',
-                'platforms': [],
-                'scraped_at': datetime.now().isoformat()
-            }
-            
             # Pega todo o texto do elemento
             element_text = ''
             try:
@@ -190,161 +577,116 @@ class FacebookAdsLibraryScraper:
             except:
                 pass
             
-            # Extrai ID da biblioteca de anúncios
+            links = []
             try:
-                if 'Identificação da biblioteca:' in element_text:
-                    lines = element_text.split('\n')
-                    for line in lines:
-                        if 'Identificação da biblioteca:' in line:
-                            ad_data['ad_id'] = line.replace('Identificação da biblioteca:', '').strip()
-                            break
+                for link in ad_element.find_elements(By.TAG_NAME, "a"):
+                    links.append({'href': link.get_attribute('href') or '', 'text': link.text})
             except:
                 pass
             
-            # Extrai nome do anunciante - estratégias múltiplas
-            advertiser_name = ''
-            
-            # Estratégia 1: Procura por texto antes de "Patrocinado"
+            image_srcs = []
             try:
-                lines = element_text.split('\n')
-                for i, line in enumerate(lines):
-                    if 'Patrocinado' in line and i > 0:
-                        potential_name = lines[i-1].strip()
-                        if potential_name and len(potential_name) > 2 and len(potential_name) < 100:
-                            advertiser_name = potential_name
-                            break
+                image_srcs = [img.get_attribute('src') for img in ad_element.find_elements(By.TAG_NAME, "img")]
             except:
                 pass
             
-            # Estratégia 2: Procura por links do Facebook
-            if not advertiser_name:
-                try:
-                    links = ad_element.find_elements(By.TAG_NAME, "a")
-                    for link in links:
-                        href = link.get_attribute('href') or ''
-                        text = link.text.strip()
-                        if 'facebook.com' in href and text and len(text) > 2:
-                            advertiser_name = text
-                            break
-                except:
-                    pass
-            
-            # Estratégia 3: Procura na primeira linha válida
-            if not advertiser_name:
+            def paragraphs():
+                # Procura por parágrafos com texto significativo
                 try:
-                    lines = element_text.split('\n')
-                    for line in lines[:10]:  # Verifica as primeiras 10 linhas
-                        line = line.strip()
-                        if (len(line) > 2 and len(line) < 100 and 
-                            not any(word in line.lower() for word in [
-                                'biblioteca', 'anúncios', 'filtros', 'resultado', 
-                                'ativo', 'lançados', 'veiculação', 'plataformas'
-                            ])):
-                            advertiser_name = line
-                            break
-                except:
-                    pass
-            
-            ad_data['advertiser_name'] = advertiser_name
-            
-            # Extrai texto do anúncio
-            ad_text = ''
-            try:
-                # Procura por texto após "Patrocinado" até encontrar links ou metadata
-                lines = element_text.split('\n')
-                capturing = False
-                captured_lines = []
-                
-                for line in lines:
-                    line = line.strip()
-                    
-                    if 'Patrocinado' in line:
-                        capturing = True
-                        continue
-                    
-                    if capturing:
-                        # Para de capturar se encontrar metadata ou links
-                        if any(stop_word in line.lower() for stop_word in [
-                            'ifood.com', 'facebook.com', 'identificação da biblioteca',
-                            'veiculação iniciada', 'plataformas', 'ver detalhes'
-                        ]):
-                            break
-                        
-                        # Adiciona linha se for texto relevante
-                        if line and len(line) > 5 and not line.startswith('#'):
-                            captured_lines.append(line)
-                            
-                        # Limita a quantidade de texto
-                        if len(captured_lines) >= 5:
-                            break
-                
-                ad_text = ' '.join(captured_lines)
-                
-                # Se não conseguiu capturar assim, tenta outros métodos
-                if not ad_text:
-                    # Procura por parágrafos com texto significativo
                     text_elements = ad_element.find_elements(By.XPATH, ".//p | .//div[string-length(text()) > 30]")
-                    texts = []
-                    for elem in text_elements[:3]:
-                        text = elem.text.strip()
-                        if (len(text) > 30 and len(text) < 500 and 
-                            'Identificação da biblioteca' not in text and
-                            'Veiculação iniciada' not in text):
-                            texts.append(text)
-                    ad_text = ' '.join(texts)
-                    
-            except:
-                pass
-                
-            ad_data['ad_text'] = ad_text[:500]  # Limita a 500 caracteres
-            
-            # Extrai data de início
-            try:
-                if 'Veiculação iniciada em' in element_text:
-                    lines = element_text.split('\n')
-                    for line in lines:
-                        if 'Veiculação iniciada em' in line:
-                            ad_data['start_date'] = line.strip()
-                            break
-            except:
-                pass
-            
-            # Extrai URLs de imagens
-            try:
-                img_elements = ad_element.find_elements(By.TAG_NAME, "img")
-                image_urls = []
-                for img in img_elements:
-                    src = img.get_attribute('src')
-                    if src and ('scontent' in src or 'fbcdn' in src):
-                        image_urls.append(src)
-                ad_data['image_urls'] = image_urls[:3]  # Limita a 3 imagens
-            except:
-                pass
-            
-            # Extrai link de destino
-            try:
-                links = ad_element.find_elements(By.TAG_NAME, "a")
-                for link in links:
-                    href = link.get_attribute('href') or ''
-                    if any(domain in href for domain in ['ifood.com', 'instagram.com', 'whatsapp']):
-                        ad_data['link_url'] = href
-                        break
-            except:
-                pass
+                    return [elem.text for elem in text_elements[:3]]
+                except:
+                    return []
             
-            # Só retorna se encontrou dados úteis
-            if ad_data['advertiser_name'] or (ad_data['ad_text'] and len(ad_data['ad_text']) > 30):
-                return ad_data
-            else:
-                return {}
+            return build_ad_data(element_text, links, image_srcs, paragraphs)
             
         except Exception as e:
             logger.error(f"Erro ao extrair dados do anúncio: {str(e)}")
             return {}
     
+    def extract_ads_data(self, ad_elements: List, match_only: bool = False) -> List[Dict]:
+        """Extrai os dados de vários anúncios de acordo com o modo de extração
+        
+        No modo "js" um único script coleta texto, links, imagens e parágrafos de
+        todos os elementos e devolve um array JSON, sem idas e voltas ao WebDriver
+        por anúncio. No modo "element" cada anúncio é lido campo a campo.
+        Com ``match_only`` o modo "js" devolve só anunciante, texto e ID.
+        """
+        if not ad_elements:
+            return []
+        
+        if self.extraction_mode == 'js':
+            try:
+                payloads = self.driver.execute_script(EXTRACT_ADS_SCRIPT, ad_elements, match_only) or []
+                build = build_match_data if match_only else build_ad_data_from_payload
+                return [build(payload) for payload in payloads]
+            except Exception as e:
+                logger.warning(f"Falha na extração via script, usando extração por elemento: {e}")
+        
+        ads_data = []
+        for ad_element in ad_elements:
+            if self.deadline.expired():
+                logger.warning(f"Prazo esgotado na extração; {len(ads_data)} de {len(ad_elements)} anúncios extraídos")
+                break
+            ads_data.append(self.extract_ad_data(ad_element))
+            # Delay entre extrações
+            self.human_delay(0.3, 1.0)
+        return ads_data
+    
     def search_ads_by_location_and_type(self, location: str, business_type: str, 
-                                      max_results: int = 50) -> List[Dict]:
+                                      max_results: int = 50, lean_page: bool = False) -> List[Dict]:
         """Busca anúncios por localização e tipo de negócio"""
+        try:
+            return self.submit_search_ads_by_location_and_type(location, business_type, max_results, lean_page).result()
+        except Exception as e:
+            logger.error(f"Erro na busca de anúncios: {str(e)}")
+            return []
+    
+    def submit_search_ads_by_location_and_type(self, location: str, business_type: str,
+                                             max_results: int = 50, lean_page: bool = False) -> Future:
+        """Busca anúncios e devolve um Future com o resultado
+        
+        No modo "html" o Future é resolvido por um processo de parsing e o navegador
+        já pode ser devolvido ao pool assim que a página é capturada; nos outros
+        modos a extração acontece aqui e o Future já vem resolvido.
+        """
+        cache_key = None
+        if search_cache:
+            cache_key = location_cache_key(location, business_type, max_results)
+            cached = search_cache.get_cached_data(cache_key)
+            if cached is not None:
+                logger.info(f"Resultado em cache para {business_type} em {location}")
+                future = Future()
+                future.set_result(cached)
+                return future
+        
+        result = self._search_ads_by_location_and_type(location, business_type, max_results, lean_page)
+        if not isinstance(result, Future):
+            future = Future()
+            future.set_result(result)
+            result = future
+        
+        # Resultado parcial (prazo esgotado durante a busca) não vai para o cache
+        if cache_key and not self.deadline.expired():
+            result.add_done_callback(lambda done: self._cache_future_result(cache_key, done))
+        return result
+    
+    def _cache_future_result(self, cache_key: str, future: Future):
+        """Salva no cache o resultado de uma busca concluída com anúncios"""
+        if future.exception() is None and is_cacheable(future.result()):
+            search_cache.save_to_cache(cache_key, future.result())
+    
+    def _capture_empty_snapshot(self, future: Future, page_source: str):
+        """Salva o snapshot quando o parsing não encontrou anúncios"""
+        try:
+            ads = future.result()
+        except Exception:
+            ads = []
+        if not ads or ads[0].get('debug_info'):
+            debug_artifacts.capture_html(page_source, 'no_ads', force=True)
+    
+    def _search_ads_by_location_and_type(self, location: str, business_type: str,
+                                       max_results: int = 50, lean_page: bool = False):
         try:
             # Monta query de busca
             query = f"{business_type} {location}"
@@ -353,38 +695,30 @@ class FacebookAdsLibraryScraper:
             if not self.driver:
                 self.setup_driver()
             
+            self.set_lean_page(lean_page)
+            
             # Constrói URL
             search_url = self.build_search_url(query)
             logger.info(f"Buscando anúncios para: {query}")
             logger.info(f"URL: {search_url}")
             
             # Acessa a página
-            self.driver.get(search_url)
-            self.human_delay(3, 5)
+            self.navigate(search_url)
             
             # Aguarda carregar
             try:
-                WebDriverWait(self.driver, 10).until(
+                WebDriverWait(self.driver, self.deadline.clamp(10)).until(
                     EC.presence_of_element_located((By.TAG_NAME, "body"))
                 )
             except:
                 logger.warning("Timeout aguardando carregar página")
             
-            # Scroll para carregar mais anúncios
-            self.scroll_page(self.driver)
-            
-            # Extrai anúncios
-            ads_data = []
+            # Aguarda os primeiros anúncios e faz scroll só até ter o suficiente
+            self.wait_for_ads(self.driver)
+            self.scroll_page(self.driver, ScraperConfig.SCROLL_PAUSE_TIME, target_count=max_results)
             
-            # Aguarda a página carregar completamente
-            self.human_delay(5, 8)
-            
-            # Debug: salva screenshot para verificar o que está sendo carregado
-            try:
-                self.driver.save_screenshot("debug_page.png")
-                logger.info("Screenshot salvo como debug_page.png")
-            except:
-                pass
+            # Debug: screenshot e HTML por amostragem, gravados em segundo plano
+            debug_artifacts.capture(self.driver, 'search')
             
             # Debug: verifica se chegou na página correta
             current_url = self.driver.current_url
@@ -392,12 +726,19 @@ class FacebookAdsLibraryScraper:
             logger.info(f"URL atual: {current_url}")
             logger.info(f"Título da página: {page_title}")
             
-            # Verifica se há conteúdo na página
-            page_source = self.driver.page_source
             if "ads/library" not in current_url.lower():
                 logger.warning("Não está na página da biblioteca de anúncios")
                 return []
             
+            # Snapshot da página: o parsing acontece em outro processo
+            if self.extraction_mode == 'html':
+                page_source = self.driver.page_source
+                pending_ads = submit_search_snapshot(page_source, current_url, max_results)
+                pending_ads.add_done_callback(
+                    lambda future: self._capture_empty_snapshot(future, page_source)
+                )
+                return pending_ads
+            
             # Seletores mais robustos e específicos para anúncios individuais
             ad_selectors = [
                 # Seletores mais específicos para anúncios individuais
@@ -418,42 +759,8 @@ class FacebookAdsLibraryScraper:
             for selector in ad_selectors:
                 try:
                     if ":has(" in selector:
-                        # Para seletores CSS avançados, usa JavaScript
-                        elements = self.driver.execute_script("""
-                            // Procura por elementos que parecem ser anúncios individuais
-                            const candidates = [];
-                            const allDivs = document.querySelectorAll('div');
-                            
-                            allDivs.forEach(div => {
-                                const text = div.textContent || '';
-                                const hasLink = div.querySelector('a[href*="facebook.com"]') || div.querySelector('a[href*="ifood.com"]');
-                                const hasImage = div.querySelector('img');
-                                const hasPatrocinado = text.includes('Patrocinado') || text.includes('Sponsored');
-                                const hasAdInfo = text.includes('Identificação da biblioteca') || text.includes('Veiculação iniciada');
-                                
-                                // Verifica se é um container de anúncio válido
-                                if (hasPatrocinado && (hasLink || hasImage || hasAdInfo)) {
-                                    // Verifica se não é um container muito grande (evita duplicatas)
-                                    if (text.length < 2000) {
-                                        candidates.push(div);
-                                    }
-                                }
-                            });
-                            
-                            // Remove duplicatas baseado no conteúdo
-                            const unique = [];
-                            const seen = new Set();
-                            
-                            candidates.forEach(candidate => {
-                                const key = candidate.textContent.substring(0, 100);
-                                if (!seen.has(key)) {
-                                    seen.add(key);
-                                    unique.push(candidate);
-                                }
-                            });
-                            
-                            return unique;
-                        """)
+                        # Para seletores CSS avançados, usa o localizador de anúncios em JavaScript
+                        elements = self.driver.execute_script(FIND_AD_CANDIDATES_SCRIPT, max_results, True)
                         if elements:
                             ads_found = elements
                             used_selector = selector
@@ -488,44 +795,7 @@ class FacebookAdsLibraryScraper:
                 logger.warning("Tentando busca mais focada por anúncios...")
                 try:
                     # Busca específica por elementos que contenham "Patrocinado"
-                    elements = self.driver.execute_script("""
-                        const ads = [];
-                        const allElements = document.querySelectorAll('*');
-                        
-                        allElements.forEach(elem => {
-                            const text = elem.textContent || '';
-                            if (text.includes('Patrocinado') || text.includes('Sponsored')) {
-                                // Procura o container pai que contenha o anúncio completo
-                                let container = elem;
-                                for (let i = 0; i < 5; i++) {
-                                    container = container.parentElement;
-                                    if (!container) break;
-                                    
-                                    const containerText = container.textContent || '';
-                                    if (containerText.includes('Identificação da biblioteca') || 
-                                        containerText.includes('Veiculação iniciada') ||
-                                        containerText.length > 200) {
-                                        ads.push(container);
-                                        break;
-                                    }
-                                }
-                            }
-                        });
-                        
-                        // Remove duplicatas
-                        const unique = [];
-                        const seen = new Set();
-                        
-                        ads.forEach(ad => {
-                            const key = ad.textContent.substring(0, 100);
-                            if (!seen.has(key)) {
-                                seen.add(key);
-                                unique.push(ad);
-                            }
-                        });
-                        
-                        return unique.slice(0, 10); // Máximo 10 anúncios únicos
-                    """)
+                    elements = self.driver.execute_script(FIND_AD_CANDIDATES_SCRIPT, 10, False)
                     
                     if elements:
                         ads_found = elements
@@ -536,67 +806,21 @@ class FacebookAdsLibraryScraper:
             
             if not ads_found:
                 logger.warning("Nenhum anúncio encontrado com nenhum seletor")
+                debug_artifacts.capture(self.driver, 'no_ads', force=True)
                 return []
             
             logger.info(f"Usando seletor: {used_selector}, encontrados {len(ads_found)} elementos únicos")
             
             # Extrai dados de cada anúncio com filtragem de duplicatas
-            ads_data = []
-            seen_ads = set()  # Para evitar duplicatas
-            
-            for i, ad_element in enumerate(ads_found[:max_results]):
-                try:
-                    ad_data = self.extract_ad_data(ad_element)
-                    
-                    if ad_data and (ad_data.get('advertiser_name') or ad_data.get('ad_text')):
-                        # Cria uma chave única para identificar duplicatas
-                        ad_key = f"{ad_data.get('advertiser_name', '')[:50]}_{ad_data.get('ad_text', '')[:100]}"
-                        ad_key = ad_key.lower().replace(' ', '').replace('\n', '')
-                        
-                        if ad_key not in seen_ads:
-                            seen_ads.add(ad_key)
-                            ads_data.append(ad_data)
-                            
-                            # Log melhorado
-                            advertiser = ad_data.get('advertiser_name', 'N/A')
-                            text_preview = ad_data.get('ad_text', '')[:50]
-                            ad_id = ad_data.get('ad_id', 'N/A')
-                            logger.info(f"Anúncio {len(ads_data)} extraído: {advertiser} | ID: {ad_id} | Texto: {text_preview}...")
-                        else:
-                            logger.debug(f"Anúncio {i+1} ignorado (duplicata)")
-                    else:
-                        logger.debug(f"Anúncio {i+1} sem dados válidos")
-                    
-                    # Delay entre extrações
-                    self.human_delay(0.3, 1.0)
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao extrair anúncio {i+1}: {str(e)}")
-                    continue
+            ads_data = unique_ads(self.extract_ads_data(ads_found[:max_results]))
             
             # Se não encontrou nenhum anúncio válido, retorna info de debug
             if not ads_data:
                 logger.warning("Nenhum anúncio válido encontrado")
+                debug_artifacts.capture(self.driver, 'no_ads', force=True)
                 try:
                     page_text = self.driver.find_element(By.TAG_NAME, "body").text
-                    
-                    # Verifica se há indicação de que não há anúncios
-                    if any(phrase in page_text.lower() for phrase in [
-                        'nenhum resultado', 'no results', '0 resultado', 'sem anúncios'
-                    ]):
-                        logger.info("Página indica que não há anúncios para os critérios especificados")
-                        return []
-                    
-                    # Cria um anúncio de debug apenas se necessário
-                    debug_ad = {
-                        'advertiser_name': 'Debug - Análise da página',
-                        'ad_text': 'Página carregada mas nenhum anúncio específico foi extraído',
-                        'debug_info': f"URL: {self.driver.current_url}",
-                        'page_sample': page_text[:300] + "...",
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    return [debug_ad]
-                    
+                    return debug_ads_for_page(page_text, self.driver.current_url)
                 except Exception as e:
                     logger.error(f"Erro no método de debug: {e}")
                     return []
@@ -725,8 +949,11 @@ class FacebookAdsLibraryScraper:
             self.driver.quit()
             self.driver = None
 
-    def check_establishment_by_address(self, maps_address: str) -> Dict:
-        """Verifica se um estabelecimento tem anúncios baseado no endereço do Google Maps"""
+    def check_establishment_by_address(self, maps_address: str, lean_page: bool = True) -> Dict:
+        """Verifica se um estabelecimento tem anúncios baseado no endereço do Google Maps
+        
+        Por padrão usa o modo página leve: a verificação só precisa de texto, IDs e URLs.
+        """
         try:
             # Extrai informações do endereço
             address_info = self.parse_maps_address(maps_address)
@@ -740,63 +967,66 @@ class FacebookAdsLibraryScraper:
                 }
             
             # Busca por anúncios usando diferentes estratégias
-            search_strategies = []
-            
-            # Estratégia 1: Nome do estabelecimento + cidade
-            if address_info.get('name') and address_info.get('city'):
-                search_strategies.append({
-                    'query': f"{address_info['name']} {address_info['city']}",
-                    'type': 'name_city'
-                })
-            
-            # Estratégia 2: Nome do estabelecimento + bairro
-            if address_info.get('name') and address_info.get('neighborhood'):
-                search_strategies.append({
-                    'query': f"{address_info['name']} {address_info['neighborhood']}",
-                    'type': 'name_neighborhood'
-                })
-            
-            # Estratégia 3: Apenas nome do estabelecimento
-            if address_info.get('name'):
-                search_strategies.append({
-                    'query': address_info['name'],
-                    'type': 'name_only'
-                })
-            
-            # Estratégia 4: Busca por categoria + localização
-            if address_info.get('category') and address_info.get('city'):
-                search_strategies.append({
-                    'query': f"{address_info['category']} {address_info['city']}",
-                    'type': 'category_city'
-                })
+            search_strategies = self.build_search_strategies(address_info)
             
             all_ads = []
-            matching_ads = []
-            
-            # Executa as estratégias de busca
-            for strategy in search_strategies:
-                logger.info(f"Buscando com estratégia {strategy['type']}: {strategy['query']}")
-                
-                try:
-                    ads = self.search_ads_by_keywords(strategy['query'], max_results=20)
-                    all_ads.extend(ads)
+            matching_by_strategy = {}
+            completed = set()
+            failed = 0
+            winner = None
+            # Anúncios já avaliados (por ID da biblioteca), compartilhados entre as estratégias
+            seen_ads = AdDedupeIndex()
+            matcher = AdMatcher([address_info])
+            
+            # Executa as estratégias de busca; a de maior prioridade (menor índice)
+            # com correspondência vence e as demais são canceladas
+            strategy_results = self._run_search_strategies(search_strategies, lean_page)
+            try:
+                for index, ads in strategy_results:
+                    strategy = search_strategies[index]
+                    completed.add(index)
+                    if ads is None:
+                        failed += 1
+                        ads = []
+                    
+                    # Avalia de uma vez só os anúncios novos (correspondência e confiança);
+                    # os já vistos em outra estratégia reaproveitam a avaliação anterior
+                    fresh_ads = [ad for ad in ads if ad not in seen_ads]
+                    for ad, (is_match, confidence) in zip(fresh_ads, matcher.match(fresh_ads)):
+                        if seen_ads.add(ad, confidence if is_match else None):
+                            all_ads.append(ad)
                     
-                    # Verifica se algum anúncio corresponde ao estabelecimento
+                    matches = []
+                    matched_keys = set()
                     for ad in ads:
-                        if self.is_matching_establishment(ad, address_info):
-                            matching_ads.append({
+                        confidence = seen_ads.get(ad)
+                        key = seen_ads.key_for(ad)
+                        if confidence is not None and key not in matched_keys:
+                            matched_keys.add(key)
+                            matches.append({
                                 **ad,
                                 'match_strategy': strategy['type'],
-                                'match_confidence': self.calculate_match_confidence(ad, address_info)
+                                'match_confidence': confidence
                             })
+                    if matches:
+                        matching_by_strategy[index] = matches
+                    
+                    # Vence a primeira estratégia com correspondência cujas anteriores já terminaram
+                    for candidate in range(len(search_strategies)):
+                        if candidate not in completed:
+                            break
+                        if candidate in matching_by_strategy:
+                            winner = candidate
+                            break
                     
-                    # Se encontrou correspondências, não precisa continuar
-                    if matching_ads:
+                    if winner is not None:
+                        logger.info(f"Correspondência encontrada com a estratégia {search_strategies[winner]['type']}")
                         break
-                        
-                except Exception as e:
-                    logger.error(f"Erro na estratégia {strategy['type']}: {e}")
-                    continue
+            finally:
+                # Cancela as estratégias ainda em andamento
+                strategy_results.close()
+            
+            matching_ads = matching_by_strategy.get(winner, [])
             
             # Ordena por confiança da correspondência
             matching_ads.sort(key=lambda x: x.get('match_confidence', 0), reverse=True)
@@ -807,6 +1037,10 @@ class FacebookAdsLibraryScraper:
                 'total_matching_ads': len(matching_ads),
                 'total_ads_searched': len(all_ads),
                 'matching_ads': matching_ads[:5],  # Top 5 correspondências
+                # Buscas que falharam: sem correspondência, "sem anúncios" não é conclusivo
+                'failed_searches': failed,
+                # Prazo esgotado: estratégias não executadas contam como falhas
+                'timed_out': self.deadline.expired(),
                 'establishment_info': address_info,
                 'maps_address': maps_address,
                 'analysis_date': datetime.now().isoformat()
@@ -822,6 +1056,119 @@ class FacebookAdsLibraryScraper:
                 'analysis_date': datetime.now().isoformat()
             }
     
+    def has_ads_by_address(self, maps_address: str, lean_page: bool = True,
+                           raise_errors: bool = False) -> bool:
+        """Verificação rápida: o estabelecimento tem algum anúncio correspondente?
+        
+        Diferente de check_establishment_by_address, para no primeiro anúncio que
+        corresponde ao estabelecimento (de qualquer estratégia), não calcula
+        confiança nem ordena resultados e extrai só anunciante, texto e ID.
+        Com ``raise_errors`` um "não" com buscas que falharam levanta SearchError
+        e um "não" com o prazo esgotado levanta DeadlineExceeded.
+        """
+        try:
+            address_info = self.parse_maps_address(maps_address)
+            if not address_info:
+                return False
+            
+            strategy_results = self._run_search_strategies(
+                self.build_search_strategies(address_info), lean_page, match_only=True
+            )
+            failed = 0
+            # Anúncios que aparecem em mais de uma estratégia só são avaliados uma vez
+            seen_ads = AdDedupeIndex()
+            matcher = AdMatcher([address_info])
+            try:
+                for index, ads in strategy_results:
+                    if ads is None:
+                        failed += 1
+                    elif any(is_match for is_match, _ in matcher.match([ad for ad in ads if seen_ads.add(ad)])):
+                        return True
+            finally:
+                # Cancela as estratégias ainda em andamento
+                strategy_results.close()
+            
+            # Prazo esgotado sem correspondência: as buscas podem ter parado com resultados
+            # parciais, então "sem anúncios" não é uma resposta confiável
+            if raise_errors and self.deadline.expired():
+                raise DeadlineExceeded(f"Prazo de {self.deadline.seconds:g}s esgotado antes de concluir as buscas")
+            if failed and raise_errors:
+                raise SearchError(f"{failed} busca(s) falharam; não é possível afirmar que não há anúncios")
+            return False
+            
+        except (SearchError, DeadlineExceeded):
+            raise
+        except Exception as e:
+            logger.error(f"Erro na verificação rápida de anúncios: {e}")
+            if raise_errors:
+                raise SearchError(str(e)) from e
+            return False
+    
+    def build_search_strategies(self, address_info: Dict) -> List[Dict]:
+        """Monta as buscas para um estabelecimento, em ordem de prioridade"""
+        search_strategies = []
+        
+        # Estratégia 1: Nome do estabelecimento + cidade
+        if address_info.get('name') and address_info.get('city'):
+            search_strategies.append({
+                'query': f"{address_info['name']} {address_info['city']}",
+                'type': 'name_city'
+            })
+        
+        # Estratégia 2: Nome do estabelecimento + bairro
+        if address_info.get('name') and address_info.get('neighborhood'):
+            search_strategies.append({
+                'query': f"{address_info['name']} {address_info['neighborhood']}",
+                'type': 'name_neighborhood'
+            })
+        
+        # Estratégia 3: Apenas nome do estabelecimento
+        if address_info.get('name'):
+            search_strategies.append({
+                'query': address_info['name'],
+                'type': 'name_only'
+            })
+        
+        # Estratégia 4: Busca por categoria + localização
+        if address_info.get('category') and address_info.get('city'):
+            search_strategies.append({
+                'query': f"{address_info['category']} {address_info['city']}",
+                'type': 'category_city'
+            })
+        
+        return search_strategies
+    
+    def _run_search_strategies(self, strategies: List[Dict], lean_page: bool,
+                               match_only: bool = False) -> Iterator[Tuple[int, Optional[List[Dict]]]]:
+        """Executa as buscas das estratégias, em abas paralelas quando habilitado
+        
+        Gera (índice da estratégia, anúncios) conforme cada busca termina, com None
+        no lugar dos anúncios quando a busca falhou; fechar o gerador interrompe as
+        buscas restantes.
+        """
+        if ScraperConfig.PARALLEL_STRATEGIES and len(strategies) > 1:
+            logger.info(f"Buscando {len(strategies)} estratégias em paralelo: "
+                        f"{', '.join(strategy['type'] for strategy in strategies)}")
+            yield from self.search_keywords_in_tabs(
+                [strategy['query'] for strategy in strategies], max_results=20,
+                lean_page=lean_page, match_only=match_only, report_errors=True
+            )
+            return
+        
+        for index, strategy in enumerate(strategies):
+            if self.deadline.expired():
+                logger.warning(f"Prazo esgotado; estratégia {strategy['type']} não executada")
+                yield index, None
+                continue
+            logger.info(f"Buscando com estratégia {strategy['type']}: {strategy['query']}")
+            try:
+                ads = self.search_ads_by_keywords(strategy['query'], max_results=20, lean_page=lean_page,
+                                                  match_only=match_only, raise_errors=True)
+            except Exception as e:
+                logger.error(f"Erro na estratégia {strategy['type']}: {e}")
+                ads = None
+            yield index, ads
+    
     def parse_maps_address(self, maps_address: str) -> Dict:
         """Extrai informações do endereço do Google Maps"""
         try:
@@ -836,9 +1183,6 @@ class FacebookAdsLibraryScraper:
                 'original_address': maps_address
             }
             
-            # Estratégias para extrair informações
-            address_lower = maps_address.lower()
-            
             # Extrai nome do estabelecimento (geralmente vem antes do primeiro hífen ou vírgula)
             if ' - ' in maps_address:
                 potential_name = maps_address.split(' - ')[0].strip()
@@ -849,45 +1193,9 @@ class FacebookAdsLibraryScraper:
                 if len(potential_name) > 2 and len(potential_name) < 100:
                     address_info['name'] = potential_name
             
-            # Identifica cidades principais do Brasil
-            brazilian_cities = [
-                'rio de janeiro', 'são paulo', 'brasília', 'salvador', 'fortaleza',
-                'belo horizonte', 'manaus', 'curitiba', 'recife', 'porto alegre',
-                'goiânia', 'belém', 'guarulhos', 'campinas', 'nova iguaçu',
-                'são bernardo do campo', 'niterói', 'florianópolis'
-            ]
-            
-            for city in brazilian_cities:
-                if city in address_lower:
-                    address_info['city'] = city.title()
-                    break
-            
-            # Identifica bairros comuns (pode ser expandido)
-            common_neighborhoods = [
-                'copacabana', 'ipanema', 'leblon', 'botafogo', 'tijuca',
-                'barra da tijuca', 'centro', 'zona sul', 'zona norte',
-                'vila olímpia', 'pinheiros', 'vila madalena', 'morumbi'
-            ]
-            
-            for neighborhood in common_neighborhoods:
-                if neighborhood in address_lower:
-                    address_info['neighborhood'] = neighborhood.title()
-                    break
-            
-            # Identifica categorias de estabelecimento
-            categories = {
-                'restaurante': ['restaurante', 'bar', 'lanchonete', 'pizzaria', 'hamburgueria'],
-                'academia': ['academia', 'fitness', 'crossfit', 'pilates'],
-                'salão': ['salão', 'barbershop', 'barbearia', 'cabeleireiro'],
-                'loja': ['loja', 'store', 'boutique', 'magazine'],
-                'hotel': ['hotel', 'pousada', 'hostel'],
-                'clínica': ['clínica', 'consultório', 'médico', 'dentista']
-            }
-            
-            for category, keywords in categories.items():
-                if any(keyword in address_lower for keyword in keywords):
-                    address_info['category'] = category
-                    break
+            # Cidade, UF, bairro e categoria em uma passada pelo gazetteer
+            # (todos os municípios do Brasil, sem diferenciar acentos)
+            address_info.update(get_gazetteer().parse(maps_address))
             
             return address_info
             
@@ -895,112 +1203,336 @@ class FacebookAdsLibraryScraper:
             logger.error(f"Erro ao fazer parse do endereço: {e}")
             return None
     
-    def search_ads_by_keywords(self, keywords: str, max_results: int = 20) -> List[Dict]:
-        """Busca anúncios por palavras-chave (método simplificado)"""
+    def search_ads_by_keywords(self, keywords: str, max_results: int = 20, lean_page: bool = False,
+                               match_only: bool = False, raise_errors: bool = False) -> List[Dict]:
+        """Busca anúncios por palavras-chave (método simplificado)
+        
+        Buscas idênticas simultâneas (em qualquer driver do processo) são agrupadas:
+        só a primeira abre a página e as demais recebem o mesmo resultado. Com o
+        cache no Redis o resultado de outro container é reaproveitado; a espera
+        por uma busca em andamento em outro container só ocorre por estabelecimento
+        (cached_establishment_check), antes de obter um driver.
+        Com ``raise_errors`` uma busca que falhou (ou cuja página não confirmou a
+        ausência de anúncios) levanta SearchError em vez de devolver lista vazia.
+        """
+        cached = self._get_cached_keyword_results(keywords, max_results, match_only)
+        if cached is not None:
+            return cached
+        
+        key = self._keyword_flight_key(keywords, max_results, lean_page, match_only)
+        try:
+            return keyword_flights.do(key, lambda: self._search_ads_by_keywords(keywords, max_results, lean_page, match_only),
+                                      deadline=self.deadline)
+        except SearchError as e:
+            if raise_errors:
+                raise
+            logger.error(f"Erro na busca por palavras-chave: {e}")
+            return []
+    
+    def _search_ads_by_keywords(self, keywords: str, max_results: int, lean_page: bool,
+                                match_only: bool) -> List[Dict]:
         try:
             # Configura driver se necessário
             if not self.driver:
                 self.setup_driver()
             
+            self.set_lean_page(lean_page)
+            
             # Constrói URL de busca
             search_url = self.build_search_url(keywords)
             logger.info(f"Buscando anúncios para palavras-chave: {keywords}")
             
             # Acessa a página
-            self.driver.get(search_url)
-            self.human_delay(2, 4)
+            self.navigate(search_url)
             
             # Aguarda carregar
             try:
-                WebDriverWait(self.driver, 10).until(
+                WebDriverWait(self.driver, self.deadline.clamp(10)).until(
                     EC.presence_of_element_located((By.TAG_NAME, "body"))
                 )
             except:
                 logger.warning("Timeout aguardando carregar página")
             
-            # Busca anúncios usando a mesma lógica do método principal
-            elements = self.driver.execute_script("""
-                const ads = [];
-                const allElements = document.querySelectorAll('*');
+            # Aguarda os anúncios
+            state = self.wait_for_ads(self.driver)
+            # Quem chama usa os anúncios com o driver ainda emprestado (próxima estratégia)
+            ads = self._submit_keyword_results(state, max_results, match_only).result()
+        except Exception as e:
+            raise SearchError(str(e)) from e
+        
+        if not ads and not state['no_results']:
+            raise SearchError(f"A página não carregou anúncios nem o aviso de nenhum resultado: {keywords}")
+        
+        self._cache_keyword_results(keywords, max_results, match_only, ads)
+        return ads
+    
+    def _keyword_flight_key(self, keywords: str, max_results: int, lean_page: bool, match_only: bool) -> Tuple:
+        return normalize_query(keywords), max_results, lean_page, match_only
+    
+    def _keyword_cache_key(self, keywords: str, max_results: int, match_only: bool) -> str:
+        fields = 'match' if match_only else 'full'
+        return search_cache.get_cache_key(normalize_query(keywords), '', namespace=f"keywords:{max_results}:{fields}")
+    
+    def _get_cached_keyword_results(self, keywords: str, max_results: int, match_only: bool) -> Optional[List[Dict]]:
+        if not search_cache:
+            return None
+        cached = search_cache.get_cached_data(self._keyword_cache_key(keywords, max_results, match_only))
+        if cached is not None:
+            logger.info(f"Resultado em cache para palavras-chave: {keywords}")
+        return cached
+    
+    def _cache_keyword_results(self, keywords: str, max_results: int, match_only: bool, ads: List[Dict]):
+        # Com o prazo esgotado o scroll pode ter parado antes: resultado parcial
+        if search_cache and is_cacheable(ads) and not self.deadline.expired():
+            search_cache.save_to_cache(self._keyword_cache_key(keywords, max_results, match_only), ads)
+    
+    def _submit_keyword_results(self, state: Dict, max_results: int, match_only: bool = False) -> Future:
+        """Faz scroll até ter anúncios suficientes e extrai os anúncios da aba atual
+        
+        No modo "html" devolve um Future resolvido pelo processo de parsing: a aba
+        (ou o driver) pode ser liberada assim que o snapshot é capturado. Nos outros
+        modos a extração acontece aqui e o Future já vem resolvido.
+        """
+        if state['ad_count'] and not state['no_results']:
+            self.scroll_page(self.driver, ScraperConfig.SCROLL_PAUSE_TIME, target_count=max_results)
+        
+        # Modo "html": parsing do snapshot em outro processo
+        if self.extraction_mode == 'html':
+            page_source = self.driver.page_source
+            future = Future()
+            submit_page_source(page_source, max_results, match_only).add_done_callback(
+                lambda parsed: self._finish_keyword_parse(parsed, future, page_source)
+            )
+            return future
+        
+        future = Future()
+        future.set_result(self._extract_keyword_results(max_results, match_only))
+        return future
+    
+    def _finish_keyword_parse(self, parsed: Future, future: Future, page_source: str):
+        """Filtra os anúncios do snapshot quando o processo de parsing termina"""
+        try:
+            extracted_ads = parsed.result()
+        except Exception as e:
+            future.set_exception(e)
+            return
+        ads_data = [ad for ad in extracted_ads if ad.get('advertiser_name') or ad.get('ad_text')]
+        if not ads_data:
+            debug_artifacts.capture_html(page_source, 'no_ads_keywords', force=True)
+        future.set_result(ads_data)
+    
+    def _extract_keyword_results(self, max_results: int, match_only: bool = False) -> List[Dict]:
+        """Extrai os anúncios da aba atual pelo WebDriver (modos "js" e "element")"""
+        # Busca anúncios usando a mesma lógica do método principal
+        elements = self.driver.execute_script(FIND_AD_CANDIDATES_SCRIPT, max_results, False)
+        
+        # Extrai dados dos anúncios encontrados
+        ads_data = []
+        for ad_data in self.extract_ads_data(elements or [], match_only):
+            if ad_data and (ad_data.get('advertiser_name') or ad_data.get('ad_text')):
+                ads_data.append(ad_data)
+        
+        if not ads_data:
+            debug_artifacts.capture(self.driver, 'no_ads_keywords', force=True)
+        
+        return ads_data
+    
+    def search_keywords_in_tabs(self, queries: List[str], max_results: int = 20, lean_page: bool = False,
+                                match_only: bool = False,
+                                report_errors: bool = False) -> Iterator[Tuple[int, Optional[List[Dict]]]]:
+        """Executa várias buscas por palavras-chave em abas do mesmo navegador
+        
+        Até ScraperConfig.TABS_PER_DRIVER abas carregam ao mesmo tempo: a navegação
+        é disparada sem bloquear e o escalonador alterna entre as abas, extraindo cada
+        uma assim que seus anúncios aparecem (no modo "html" a aba fecha assim que o
+        snapshot é capturado e o parsing segue em outro processo). Gera (índice da consulta, anúncios) na
+        ordem em que as buscas terminam (as que estão em cache saem primeiro, sem
+        abrir aba). Uma consulta que outra thread já está buscando (mesma chave de
+        search_ads_by_keywords) não abre aba: o escalonador aguarda o resultado
+        dela junto com as abas (e a refaz se aquela thread foi cancelada ou ficou
+        sem prazo antes do fim). Encerrar o gerador (break ou close()) cancela as
+        buscas restantes e fecha as abas abertas. Com ``report_errors`` as buscas
+        que falharam geram None em vez de lista vazia.
+        """
+        pending = []
+        for index, query in enumerate(queries):
+            cached = self._get_cached_keyword_results(query, max_results, match_only)
+            if cached is None:
+                pending.append((index, query))
+            else:
+                yield index, cached
+        if not pending:
+            return
+        
+        if not self.driver:
+            self.setup_driver()
+        
+        main_handle = self.driver.current_window_handle
+        active = {}  # handle -> (índice, início, chave, execução)
+        followed = []  # (índice, execução) das buscas feitas por outra thread
+        parsing = []  # (índice, chave, execução, estado, Future) de abas já fechadas, com o snapshot em parsing
+        max_tabs = max(1, ScraperConfig.TABS_PER_DRIVER)
+        
+        try:
+            while pending or active or followed or parsing:
+                if self.deadline.expired() and (pending or followed):
+                    # Prazo esgotado: as buscas que nem começaram (ou de outra thread) contam como falhas
+                    for index, query in pending:
+                        logger.warning(f"Prazo esgotado; busca não executada: {query}")
+                        yield index, None if report_errors else []
+                    for index, flight in followed:
+                        logger.warning(f"Prazo esgotado aguardando a mesma busca em andamento: {queries[index]}")
+                        yield index, None if report_errors else []
+                    pending, followed = [], []
+                    continue
                 
-                allElements.forEach(elem => {
-                    const text = elem.textContent || '';
-                    if (text.includes('Patrocinado') || text.includes('Sponsored')) {
-                        let container = elem;
-                        for (let i = 0; i < 5; i++) {
-                            container = container.parentElement;
-                            if (!container) break;
-                            
-                            const containerText = container.textContent || '';
-                            if (containerText.includes('Identificação da biblioteca') || 
-                                containerText.length > 200) {
-                                ads.push(container);
-                                break;
-                            }
-                        }
-                    }
-                });
+                # Abre novas abas até o limite e dispara a navegação sem esperar
+                while pending and len(active) < max_tabs and not self.deadline.expired():
+                    index, query = pending.pop(0)
+                    key = self._keyword_flight_key(query, max_results, lean_page, match_only)
+                    flight, leader = keyword_flights.join(key)
+                    if not leader:
+                        logger.info(f"Busca já em andamento em outra thread: {query}")
+                        followed.append((index, flight))
+                        continue
+                    try:
+                        self.driver.switch_to.new_window('tab')
+                        active[self.driver.current_window_handle] = (index, time.time(), key, flight)
+                        self._set_blocked_urls(lean_page)
+                        self.navigate(self.build_search_url(query), wait=False)
+                    except BaseException as e:
+                        if not flight.done.is_set():
+                            keyword_flights.land(key, flight, error=SearchError(f"Falha ao abrir aba: {e}"))
+                        raise
+                    logger.info(f"Aba aberta para busca {index + 1}/{len(queries)}: {query}")
                 
-                // Remove duplicatas
-                const unique = [];
-                const seen = new Set();
+                # Snapshots cujo parsing terminou
+                parsed = [entry for entry in parsing if entry[4].done()]
+                if parsed:
+                    parsing = [entry for entry in parsing if entry not in parsed]
+                    self.driver.switch_to.window(main_handle)
+                    # Conclui (e entrega a quem aguarda) todas antes do primeiro yield: quem
+                    # consome pode encerrar o gerador no primeiro resultado
+                    results = []
+                    for index, key, flight, state, future in parsed:
+                        try:
+                            ads = self._finish_tab_search(queries[index], key, flight, state, future, max_results, match_only)
+                        except Exception as e:
+                            logger.error(f"Erro na busca em aba ({queries[index]}): {e}")
+                            ads = None if report_errors else []
+                        results.append((index, ads))
+                    yield from results
+                    continue
                 
-                ads.forEach(ad => {
-                    const key = ad.textContent.substring(0, 100);
-                    if (!seen.has(key)) {
-                        seen.add(key);
-                        unique.push(ad);
-                    }
-                });
+                # Buscas de outra thread que já terminaram
+                done = [entry for entry in followed if entry[1].done.is_set()]
+                if done:
+                    followed = [entry for entry in followed if entry not in done]
+                    self.driver.switch_to.window(main_handle)
+                    for index, flight in done:
+                        if keyword_flights.should_retry(flight, self.deadline):
+                            # A outra thread desistiu antes do fim (cancelada ou sem prazo): busca aqui
+                            logger.info(f"Busca em andamento interrompida; refazendo: {queries[index]}")
+                            pending.append((index, queries[index]))
+                        elif flight.error:
+                            logger.error(f"Erro na busca em andamento ({queries[index]}): {flight.error}")
+                            yield index, None if report_errors else []
+                        else:
+                            yield index, flight.result
+                    continue
                 
-                return unique.slice(0, arguments[0]);
-            """, max_results)
-            
-            # Extrai dados dos anúncios encontrados
-            ads_data = []
-            for element in elements:
-                try:
-                    ad_data = self.extract_ad_data(element)
-                    if ad_data and (ad_data.get('advertiser_name') or ad_data.get('ad_text')):
-                        ads_data.append(ad_data)
-                except:
+                finished = None
+                for handle, (index, started_at, key, flight) in active.items():
+                    self.driver.switch_to.window(handle)
+                    try:
+                        state = self.get_page_state(self.driver)
+                    except Exception:
+                        # Página ainda trocando de documento (desiste dela após AD_WAIT_TIMEOUT
+                        # ou com o prazo esgotado, como faria com uma página sem anúncios)
+                        if time.time() - started_at > ScraperConfig.AD_WAIT_TIMEOUT or self.deadline.expired():
+                            finished = (handle, index, {'ad_count': 0, 'height': 0, 'no_results': False})
+                            break
+                        continue
+                    timed_out = time.time() - started_at > ScraperConfig.AD_WAIT_TIMEOUT or self.deadline.expired()
+                    if state['ad_count'] > 0 or state['no_results'] or timed_out:
+                        finished = (handle, index, state)
+                        break
+                
+                if not finished:
+                    if active or followed:
+                        time.sleep(0.2)
+                    else:
+                        wait_futures([entry[4] for entry in parsing], timeout=0.2, return_when=FIRST_COMPLETED)
                     continue
-            
-            return ads_data
-            
+                
+                # Captura o snapshot e fecha a aba; o parsing (modo "html") segue em outro processo
+                handle, index, state = finished
+                try:
+                    future = self._submit_keyword_results(state, max_results, match_only)
+                except Exception as e:
+                    future = Future()
+                    future.set_exception(e)
+                parsing.append((index, *active[handle][2:], state, future))
+                
+                self.driver.close()
+                del active[handle]
+                
+                # Volta para uma janela válida
+                self.driver.switch_to.window(main_handle)
+        finally:
+            # Cancela as buscas que ainda estão em andamento (quem aguarda recebe o erro)
+            for index, key, flight, state, future in parsing:
+                if not flight.done.is_set():
+                    keyword_flights.land(key, flight, error=SearchError(f"Busca cancelada: {queries[index]}"), retry=True)
+            for handle, (index, started_at, key, flight) in list(active.items()):
+                if not flight.done.is_set():
+                    keyword_flights.land(key, flight, error=SearchError(f"Busca cancelada: {queries[index]}"), retry=True)
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except Exception:
+                    pass
+            try:
+                self.driver.switch_to.window(main_handle)
+            except Exception as e:
+                logger.warning(f"Não foi possível voltar para a janela principal: {e}")
+    
+    def _finish_tab_search(self, query: str, key: Tuple, flight, state: Dict, future: Future,
+                           max_results: int, match_only: bool) -> List[Dict]:
+        """Valida e salva o resultado de uma aba e o entrega a quem aguarda a mesma busca
+        
+        Com o prazo esgotado o resultado pode ter sido cortado: quem aguarda e ainda
+        tem prazo refaz a busca.
+        """
+        expired = self.deadline.expired()
+        try:
+            ads = future.result()
+            if not ads and not state['no_results']:
+                raise SearchError("A página não carregou anúncios nem o aviso de nenhum resultado")
         except Exception as e:
-            logger.error(f"Erro na busca por palavras-chave: {e}")
-            return []
+            keyword_flights.land(key, flight, error=e if isinstance(e, SearchError) else SearchError(str(e)),
+                                 retry=expired)
+            raise
+        self._cache_keyword_results(query, max_results, match_only, ads)
+        keyword_flights.land(key, flight, ads, retry=expired)
+        return ads
+    
+    def search_many_keywords(self, queries: List[str], max_results: int = 20,
+                             lean_page: bool = False) -> List[List[Dict]]:
+        """Executa várias buscas em abas e devolve os anúncios na ordem das consultas"""
+        results = [[] for _ in queries]
+        for index, ads in self.search_keywords_in_tabs(queries, max_results, lean_page):
+            results[index] = ads
+        return results
     
     def is_matching_establishment(self, ad: Dict, establishment_info: Dict) -> bool:
-        """Verifica se um anúncio corresponde ao estabelecimento procurado"""
+        """Verifica se um anúncio corresponde ao estabelecimento procurado
+        
+        Para vários anúncios use AdMatcher, que avalia todos de uma vez e devolve
+        a correspondência junto com a confiança.
+        """
         try:
-            ad_text = (ad.get('ad_text', '') + ' ' + ad.get('advertiser_name', '')).lower()
-            
-            # Verifica correspondência por nome
-            if establishment_info.get('name'):
-                name_lower = establishment_info['name'].lower()
-                # Verifica correspondência exata ou parcial
-                if name_lower in ad_text or any(word in ad_text for word in name_lower.split() if len(word) > 3):
-                    return True
-            
-            # Verifica correspondência por localização
-            location_matches = 0
-            if establishment_info.get('city'):
-                if establishment_info['city'].lower() in ad_text:
-                    location_matches += 1
-            
-            if establishment_info.get('neighborhood'):
-                if establishment_info['neighborhood'].lower() in ad_text:
-                    location_matches += 1
-            
-            # Se tem correspondência de localização e categoria
-            if location_matches > 0 and establishment_info.get('category'):
-                if establishment_info['category'].lower() in ad_text:
-                    return True
-            
-            return False
-            
+            return AdMatcher([establishment_info]).match([ad])[0][0]
         except Exception as e:
             logger.error(f"Erro ao verificar correspondência: {e}")
             return False
@@ -1008,34 +1540,7 @@ class FacebookAdsLibraryScraper:
     def calculate_match_confidence(self, ad: Dict, establishment_info: Dict) -> float:
         """Calcula a confiança da correspondência entre anúncio e estabelecimento"""
         try:
-            confidence = 0.0
-            ad_text = (ad.get('ad_text', '') + ' ' + ad.get('advertiser_name', '')).lower()
-            
-            # Correspondência de nome (peso alto)
-            if establishment_info.get('name'):
-                name_lower = establishment_info['name'].lower()
-                if name_lower in ad_text:
-                    confidence += 0.6
-                elif any(word in ad_text for word in name_lower.split() if len(word) > 3):
-                    confidence += 0.3
-            
-            # Correspondência de cidade (peso médio)
-            if establishment_info.get('city'):
-                if establishment_info['city'].lower() in ad_text:
-                    confidence += 0.2
-            
-            # Correspondência de bairro (peso médio)
-            if establishment_info.get('neighborhood'):
-                if establishment_info['neighborhood'].lower() in ad_text:
-                    confidence += 0.15
-            
-            # Correspondência de categoria (peso baixo)
-            if establishment_info.get('category'):
-                if establishment_info['category'].lower() in ad_text:
-                    confidence += 0.05
-            
-            return min(confidence, 1.0)  # Máximo 1.0
-            
+            return AdMatcher([establishment_info]).match([ad])[0][1]
         except Exception as e:
             logger.error(f"Erro ao calcular confiança: {e}")
             return 0.0
@@ -1044,8 +1549,222 @@ class FacebookAdsLibraryScraper:
 app = Flask(__name__)
 CORS(app)
 
-# Instância global do scraper
-scraper = FacebookAdsLibraryScraper(headless=True)
+# Pool global de drivers (um scraper isolado por slot)
+driver_pool = DriverPool(
+    factory=lambda: FacebookAdsLibraryScraper(headless=True),
+    size=ScraperConfig.MAX_CONCURRENT_SEARCHES,
+    wait_timeout=ScraperConfig.DRIVER_POOL_WAIT_TIMEOUT,
+    warm_up=ScraperConfig.WARMUP_ON_START,
+    recycle_after_navigations=ScraperConfig.RECYCLE_AFTER_NAVIGATIONS,
+    recycle_max_rss_mb=ScraperConfig.RECYCLE_MAX_RSS_MB
+)
+
+# Fila limitada de requisições HTTP à espera de um driver (acima dela: 429)
+admission = AdmissionController(
+    driver_pool,
+    max_queue=driver_pool.size * ScraperConfig.ADMISSION_QUEUE_PER_DRIVER
+)
+
+@contextmanager
+def acquire_driver(deadline: Optional[Deadline] = None):
+    """Empresta um scraper do pool, com o prazo da requisição aplicado
+    
+    Requisições HTTP passam pelo controle de admissão; jobs e lotes (fora do
+    contexto de requisição) já são limitados pelo número de drivers e esperam
+    normalmente. Verificações de estabelecimento e buscas por localização
+    respondidas pelo cache não chegam aqui, então nunca são recusadas. A espera por um driver também
+    respeita o prazo.
+    """
+    deadline = deadline or Deadline(None)
+    deadline.check('obter um driver')
+    with ExitStack() as stack:
+        if has_request_context():
+            stack.enter_context(admission.admit())
+        try:
+            scraper = stack.enter_context(driver_pool.acquire(deadline.clamp(driver_pool.wait_timeout)))
+        except PoolTimeoutError as e:
+            if deadline.expired():
+                raise DeadlineExceeded(f"Prazo de {deadline.seconds:g}s esgotado esperando um driver") from e
+            raise
+        with scraper.use_deadline(deadline):
+            yield scraper
+
+def run_with_scraper(fn, deadline: Optional[Deadline] = None):
+    """Executa ``fn`` com um scraper emprestado do pool"""
+    with acquire_driver(deadline) as scraper:
+        return fn(scraper)
+
+def request_deadline(default_seconds: float) -> Deadline:
+    """Prazo da requisição: "deadline_seconds" no payload, cabeçalho X-Request-Timeout ou o padrão do endpoint
+    
+    O prazo conta a partir da chegada da requisição (inclui a espera por um
+    driver) e é limitado a DEADLINE_MAX_SECONDS.
+    """
+    data = request.get_json(silent=True)
+    value = data.get('deadline_seconds') if isinstance(data, dict) else None
+    if value is None:
+        value = request.headers.get('X-Request-Timeout')
+    return make_deadline(value, default_seconds)
+
+def make_deadline(value, default_seconds: float) -> Deadline:
+    """Deadline a partir de um valor informado pelo cliente (inválido ou ausente: o padrão)"""
+    try:
+        seconds = float(value) if value is not None else default_seconds
+    except (TypeError, ValueError):
+        logger.warning(f"Prazo inválido ignorado: {value!r}")
+        seconds = default_seconds
+    if seconds <= 0:
+        seconds = default_seconds
+    return Deadline(min(seconds, ScraperConfig.DEADLINE_MAX_SECONDS))
+
+def timeout_response(error: DeadlineExceeded, **fields):
+    """Resposta 504 para quando o prazo da requisição termina sem resultado"""
+    return jsonify({**fields, 'error': str(error), 'timed_out': True}), 504
+
+def saturated_response(error: PoolSaturatedError, **fields):
+    """Resposta 429 com Retry-After para quando a fila de drivers está cheia"""
+    response = jsonify({**fields, 'error': str(error), 'retry_after': error.retry_after})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+def cached_establishment_check(kind: str, maps_address: str, check: Callable, found: Callable, conclusive: Callable,
+                               deadline: Optional[Deadline] = None):
+    """Verificação de estabelecimento com cache por endereço
+    
+    Resultados com anúncios usam o TTL padrão e os sem anúncios o TTL negativo,
+    mais curto. Resultados inconclusivos (erros) nunca vão para o cache. Com o
+    cache no Redis, o mesmo endereço não é verificado ao mesmo tempo por dois
+    containers: a espera pelo outro ocorre antes de obter um driver.
+    """
+    if not search_cache:
+        return run_with_scraper(check, deadline)
+    
+    cache_key = search_cache.get_cache_key(normalize_query(maps_address), '', namespace=f"establishment:{kind}")
+    cached = search_cache.get_cached_data(cache_key)
+    if cached is not None:
+        return cached
+    
+    def run_check():
+        result = run_with_scraper(check, deadline)
+        # Salva antes de liberar o lock, para quem espera encontrar o resultado
+        if conclusive(result):
+            ttl = None if found(result) else ScraperConfig.CACHE_NEGATIVE_TTL_HOURS * 3600
+            search_cache.save_to_cache(cache_key, result, ttl_seconds=ttl)
+        return result
+    
+    return search_cache.coordinate(cache_key, run_check, deadline=deadline)
+
+def run_analyze_competition(location: str, business_type: str, deadline: Optional[Deadline] = None) -> Dict:
+    with acquire_driver(deadline) as scraper:
+        analysis = scraper.analyze_competition(location, business_type)
+        # Prazo esgotado durante a busca: análise feita com os anúncios já carregados
+        analysis['timed_out'] = scraper.deadline.expired()
+    return analysis
+
+def run_search_ads(location: str, business_type: str, max_results: int = 50, lean_page: bool = False,
+                   deadline: Optional[Deadline] = None) -> Dict:
+    # Resultado em cache: responde sem passar pelo controle de admissão nem esperar um driver
+    cached = search_cache.get_cached_data(location_cache_key(location, business_type, max_results)) if search_cache else None
+    if cached is not None:
+        logger.info(f"Resultado em cache para {business_type} em {location}")
+        ads, timed_out = cached, False
+    else:
+        with acquire_driver(deadline) as scraper:
+            pending_ads = scraper.submit_search_ads_by_location_and_type(location, business_type, max_results, lean_page)
+            timed_out = scraper.deadline.expired()
+        # O driver já voltou ao pool; o parsing do snapshot pode continuar em outro processo,
+        # mas só até o prazo (se terminar depois, o resultado ainda vai para o cache)
+        deadline = deadline or Deadline(None)
+        try:
+            ads = pending_ads.result(timeout=deadline.remaining() if deadline.bounded else None)
+        except FutureTimeoutError:
+            raise DeadlineExceeded(f"Prazo de {deadline.seconds:g}s esgotado no processamento da página") from None
+    return {
+        'ads': ads,
+        'total_found': len(ads),
+        'location': location,
+        'business_type': business_type,
+        # Prazo esgotado: lista parcial, com os anúncios carregados até então
+        'timed_out': timed_out
+    }
+
+def run_check_advertiser(advertiser_name: str, deadline: Optional[Deadline] = None) -> Dict:
+    with acquire_driver(deadline) as scraper:
+        advertiser_info = scraper.get_advertiser_info(advertiser_name)
+        advertiser_info['timed_out'] = scraper.deadline.expired()
+    return advertiser_info
+
+def run_check_establishment(maps_address: str, lean_page: bool = True, deadline: Optional[Deadline] = None) -> Dict:
+    # Uma correspondência vale mesmo com o prazo esgotado; "sem anúncios" só se nada faltou
+    conclusive = lambda result: 'error' not in result and (
+        result.get('has_ads') or not (result.get('failed_searches') or result.get('timed_out'))
+    )
+    # Chamadas agrupadas pelo SingleFlight aguardam, no máximo, até o próprio prazo
+    return establishment_flights.do(
+        ('check', normalize_query(maps_address), lean_page),
+        lambda: cached_establishment_check(
+            'check', maps_address,
+            check=lambda scraper: scraper.check_establishment_by_address(maps_address, lean_page=lean_page),
+            found=lambda result: result.get('has_ads'),
+            conclusive=conclusive,
+            deadline=deadline
+        ),
+        deadline=deadline,
+        conclusive=conclusive
+    )
+
+def run_has_ads(maps_address: str, lean_page: bool = True, deadline: Optional[Deadline] = None) -> bool:
+    deadline = deadline or Deadline(None)
+    # "Sem anúncios" obtido com o prazo esgotado pode vir de buscas cortadas no meio
+    conclusive = lambda result: result or not deadline.expired()
+    return establishment_flights.do(
+        ('has_ads', normalize_query(maps_address), lean_page),
+        lambda: cached_establishment_check(
+            'has_ads', maps_address,
+            check=lambda scraper: scraper.has_ads_by_address(maps_address, lean_page=lean_page, raise_errors=True),
+            found=bool,
+            conclusive=conclusive,
+            deadline=deadline
+        ),
+        deadline=deadline,
+        conclusive=conclusive
+    )
+
+# Jobs assíncronos: tipo -> (campos obrigatórios, função que executa o payload)
+def job_deadline(payload: Dict) -> Deadline:
+    """Prazo de um job, contado a partir do início da execução"""
+    return make_deadline(payload.get('deadline_seconds'), ScraperConfig.DEADLINE_JOB_SECONDS)
+
+JOB_TYPES = {
+    'check_establishment': (
+        ('maps_address',),
+        lambda payload: run_check_establishment(payload['maps_address'], payload.get('lean_page', True),
+                                                job_deadline(payload))
+    ),
+    'has_ads': (
+        ('maps_address',),
+        lambda payload: {'has_ads': run_has_ads(payload['maps_address'], payload.get('lean_page', True),
+                                                job_deadline(payload))}
+    ),
+    'search_ads': (
+        ('location', 'business_type'),
+        lambda payload: run_search_ads(payload['location'], payload['business_type'],
+                                       payload.get('max_results', 50), payload.get('lean_page', False),
+                                       job_deadline(payload))
+    ),
+    'analyze_competition': (
+        ('location', 'business_type'),
+        lambda payload: run_analyze_competition(payload['location'], payload['business_type'], job_deadline(payload))
+    )
+}
+
+job_runner = JobRunner(
+    JobStore(ScraperConfig.JOBS_DB_PATH),
+    handlers={job_type: handler for job_type, (_, handler) in JOB_TYPES.items()},
+    workers=ScraperConfig.JOB_WORKERS or driver_pool.size,
+    retry_on=(PoolTimeoutError,),
+    max_attempts=ScraperConfig.JOB_MAX_ATTEMPTS
+)
 
 @app.route('/')
 def index():
@@ -1090,6 +1809,11 @@ def index():
             </div>
         </div>
         
+        <div class="endpoint">
+            <h3><span class="method get">GET</span> /api/ready</h3>
+            <p>Prontidão para balanceadores de carga: 200 com a profundidade da fila e a espera estimada, ou 503 com <code>Retry-After</code> quando a fila de drivers está cheia</p>
+        </div>
+        
         <div class="endpoint">
             <h3><span class="method post">POST</span> /api/analyze-competition</h3>
             <p>Analisa a concorrência para um nicho específico</p>
@@ -1128,6 +1852,33 @@ def index():
             </div>
         </div>
         
+        <div class="endpoint">
+            <h3><span class="method post">POST</span> /api/has-ads/batch</h3>
+            <p>Verifica uma lista de endereços (array JSON ou arquivo em <code>file</code>) e devolve uma linha NDJSON por endereço conforme terminam</p>
+            <div class="example">
+                <strong>Payload:</strong>
+                <pre>["Av. Paulista, 1578 - Bela Vista, São Paulo - SP", "Balada Mix - R. Barata Ribeiro, 111 - Copacabana, Rio de Janeiro - RJ"]</pre>
+                <strong>Resposta (uma linha por endereço):</strong>
+                <pre>{"maps_address": "Av. Paulista, 1578 - Bela Vista, São Paulo - SP", "inputs": [0], "has_ads": true}</pre>
+            </div>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method post">POST</span> /api/jobs</h3>
+            <p>Enfileira uma operação longa e retorna o ID do job na hora (tipos: check_establishment, has_ads, search_ads, analyze_competition)</p>
+            <div class="example">
+                <strong>Payload:</strong>
+                <pre>{"type": "check_establishment", "maps_address": "Balada Mix - R. Barata Ribeiro, 111 - Copacabana, Rio de Janeiro - RJ"}</pre>
+                <strong>Resposta (202):</strong>
+                <pre>{"job_id": "3f2a...", "status": "queued", "status_url": "/api/jobs/3f2a..."}</pre>
+            </div>
+        </div>
+        
+        <div class="endpoint">
+            <h3><span class="method get">GET</span> /api/jobs/&lt;id&gt;</h3>
+            <p>Status do job (queued, running, done, failed) e o resultado quando concluído</p>
+        </div>
+        
         <div class="endpoint">
             <h3><span class="method post">POST</span> /api/search-ads</h3>
             <p>Busca anúncios baseados em critérios específicos</p>
@@ -1169,9 +1920,17 @@ def analyze_competition():
                 'error': 'Localização e tipo de negócio são obrigatórios'
             }), 400
         
-        analysis = scraper.analyze_competition(location, business_type)
-        return jsonify(analysis)
+        deadline = request_deadline(ScraperConfig.DEADLINE_ANALYZE_COMPETITION_SECONDS)
+        return jsonify(run_analyze_competition(location, business_type, deadline))
         
+    except DeadlineExceeded as e:
+        return timeout_response(e)
+    except PoolSaturatedError as e:
+        return saturated_response(e)
+    except PoolTimeoutError as e:
+        return jsonify({
+            'error': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'error': str(e)
@@ -1189,9 +1948,17 @@ def check_advertiser():
                 'error': 'Nome do anunciante é obrigatório'
             }), 400
         
-        advertiser_info = scraper.get_advertiser_info(advertiser_name)
-        return jsonify(advertiser_info)
+        deadline = request_deadline(ScraperConfig.DEADLINE_CHECK_ADVERTISER_SECONDS)
+        return jsonify(run_check_advertiser(advertiser_name, deadline))
         
+    except DeadlineExceeded as e:
+        return timeout_response(e)
+    except PoolSaturatedError as e:
+        return saturated_response(e)
+    except PoolTimeoutError as e:
+        return jsonify({
+            'error': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'error': str(e)
@@ -1205,21 +1972,24 @@ def search_ads():
         location = data.get('location', '')
         business_type = data.get('business_type', '')
         max_results = data.get('max_results', 50)
+        lean_page = data.get('lean_page', False)
         
         if not location or not business_type:
             return jsonify({
                 'error': 'Localização e tipo de negócio são obrigatórios'
             }), 400
         
-        ads = scraper.search_ads_by_location_and_type(location, business_type, max_results)
+        deadline = request_deadline(ScraperConfig.DEADLINE_SEARCH_ADS_SECONDS)
+        return jsonify(run_search_ads(location, business_type, max_results, lean_page, deadline))
         
+    except DeadlineExceeded as e:
+        return timeout_response(e)
+    except PoolSaturatedError as e:
+        return saturated_response(e)
+    except PoolTimeoutError as e:
         return jsonify({
-            'ads': ads,
-            'total_found': len(ads),
-            'location': location,
-            'business_type': business_type
-        })
-        
+            'error': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'error': str(e)
@@ -1237,9 +2007,17 @@ def check_establishment():
                 'error': 'Endereço do Google Maps é obrigatório'
             }), 400
         
-        result = scraper.check_establishment_by_address(maps_address)
-        return jsonify(result)
+        deadline = request_deadline(ScraperConfig.DEADLINE_CHECK_ESTABLISHMENT_SECONDS)
+        return jsonify(run_check_establishment(maps_address, data.get('lean_page', True), deadline))
         
+    except DeadlineExceeded as e:
+        return timeout_response(e)
+    except PoolSaturatedError as e:
+        return saturated_response(e)
+    except PoolTimeoutError as e:
+        return jsonify({
+            'error': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'error': str(e)
@@ -1258,28 +2036,231 @@ def has_ads():
                 'error': 'Endereço do Google Maps é obrigatório'
             }), 400
         
-        result = scraper.check_establishment_by_address(maps_address)
-        
+        deadline = request_deadline(ScraperConfig.DEADLINE_HAS_ADS_SECONDS)
         return jsonify({
-            'has_ads': result.get('has_ads', False)
+            'has_ads': run_has_ads(maps_address, data.get('lean_page', True), deadline)
         })
         
+    except DeadlineExceeded as e:
+        return timeout_response(e, has_ads=False)
+    except PoolSaturatedError as e:
+        return saturated_response(e, has_ads=False)
+    except PoolTimeoutError as e:
+        return jsonify({
+            'has_ads': False,
+            'error': str(e)
+        }), 503
     except Exception as e:
         return jsonify({
             'has_ads': False,
             'error': str(e)
         }), 500
 
+def read_batch_addresses() -> List[str]:
+    """Endereços do lote: array JSON, {"maps_addresses": [...]} ou arquivo enviado
+    
+    O arquivo pode ser JSON (array), CSV com a coluna ``maps_address`` ou texto com
+    um endereço por linha.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        content = upload.read().decode('utf-8-sig')
+        stripped = content.lstrip()
+        if stripped.startswith('['):
+            addresses = json.loads(stripped)
+        else:
+            lines = content.splitlines()
+            if lines and 'maps_address' in next(csv.reader([lines[0]])):
+                addresses = [row.get('maps_address', '') for row in csv.DictReader(io.StringIO(content))]
+            else:
+                addresses = lines
+    else:
+        data = request.get_json(silent=True)
+        addresses = data.get('maps_addresses', []) if isinstance(data, dict) else data
+    
+    if not isinstance(addresses, list):
+        raise ValueError('Envie um array de endereços, {"maps_addresses": [...]} ou um arquivo')
+    return [str(address).strip() for address in addresses if address and str(address).strip()]
+
+@app.route('/api/has-ads/batch', methods=['POST'])
+def has_ads_batch():
+    """Verifica uma lista de endereços e devolve uma linha NDJSON por endereço
+    
+    Endereços repetidos (mesma forma normalizada) são verificados uma vez e a
+    linha traz as posições de entrada em ``inputs``. As verificações rodam em
+    paralelo, uma por driver do pool, e cada linha é enviada assim que termina.
+    Erros em um endereço viram uma linha com ``error`` sem interromper o lote.
+    """
+    try:
+        addresses = read_batch_addresses()
+    except Exception as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    
+    if not addresses:
+        return jsonify({
+            'error': 'Nenhum endereço do Google Maps informado'
+        }), 400
+    if len(addresses) > ScraperConfig.BATCH_MAX_ADDRESSES:
+        return jsonify({
+            'error': f"Lote com {len(addresses)} endereços; o máximo é {ScraperConfig.BATCH_MAX_ADDRESSES}"
+        }), 413
+    
+    lean_page = request.args.get('lean_page', 'true').lower() != 'false'
+    
+    # Deduplicação preservando a ordem da primeira ocorrência
+    unique: Dict[str, Dict] = {}
+    for position, address in enumerate(addresses):
+        key = normalize_query(address)
+        entry = unique.setdefault(key, {'maps_address': address, 'inputs': []})
+        entry['inputs'].append(position)
+    
+    def check(maps_address: str) -> bool:
+        # Cada endereço tem o seu prazo, contado a partir do início da verificação
+        return run_has_ads(maps_address, lean_page, Deadline(ScraperConfig.DEADLINE_HAS_ADS_SECONDS))
+    
+    def generate():
+        executor = ThreadPoolExecutor(max_workers=driver_pool.size, thread_name_prefix="batch")
+        futures = {
+            executor.submit(check, entry['maps_address']): entry
+            for entry in unique.values()
+        }
+        failed = 0
+        start_time = time.time()
+        try:
+            for future in as_completed(futures):
+                entry = futures[future]
+                try:
+                    line = {**entry, 'has_ads': future.result()}
+                except DeadlineExceeded as e:
+                    failed += 1
+                    line = {**entry, 'has_ads': None, 'error': str(e), 'timed_out': True}
+                except Exception as e:
+                    failed += 1
+                    line = {**entry, 'has_ads': None, 'error': str(e)}
+                yield json.dumps(line, ensure_ascii=False) + '\n'
+            
+            yield json.dumps({'summary': {
+                'total': len(addresses),
+                'unique': len(unique),
+                'failed': failed,
+                'elapsed_seconds': round(time.time() - start_time, 2)
+            }}) + '\n'
+        finally:
+            # Cliente desconectado: descarta os endereços que ainda não começaram
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """Enfileira uma verificação, busca ou análise e retorna o ID do job imediatamente"""
+    data = request.get_json(silent=True) or {}
+    job_type = data.get('type', '')
+    
+    if job_type not in JOB_TYPES:
+        return jsonify({
+            'error': f"Tipo de job inválido. Use um de: {', '.join(JOB_TYPES)}"
+        }), 400
+    
+    required, _ = JOB_TYPES[job_type]
+    missing = [name for name in required if not data.get(name)]
+    if missing:
+        return jsonify({
+            'error': f"Campos obrigatórios ausentes: {', '.join(missing)}"
+        }), 400
+    
+    payload = {key: value for key, value in data.items() if key != 'type'}
+    try:
+        job_id = job_runner.submit(job_type, payload)
+    except Exception as e:
+        return jsonify({
+            'error': str(e)
+        }), 500
+    
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f"/api/jobs/{job_id}"
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status e resultado de um job"""
+    job = job_runner.store.get(job_id)
+    if not job:
+        return jsonify({
+            'error': 'Job não encontrado'
+        }), 404
+    return jsonify(job)
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """Prontidão para balanceadores: 503 com Retry-After quando a fila de drivers está cheia"""
+    stats = admission.stats()
+    if stats['saturated']:
+        retry_after = admission.retry_after()
+        response = jsonify({'status': 'saturated', 'retry_after': retry_after, **stats})
+        response.headers['Retry-After'] = str(retry_after)
+        return response, 503
+    return jsonify({'status': 'ready', **stats})
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Verifica se o serviço está funcionando"""
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'driver_pool': driver_pool.stats(),
+        'admission': admission.stats(),
+        'debug_artifacts': debug_artifacts.stats(),
+        'cache': search_cache.stats() if search_cache else None,
+        'jobs': job_runner.store.stats(),
+        'single_flight': {
+            'keywords': keyword_flights.stats(),
+            'establishments': establishment_flights.stats()
+        }
     })
 
+def start_services(resume_jobs: bool = True):
+    """Inicia os drivers, a limpeza do cache e os workers de jobs do processo
+    
+    No servidor com vários processos (gunicorn.conf.py) é chamado em cada worker
+    depois do fork, com ``resume_jobs=False``: a retomada dos jobs interrompidos
+    roda uma única vez no processo principal (``resume_interrupted_jobs``).
+    """
+    driver_pool.start()
+    if search_cache:
+        search_cache.start_sweeper()
+    if resume_jobs:
+        resume_interrupted_jobs()
+    job_runner.start(resume=False)
+
+def resume_interrupted_jobs():
+    """Retoma os jobs interrompidos e descarta os concluídos há muito tempo"""
+    job_runner.store.purge_finished(ScraperConfig.JOB_RETENTION_DAYS)
+    job_runner.resume_unfinished()
+
+def stop_services(timeout: float = ScraperConfig.SHUTDOWN_TIMEOUT):
+    """Encerra os jobs em andamento, a limpeza do cache, os Chromes e os processos de parsing
+    
+    As esperas pelos jobs e pelas buscas em andamento dividem um único prazo de
+    ``timeout`` segundos, para o processo terminar dentro do graceful_timeout do gunicorn.
+    """
+    deadline = Deadline(timeout)
+    job_runner.stop(timeout=deadline.remaining())
+    if search_cache:
+        search_cache.stop_sweeper()
+    driver_pool.close(timeout=deadline.remaining())
+    shutdown_parse_executor()
+
 if __name__ == '__main__':
+    # Servidor de desenvolvimento; em produção use: gunicorn -c gunicorn.conf.py facebook_ads_scraper:app
     try:
-        app.run(host='0.0.0.0', port=5000, debug=True)
+        # Inicia os drivers antes de aceitar requisições
+        start_services()
+        # O reloader criaria um segundo processo com outro pool de Chromes
+        app.run(host='0.0.0.0', port=5000, debug=True, threaded=True, use_reloader=False)
     finally:
-        scraper.close()
+        stop_services()
@@ -57,7 +57,10 @@ def main():
         'requests==2.31.0',
         'flask==2.3.3',
         'flask-cors==4.0.0',
-        'webdriver-manager==4.0.1'
+        'webdriver-manager==4.0.1',
+        'psutil==5.9.6',
+        'redis==5.0.1',
+        'gunicorn==21.2.0'
     ]
     
     for dep in dependencies:
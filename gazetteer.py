@@ -0,0 +1,254 @@
+import re
+import json
+import logging
+import threading
+import unicodedata
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from config import ScraperConfig
+
+logger = logging.getLogger(__name__)
+
+UF_PATTERN = re.compile(r'(?<![A-Za-zÀ-ÿ])([A-Z]{2})(?![A-Za-zÀ-ÿ])')
+SEGMENT_SEPARATORS = re.compile(r'\s+-\s+|,|\n')
+STREET_PREFIXES = ('r.', 'rua', 'av.', 'av', 'avenida', 'al.', 'alameda', 'tv.', 'travessa',
+                   'rod.', 'rodovia', 'estr.', 'estrada', 'pç.', 'praça', 'praca', 'largo', 'via')
+
+# Palavras-chave de categoria (a primeira categoria encontrada nesta ordem vence)
+CATEGORY_KEYWORDS = {
+    'restaurante': ['restaurante', 'bar', 'lanchonete', 'pizzaria', 'hamburgueria'],
+    'academia': ['academia', 'fitness', 'crossfit', 'pilates'],
+    'salão': ['salão', 'barbershop', 'barbearia', 'cabeleireiro'],
+    'loja': ['loja', 'store', 'boutique', 'magazine'],
+    'hotel': ['hotel', 'pousada', 'hostel'],
+    'clínica': ['clínica', 'consultório', 'médico', 'dentista']
+}
+
+
+_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Quebra o texto em palavras sem acentos e em minúsculas"""
+    # NFKD separa os acentos das letras e a conversão para ASCII os descarta (em C)
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii')
+    return _WORD_PATTERN.findall(text.lower())
+
+
+class TokenMatcher:
+    """Autômato de Aho-Corasick sobre palavras
+
+    Encontra todas as ocorrências de milhares de nomes em uma única passada pelo
+    texto. Trabalhar com palavras (e não caracteres) garante que "bar" não seja
+    encontrado dentro de "barra".
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, Hashable]]] = [[]]  # (nº de palavras, valor)
+        self._built = False
+
+    def add(self, tokens: List[str], value: Hashable):
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(tokens), value))
+        self._built = False
+
+    def build(self):
+        """Calcula os links de falha (busca em largura)"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        position = 0
+        while position < len(queue):
+            state = queue[position]
+            position += 1
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+        self._built = True
+
+    def find(self, tokens: List[str]) -> List[Tuple[int, int, Hashable]]:
+        """Todas as ocorrências como (início, fim exclusivo, valor)"""
+        if not self._built:
+            self.build()
+        matches = []
+        state = 0
+        for position, token in enumerate(tokens):
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for length, value in self._output[state]:
+                matches.append((position + 1 - length, position + 1, value))
+        return matches
+
+
+class Gazetteer:
+    """Municípios, estados e bairros do Brasil para interpretar endereços do Google Maps"""
+
+    def __init__(self, data: Dict):
+        self.states = {uf: name for uf, name in data.get('states', [])}
+        self.municipalities = [tuple(row) for row in data.get('municipalities', [])]
+        self.neighborhoods = [tuple(row) for row in data.get('neighborhoods', [])]
+
+        self.matcher = TokenMatcher()
+        for uf, name in self.states.items():
+            self.matcher.add(normalize_tokens(name), ('state', uf))
+        for index, (name, uf, _, _) in enumerate(self.municipalities):
+            self.matcher.add(normalize_tokens(name), ('city', index))
+        for index, (name, _, _) in enumerate(self.neighborhoods):
+            self.matcher.add(normalize_tokens(name), ('neighborhood', index))
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            for keyword in keywords:
+                self.matcher.add(normalize_tokens(keyword), ('category', category))
+        self.matcher.build()
+
+    def parse(self, address: str) -> Dict:
+        """Extrai cidade, UF, bairro e categoria do endereço em uma passada
+
+        O endereço é dividido em trechos (" - " e vírgulas) e as ocorrências não
+        atravessam trechos. No formato do Google Maps ("Nome - Rua, 1 - Bairro,
+        Cidade - UF, CEP") o primeiro trecho é o nome do estabelecimento e não é
+        usado para cidade e bairro.
+        """
+        segments = [segment.strip() for segment in SEGMENT_SEPARATORS.split(address or '')]
+        segment_tokens = [normalize_tokens(segment) for segment in segments]
+        name_segment = 0 if ' - ' in (address or '') and len(segments) > 1 else None
+
+        tokens = []
+        token_segment = []
+        for index, words in enumerate(segment_tokens):
+            tokens.extend(words)
+            token_segment.extend([index] * len(words))
+            # Separador que nenhum nome contém: ocorrências não atravessam trechos
+            tokens.append('|')
+            token_segment.append(index)
+
+        matches = []
+        for start, end, (kind, value) in self.matcher.find(tokens):
+            segment = token_segment[start]
+            matches.append({
+                'kind': kind, 'value': value, 'segment': segment, 'start': start, 'end': end,
+                'whole': end - start == len(segment_tokens[segment])
+            })
+
+        state, state_segment = self._find_state(address, segments, matches)
+        city = self._pick_city(matches, state, state_segment, name_segment)
+        city_name, city_uf = (self.municipalities[city['value']][:2] if city else ('', ''))
+        neighborhood = self._pick_neighborhood(matches, city, city_name, city_uf, name_segment, segments)
+
+        if not city and neighborhood and neighborhood.get('city'):
+            city_name, city_uf = neighborhood['city']
+
+        category = ''
+        found_categories = {match['value'] for match in matches if match['kind'] == 'category'}
+        for candidate in CATEGORY_KEYWORDS:
+            if candidate in found_categories:
+                category = candidate
+                break
+
+        return {
+            'city': city_name,
+            'state': state or city_uf,
+            'neighborhood': neighborhood['name'] if neighborhood else '',
+            'category': category
+        }
+
+    def _find_state(self, address: str, segments: List[str], matches: List[Dict]) -> Tuple[str, Optional[int]]:
+        """UF em maiúsculas (a última do endereço) ou nome do estado no último trecho"""
+        for index in range(len(segments) - 1, -1, -1):
+            found = [uf for uf in UF_PATTERN.findall(segments[index]) if uf in self.states]
+            if found:
+                return found[-1], index
+
+        last_text_segment = max((i for i, segment in enumerate(segments) if re.search(r'[A-Za-zÀ-ÿ]', segment)),
+                                default=None)
+        for match in matches:
+            if match['kind'] == 'state' and match['whole'] and match['segment'] == last_text_segment:
+                return match['value'], match['segment']
+        return '', None
+
+    def _pick_city(self, matches: List[Dict], state: str, state_segment: Optional[int],
+                   name_segment: Optional[int]) -> Optional[Dict]:
+        best, best_score = None, None
+        for match in matches:
+            if match['kind'] != 'city' or match['segment'] == name_segment:
+                continue
+            _, uf, _, population = self.municipalities[match['value']]
+            if state and uf != state:
+                continue
+            # Sem UF, nomes de uma palavra só valem como trecho inteiro ("Lapa", "Luz")
+            if not state and not match['whole'] and match['end'] - match['start'] < 2:
+                continue
+            right_before_state = state_segment is not None and match['segment'] in (state_segment, state_segment - 1)
+            score = (right_before_state, match['whole'], match['segment'], match['end'] - match['start'], population)
+            if best_score is None or score > best_score:
+                best, best_score = match, score
+        return best
+
+    def _pick_neighborhood(self, matches: List[Dict], city: Optional[Dict], city_name: str, city_uf: str,
+                           name_segment: Optional[int], segments: List[str]) -> Optional[Dict]:
+        best, best_score = None, None
+        for match in matches:
+            if match['kind'] != 'neighborhood' or match['segment'] == name_segment:
+                continue
+            if city and city['start'] <= match['start'] < city['end']:
+                continue
+            name, neighborhood_city, neighborhood_uf = self.neighborhoods[match['value']]
+            same_city = (neighborhood_city, neighborhood_uf) == (city_name, city_uf)
+            if city and not same_city and not match['whole']:
+                continue
+            score = (same_city, match['whole'], match['segment'])
+            if best_score is None or score > best_score:
+                best_score = score
+                best = {'name': name, 'city': (neighborhood_city, neighborhood_uf)}
+        if best:
+            return best
+
+        # Formato do Google Maps: o trecho antes da cidade é o bairro
+        if city and city['whole'] and city['segment'] - 1 not in (None, name_segment, -1):
+            candidate = segments[city['segment'] - 1]
+            if candidate and not re.search(r'\d', candidate) and \
+                    not candidate.lower().startswith(STREET_PREFIXES):
+                return {'name': candidate, 'city': None}
+        return None
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Gazetteer do processo, carregado uma única vez
+
+    Chamado na importação do app, antes de o servidor criar os workers, para que
+    os processos filhos compartilhem a mesma estrutura (copy-on-write).
+    """
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                try:
+                    with open(ScraperConfig.GAZETTEER_FILE, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Gazetteer indisponível ({ScraperConfig.GAZETTEER_FILE}): {e}")
+                    data = {}
+                _gazetteer = Gazetteer(data)
+    return _gazetteer
@@ -0,0 +1,69 @@
+"""
+Configuração do gunicorn para produção
+
+    gunicorn -c gunicorn.conf.py facebook_ads_scraper:app
+
+O app é carregado uma vez no processo principal (preload_app), o que inclui o
+gazetteer e os módulos pesados; os workers são criados por fork antes de abrir
+qualquer Chrome e cada um inicia o seu próprio pool de drivers em
+``post_worker_init`` (depois de o worker instalar os seus sinais; com os sinais
+herdados do processo principal, o fim dos processos do Chrome seria tratado
+como o fim de um worker).
+Ao encerrar (SIGTERM/SIGINT), cada worker termina os jobs em andamento e fecha
+os seus Chromes em ``worker_exit``.
+"""
+
+import gc
+
+from config import ScraperConfig
+
+bind = ScraperConfig.WEB_BIND
+# Cada worker abre MAX_CONCURRENT_SEARCHES Chromes: o padrão divide MAX_TOTAL_DRIVERS entre os workers
+workers = ScraperConfig.WEB_WORKERS or max(1, ScraperConfig.MAX_TOTAL_DRIVERS // max(1, ScraperConfig.MAX_CONCURRENT_SEARCHES))
+
+# Threads atendem requisições enquanto outras esperam um driver do pool: uma por
+# requisição que o controle de admissão aceita (drivers + fila), para que o excesso
+# receba 429 em vez de ficar parado na fila do gunicorn, e as extras para os
+# endpoints que não usam driver
+worker_class = "gthread"
+threads = (ScraperConfig.MAX_CONCURRENT_SEARCHES * (1 + ScraperConfig.ADMISSION_QUEUE_PER_DRIVER)
+           + ScraperConfig.WEB_EXTRA_THREADS)
+
+preload_app = True
+
+# Buscas longas: o timeout do gthread vale para o processo travado, não para a requisição
+timeout = 120
+# Tempo para concluir as buscas em andamento (SHUTDOWN_TIMEOUT, dividido entre as
+# etapas de stop_services) e fechar os Chromes
+graceful_timeout = int(ScraperConfig.SHUTDOWN_TIMEOUT) + 30
+
+accesslog = "-"
+errorlog = "-"
+loglevel = ScraperConfig.LOG_LEVEL.lower()
+
+
+def when_ready(server):
+    import facebook_ads_scraper
+
+    # Jobs interrompidos voltam à fila uma única vez, antes de existir qualquer worker
+    facebook_ads_scraper.resume_interrupted_jobs()
+
+    # Objetos carregados até aqui não são mais visitados pelo coletor de lixo,
+    # então as páginas de memória continuam compartilhadas com os workers (copy-on-write)
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Iniciando {workers} workers com {ScraperConfig.MAX_CONCURRENT_SEARCHES} drivers cada")
+
+
+def post_worker_init(worker):
+    import facebook_ads_scraper
+
+    facebook_ads_scraper.start_services(resume_jobs=False)
+    worker.log.info(f"Worker {worker.pid}: pool de drivers pronto")
+
+
+def worker_exit(server, worker):
+    import facebook_ads_scraper
+
+    facebook_ads_scraper.stop_services(timeout=ScraperConfig.SHUTDOWN_TIMEOUT)
+    server.log.info(f"Worker {worker.pid}: drivers encerrados")
@@ -0,0 +1,279 @@
+import os
+import json
+import uuid
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+
+class JobStore:
+    """Armazena os jobs assíncronos em SQLite
+
+    Os resultados sobrevivem a reinícios do serviço; jobs que estavam na fila ou
+    em execução quando o processo parou voltam para a fila (``requeue_unfinished``).
+    """
+
+    def __init__(self, db_path: str = "jobs.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.setup_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def setup_database(self):
+        """Configura banco de dados SQLite"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        # WAL permite ler o status enquanto os workers gravam resultados
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                job_type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER DEFAULT 0,
+                created_at TIMESTAMP NOT NULL,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)')
+
+        conn.commit()
+        conn.close()
+
+    def create(self, job_type: str, payload: Dict) -> str:
+        """Cria um job na fila e retorna o seu ID"""
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        conn.execute('''
+            INSERT INTO jobs (id, job_type, payload, status, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (job_id, job_type, json.dumps(payload, ensure_ascii=False), JOB_QUEUED, datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Status, payload e resultado de um job (None se não existe)"""
+        conn = self._connect()
+        row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        conn.close()
+
+        if not row:
+            return None
+        return {
+            'job_id': row['id'],
+            'type': row['job_type'],
+            'status': row['status'],
+            'payload': json.loads(row['payload']),
+            'result': json.loads(row['result']) if row['result'] is not None else None,
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at']
+        }
+
+    def claim_next(self) -> Optional[Dict]:
+        """Retira o job mais antigo da fila e o marca como em execução
+
+        A seleção e a atualização ocorrem na mesma transação (BEGIN IMMEDIATE),
+        então vários processos podem consumir a mesma fila sem executar um job
+        duas vezes.
+        """
+        conn = self._connect()
+        # Leitura sem trava primeiro: com a fila vazia nenhum processo bloqueia o banco
+        if not conn.execute('SELECT 1 FROM jobs WHERE status = ? LIMIT 1', (JOB_QUEUED,)).fetchone():
+            conn.close()
+            return None
+
+        conn.isolation_level = None
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1',
+                               (JOB_QUEUED,)).fetchone()
+            if row:
+                conn.execute('UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?',
+                             (JOB_RUNNING, datetime.now().isoformat(), row['id']))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return self.get(row['id']) if row else None
+
+    def mark_done(self, job_id: str, result):
+        self._update(job_id, 'status = ?, result = ?, error = NULL, finished_at = ?',
+                     (JOB_DONE, json.dumps(result, ensure_ascii=False), datetime.now().isoformat()))
+
+    def mark_failed(self, job_id: str, error: str):
+        self._update(job_id, 'status = ?, error = ?, finished_at = ?',
+                     (JOB_FAILED, error, datetime.now().isoformat()))
+
+    def mark_queued(self, job_id: str):
+        self._update(job_id, 'status = ?, started_at = NULL', (JOB_QUEUED,))
+
+    def _update(self, job_id: str, assignments: str, values: Tuple):
+        conn = self._connect()
+        conn.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*values, job_id))
+        conn.commit()
+        conn.close()
+
+    def requeue_unfinished(self) -> List[str]:
+        """Devolve à fila os jobs interrompidos e retorna os IDs pendentes em ordem de criação"""
+        conn = self._connect()
+        conn.execute('UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?', (JOB_QUEUED, JOB_RUNNING))
+        rows = conn.execute('SELECT id FROM jobs WHERE status = ? ORDER BY created_at', (JOB_QUEUED,)).fetchall()
+        conn.commit()
+        conn.close()
+        return [row['id'] for row in rows]
+
+    def purge_finished(self, days: int) -> int:
+        """Remove jobs concluídos há mais de ``days`` dias"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        conn = self._connect()
+        cursor = conn.execute('DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?',
+                              (JOB_DONE, JOB_FAILED, cutoff))
+        conn.commit()
+        conn.close()
+        return cursor.rowcount
+
+    def stats(self) -> Dict:
+        """Quantidade de jobs por status"""
+        conn = self._connect()
+        rows = conn.execute('SELECT status, COUNT(*) AS total FROM jobs GROUP BY status').fetchall()
+        conn.close()
+        return {row['status']: row['total'] for row in rows}
+
+
+class JobRunner:
+    """Executa os jobs do JobStore em threads de trabalho
+
+    ``handlers`` mapeia o tipo do job para uma função que recebe o payload e
+    retorna o resultado (serializável em JSON). Exceções em ``retry_on`` (ex.:
+    nenhum driver livre) devolvem o job à fila em vez de marcá-lo como falho.
+
+    A fila é o próprio banco: os workers retiram jobs com ``claim_next``, de modo
+    que vários processos do servidor compartilham a mesma fila. ``submit`` acorda
+    os workers do processo; jobs criados por outros processos são encontrados na
+    próxima consulta (a cada ``poll_interval`` segundos).
+    """
+
+    def __init__(self, store: JobStore, handlers: Dict[str, Callable[[Dict], object]],
+                 workers: int = 2, retry_on: Tuple[Type[BaseException], ...] = (), max_attempts: int = 3,
+                 poll_interval: float = 1.0):
+        self.store = store
+        self.handlers = handlers
+        self.workers = workers
+        self.retry_on = retry_on
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+
+    def resume_unfinished(self):
+        """Devolve à fila os jobs interrompidos por um reinício
+
+        Deve rodar uma única vez por serviço (no processo principal, antes de
+        criar os workers), senão um processo devolveria à fila os jobs que
+        outro está executando.
+        """
+        pending = self.store.requeue_unfinished()
+        if pending:
+            logger.info(f"{len(pending)} jobs pendentes retomados")
+
+    def start(self, resume: bool = True):
+        """Inicia os workers (e, por padrão, retoma os jobs que ficaram pendentes)"""
+        with self._start_lock:
+            if self._threads:
+                return
+
+            if resume:
+                self.resume_unfinished()
+
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Para de retirar jobs e aguarda os que estão em execução (no máximo ``timeout`` no total)"""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        wait_until = time.monotonic() + timeout if timeout is not None else None
+        for thread in self._threads:
+            thread.join(max(wait_until - time.monotonic(), 0) if wait_until is not None else None)
+        self._threads = []
+
+    def submit(self, job_type: str, payload: Dict) -> str:
+        """Registra o job na fila e acorda um worker"""
+        if job_type not in self.handlers:
+            raise ValueError(f"Tipo de job desconhecido: {job_type}")
+        job_id = self.store.create(job_type, payload)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim_next()
+            except Exception as e:
+                logger.error(f"Erro ao ler a fila de jobs: {e}")
+                job = None
+
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+
+            try:
+                self._run(job)
+            except Exception as e:
+                logger.error(f"Erro inesperado no job {job['job_id']}: {e}")
+
+    def _run(self, job: Dict):
+        job_id = job['job_id']
+        logger.info(f"Executando job {job_id} ({job['type']})")
+        try:
+            result = self.handlers[job['type']](job['payload'])
+        except self.retry_on as e:
+            if job['attempts'] < self.max_attempts:
+                logger.warning(f"Job {job_id} volta para a fila: {e}")
+                self.store.mark_queued(job_id)
+            else:
+                self.store.mark_failed(job_id, str(e))
+            return
+        except Exception as e:
+            logger.error(f"Job {job_id} falhou: {e}")
+            self.store.mark_failed(job_id, str(e))
+            return
+
+        self.store.mark_done(job_id, result)
+        logger.info(f"Job {job_id} concluído")
@@ -12,7 +12,10 @@ def install_requirements():
         'flask==2.3.3',
         'flask-cors==4.0.0',
         'pandas>=2.1.1',
-        'webdriver-manager==4.0.1'
+        'webdriver-manager==4.0.1',
+        'psutil==5.9.6',
+        'redis==5.0.1',
+        'gunicorn==21.2.0'
     ]
     
     # Primeiro instalar numpy
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Script para testar a deduplicação de anúncios (AdDedupeIndex + unique_ads)
+"""
+
+from ad_parser import AdDedupeIndex, unique_ads
+
+
+def test_dedupe_by_library_id():
+    print("=== Testando deduplicação pela identificação da biblioteca ===")
+    index = AdDedupeIndex()
+
+    first = {'ad_id': 'Identificação da biblioteca: 1234567', 'advertiser_name': 'Pizzaria Bella', 'ad_text': 'Promoção'}
+    # Mesmo ID com outro texto (ex.: outra variação do criativo): continua sendo o mesmo anúncio
+    same_id = {'ad_id': '1234567', 'advertiser_name': 'Pizzaria Bella', 'ad_text': 'Outro texto'}
+    other_id = {'ad_id': '7654321', 'advertiser_name': 'Pizzaria Bella', 'ad_text': 'Promoção'}
+
+    assert index.add(first, value=(True, 0.9))
+    assert not index.add(same_id), "mesmo ID deveria ser duplicata"
+    assert index.add(other_id), "IDs diferentes são anúncios diferentes"
+    assert index.duplicates == 1 and len(index) == 2
+    print(f"✓ chaves: {AdDedupeIndex.key_for(first)} e {AdDedupeIndex.key_for(other_id)}")
+
+    # O valor guardado (ex.: resultado da correspondência) é reaproveitado
+    assert index.get(same_id) == (True, 0.9)
+    assert index.get({'ad_id': '999'}, 'nunca visto') == 'nunca visto'
+    assert same_id in index
+    print("✓ valor guardado reaproveitado para o mesmo anúncio")
+
+
+def test_dedupe_without_id():
+    print("\n=== Testando deduplicação sem ID (hash de anunciante e texto) ===")
+    index = AdDedupeIndex()
+
+    ad = {'advertiser_name': 'Academia Fit', 'ad_text': 'Matrículas abertas  na unidade Centro'}
+    # Só muda a caixa e os espaços
+    same = {'ad_id': '', 'advertiser_name': 'ACADEMIA FIT', 'ad_text': 'Matrículas abertas na unidade\nCentro'}
+    different = {'advertiser_name': 'Academia Fit', 'ad_text': 'Aulas de spinning'}
+
+    assert AdDedupeIndex.key_for(ad).startswith('hash:')
+    assert index.add(ad)
+    assert not index.add(same), "caixa e espaços não deveriam mudar a chave"
+    assert index.add(different)
+    print(f"✓ {len(index)} anúncios únicos, {index.duplicates} duplicata")
+
+
+def test_unique_ads_across_strategies():
+    print("\n=== Testando índice compartilhado entre estratégias ===")
+    index = AdDedupeIndex()
+
+    strategy_1 = [
+        {'ad_id': '111', 'advertiser_name': 'Padaria Pão Bom', 'ad_text': 'Pão quentinho'},
+        {'ad_id': '111', 'advertiser_name': 'Padaria Pão Bom', 'ad_text': 'Pão quentinho'},
+        {},
+        {'ad_id': '', 'advertiser_name': '', 'ad_text': ''},
+        {'ad_id': '222', 'advertiser_name': 'Padaria Pão Bom', 'ad_text': 'Café da manhã'},
+    ]
+    strategy_2 = [
+        {'ad_id': '222', 'advertiser_name': 'Padaria Pão Bom', 'ad_text': 'Café da manhã'},
+        {'ad_id': '333', 'advertiser_name': 'Padaria Pão Bom', 'ad_text': 'Bolos'},
+    ]
+
+    first = unique_ads(strategy_1, index)
+    second = unique_ads(strategy_2, index)
+
+    assert [ad['ad_id'] for ad in first] == ['111', '222'], "vazios e repetidos devem sair, na ordem da página"
+    assert [ad['ad_id'] for ad in second] == ['333'], "anúncio já visto na estratégia anterior não volta"
+    print(f"✓ estratégia 1: {len(first)} anúncios, estratégia 2: {len(second)} novo(s)")
+
+
+if __name__ == "__main__":
+    test_dedupe_by_library_id()
+    test_dedupe_without_id()
+    test_unique_ads_across_strategies()
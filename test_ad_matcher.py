@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Script para testar a correspondência entre anúncios e estabelecimentos (AdMatcher)
+"""
+
+import time
+
+from ad_matcher import AdMatcher
+
+PIZZARIA = {'name': 'Pizzaria Bella Napoli', 'city': 'Curitiba', 'neighborhood': 'Centro', 'category': 'restaurante'}
+LOJA = {'name': 'Outra Loja', 'city': 'São Paulo'}
+
+ADS = [
+    {'advertiser_name': 'Pizzaria Bella Napoli', 'ad_text': 'A melhor pizza de Curitiba'},
+    {'advertiser_name': 'Pizaria Bella Napoli', 'ad_text': 'promoção'},
+    {'advertiser_name': 'Outra Loja', 'ad_text': 'roupas em São Paulo'},
+    {'advertiser_name': 'Restaurante Sabor', 'ad_text': 'restaurante no Centro de Curitiba'},
+    {'advertiser_name': 'Casa de Carnes', 'ad_text': 'picanha em oferta'},
+]
+
+
+def test_match_and_confidence():
+    print("=== Testando correspondência e confiança ===")
+    results = AdMatcher([PIZZARIA]).match(ADS)
+
+    assert results[0] == (True, 0.8), f"nome completo + cidade: {results[0]}"
+    # Um erro de digitação ("pizaria") ainda encontra o nome completo
+    assert results[1] == (True, 0.6), f"nome com erro de digitação: {results[1]}"
+    assert results[2] == (False, 0.0), f"outro anunciante: {results[2]}"
+    # Sem o nome: localização + categoria bastam, com confiança baixa
+    assert results[3] == (True, 0.4), f"localização + categoria: {results[3]}"
+    assert results[4] == (False, 0.0)
+    for ad, (matches, confidence) in zip(ADS, results):
+        print(f"✓ {ad['advertiser_name']}: corresponde={matches}, confiança={confidence}")
+
+
+def test_many_establishments():
+    print("\n=== Testando vários estabelecimentos de uma vez ===")
+    matcher = AdMatcher([PIZZARIA, LOJA])
+    matches, confidence = matcher.score(ADS)
+
+    assert matches.shape == confidence.shape == (len(ADS), 2)
+    assert matcher.match(ADS, establishment=1) == [
+        (False, 0.0), (False, 0.0), (True, 0.8), (False, 0.0), (False, 0.0)
+    ]
+    # Cada coluna é o mesmo resultado de um matcher com um só estabelecimento
+    assert matcher.match(ADS, establishment=0) == AdMatcher([PIZZARIA]).match(ADS)
+    print(f"✓ matriz {matches.shape[0]} anúncios × {matches.shape[1]} estabelecimentos")
+
+    # Entradas vazias não quebram
+    assert AdMatcher([]).score(ADS)[0].shape == (len(ADS), 0)
+    assert AdMatcher([PIZZARIA]).match([]) == []
+    assert AdMatcher([{'name': ''}]).match(ADS[:1]) == [(False, 0.0)]
+    print("✓ sem anúncios ou sem estabelecimentos")
+
+
+def test_batch_speed():
+    print("\n=== Testando um lote de milhares de anúncios ===")
+    ads = ADS * 1000
+    matcher = AdMatcher([PIZZARIA, LOJA])
+
+    started = time.perf_counter()
+    matches, _ = matcher.score(ads)
+    elapsed = time.perf_counter() - started
+
+    assert int(matches[:, 0].sum()) == 3000 and int(matches[:, 1].sum()) == 1000
+    print(f"✓ {len(ads)} anúncios avaliados em {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_match_and_confidence()
+    test_many_establishments()
+    test_batch_speed()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Script para testar o controle de admissão (AdmissionController) e a resposta 429
+"""
+
+import time
+import threading
+
+from driver_pool import AdmissionController, DriverPool, PoolSaturatedError
+
+
+class FakeScraper:
+    driver = None
+
+    def close(self):
+        pass
+
+
+def make_pool(size=1, wait_timeout=10):
+    return DriverPool(factory=FakeScraper, size=size, wait_timeout=wait_timeout, warm_up=False)
+
+
+def hold_driver(pool, admission, seconds, started):
+    with admission.admit():
+        with pool.acquire():
+            started.set()
+            time.sleep(seconds)
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "condição não atingida"
+        time.sleep(0.01)
+
+
+def test_rejects_when_queue_is_full():
+    print("=== Testando recusa com a fila cheia ===")
+    pool = make_pool(size=1)
+    admission = AdmissionController(pool, max_queue=1)
+
+    # Uma requisição usando o único driver e outra aguardando: fila cheia
+    running, queued = threading.Event(), threading.Event()
+    threads = [threading.Thread(target=hold_driver, args=(pool, admission, 0.5, running))]
+    threads[0].start()
+    running.wait(2)
+    threads.append(threading.Thread(target=hold_driver, args=(pool, admission, 0.01, queued)))
+    threads[1].start()
+    wait_for(lambda: pool.waiting == 1)
+
+    assert admission.saturated()
+    try:
+        with admission.admit():
+            raise AssertionError("a terceira requisição deveria ser recusada")
+    except PoolSaturatedError as e:
+        retry_after = e.retry_after
+    # Sem histórico de vazão: metade da espera máxima do pool
+    assert retry_after == 5, retry_after
+    print(f"✓ recusada na hora com Retry-After de {retry_after}s")
+
+    for thread in threads:
+        thread.join()
+    stats = admission.stats()
+    assert stats['admitted'] == 2 and stats['rejected'] == 1 and stats['active'] == 0, stats
+    assert not admission.saturated()
+    print(f"✓ fila liberada: {stats}")
+
+
+def test_no_queue_rejects_only_without_idle_driver():
+    print("\n=== Testando max_queue=0 ===")
+    pool = make_pool(size=1)
+    admission = AdmissionController(pool, max_queue=0)
+
+    # Driver livre: entra mesmo sem fila
+    with admission.admit():
+        with pool.acquire():
+            # Driver ocupado e fila zero: recusa
+            try:
+                with admission.admit():
+                    raise AssertionError("deveria recusar sem driver livre")
+            except PoolSaturatedError:
+                pass
+    print("✓ aceita com driver livre e recusa com o driver ocupado")
+
+
+def test_retry_after_follows_throughput():
+    print("\n=== Testando Retry-After pela vazão recente ===")
+    pool = make_pool(size=1, wait_timeout=600)
+    admission = AdmissionController(pool, max_queue=10, max_retry_after=120)
+
+    # 20 buscas rápidas: a vazão recente é alta e a fila esvazia em pouco tempo
+    for _ in range(20):
+        with pool.acquire():
+            time.sleep(0.005)
+    fast = admission.retry_after()
+    assert fast == 1, f"20 buscas por segundo esvaziam um aguardando em menos de 1s: {fast}"
+
+    # Sem histórico o valor é limitado por max_retry_after
+    assert AdmissionController(make_pool(wait_timeout=600), max_queue=1, max_retry_after=120).retry_after() == 120
+    print(f"✓ Retry-After com vazão recente: {fast}s; sem histórico: limitado a 120s")
+
+
+def test_api_answers_429():
+    print("\n=== Testando resposta 429 da API ===")
+    import facebook_ads_scraper
+
+    pool = make_pool(size=1)
+    saturated = AdmissionController(pool, max_queue=0)
+    original = facebook_ads_scraper.admission, facebook_ads_scraper.search_cache
+    facebook_ads_scraper.admission, facebook_ads_scraper.search_cache = saturated, None
+    try:
+        with pool.acquire():
+            response = facebook_ads_scraper.app.test_client().post(
+                '/api/has-ads', json={'maps_address': 'Padaria Pão Bom - Copacabana, Rio de Janeiro - RJ'}
+            )
+    finally:
+        facebook_ads_scraper.admission, facebook_ads_scraper.search_cache = original
+
+    assert response.status_code == 429, response.status_code
+    assert response.headers['Retry-After'] == str(response.json['retry_after'])
+    print(f"✓ {response.status_code} com Retry-After: {response.headers['Retry-After']}s")
+
+
+def test_cache_hits_skip_admission():
+    print("\n=== Testando resposta do cache com a fila cheia ===")
+    import facebook_ads_scraper
+    from utils import CacheManager
+
+    cache = CacheManager(cache_dir=None)
+    original = facebook_ads_scraper.search_cache
+    facebook_ads_scraper.search_cache = cache
+    try:
+        ads = [{'advertiser_name': 'Padaria Pão Bom', 'ad_text': 'pão quente', 'ad_id': '1'}]
+        cache.save_to_cache(facebook_ads_scraper.location_cache_key('Copacabana', 'padaria', 50), ads)
+
+        pool = make_pool(size=1)
+        saturated = AdmissionController(pool, max_queue=0)
+        original_admission = facebook_ads_scraper.admission
+        facebook_ads_scraper.admission = saturated
+        try:
+            with pool.acquire():
+                response = facebook_ads_scraper.app.test_client().post(
+                    '/api/search-ads', json={'location': 'Copacabana', 'business_type': 'padaria'}
+                )
+        finally:
+            facebook_ads_scraper.admission = original_admission
+    finally:
+        facebook_ads_scraper.search_cache = original
+
+    assert response.status_code == 200, (response.status_code, response.json)
+    assert response.json['ads'] == ads and response.json['timed_out'] is False
+    assert saturated.stats()['rejected'] == 0
+    print(f"✓ {response.status_code} com {response.json['total_found']} anúncio do cache, sem passar pela fila")
+
+
+def test_gunicorn_threads_cover_admission_limit():
+    print("\n=== Testando threads do gunicorn x limite de admissão ===")
+    import runpy
+    from config import ScraperConfig
+
+    original = ScraperConfig.MAX_CONCURRENT_SEARCHES, ScraperConfig.ADMISSION_QUEUE_PER_DRIVER
+    try:
+        for size, queue in [original, (1, 0), (3, 2), (4, 5)]:
+            ScraperConfig.MAX_CONCURRENT_SEARCHES, ScraperConfig.ADMISSION_QUEUE_PER_DRIVER = size, queue
+            threads = runpy.run_path('gunicorn.conf.py')['threads']
+            limit = AdmissionController(make_pool(size=size), max_queue=size * queue).limit
+            # Com todas as requisições admitidas ocupando threads, ainda sobram as de health/stats
+            assert threads >= limit + ScraperConfig.WEB_EXTRA_THREADS, (size, queue, threads, limit)
+            print(f"✓ {size} drivers, fila {queue} por driver: limite {limit}, {threads} threads")
+    finally:
+        ScraperConfig.MAX_CONCURRENT_SEARCHES, ScraperConfig.ADMISSION_QUEUE_PER_DRIVER = original
+
+
+if __name__ == "__main__":
+    test_rejects_when_queue_is_full()
+    test_no_queue_rejects_only_without_idle_driver()
+    test_retry_after_follows_throughput()
+    test_api_answers_429()
+    test_cache_hits_skip_admission()
+    test_gunicorn_threads_cover_admission_limit()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Script para testar os backends de cache (memória, disco e Redis)
+
+O Redis é testado contra o servidor em REDIS_URL quando ele está acessível;
+caso contrário é usado um cliente falso em memória com os mesmos comandos.
+"""
+
+import os
+import time
+import tempfile
+import threading
+
+from utils import CacheManager, Deadline, DeadlineExceeded, RedisCacheManager
+
+
+class FakeRedis:
+    """Cliente em memória com os comandos usados pelo RedisCacheManager"""
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def _alive(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.time():
+            self.data.pop(key, None)
+            return None
+        return value
+
+    def get(self, key):
+        with self.lock:
+            return self._alive(key)
+
+    def set(self, key, value, px=None, nx=False):
+        with self.lock:
+            if nx and self._alive(key) is not None:
+                return None
+            if isinstance(value, str):
+                value = value.encode('utf-8')
+            self.data[key] = (value, time.time() + px / 1000 if px else None)
+            return True
+
+    def delete(self, key):
+        with self.lock:
+            return 1 if self.data.pop(key, None) else 0
+
+    def exists(self, key):
+        with self.lock:
+            return 1 if self._alive(key) is not None else 0
+
+
+def redis_client():
+    """Usa o Redis real se estiver rodando, senão o cliente falso"""
+    try:
+        import redis
+        client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/15"), socket_connect_timeout=1)
+        client.ping()
+        print("  Usando Redis real")
+        return client
+    except Exception:
+        print("  Redis indisponível, usando cliente falso em memória")
+        return FakeRedis()
+
+
+def check_roundtrip(cache, name):
+    key = cache.get_cache_key("padaria pao bom", "sao paulo", namespace="test")
+    ads = [{'advertiser_name': 'Padaria Pão Bom', 'ad_text': 'Pão quentinho'}]
+
+    cache.delete(key)
+    assert cache.get_cached_data(key) is None
+    cache.save_to_cache(key, ads)
+    assert cache.get_cached_data(key) == ads
+
+    cache.save_to_cache(key, ads, ttl_seconds=0.2)
+    time.sleep(0.3)
+    assert cache.get_cached_data(key) is None, "entrada deveria ter expirado"
+
+    print(f"✓ {name}: salvar, ler e expirar")
+
+
+def test_memory_and_file_cache():
+    print("=== Testando cache em memória e em disco ===")
+    check_roundtrip(CacheManager(cache_dir=None), "memória")
+    check_roundtrip(CacheManager(cache_dir=tempfile.mkdtemp(), compress=True), "disco")
+
+    # Dois processos no mesmo diretório: a cópia expirada em memória de um não
+    # apaga o arquivo que o outro acabou de renovar
+    cache_dir = tempfile.mkdtemp()
+    first, second = CacheManager(cache_dir=cache_dir), CacheManager(cache_dir=cache_dir)
+    key = first.get_cache_key("academia fit", "", namespace="test")
+    first.save_to_cache(key, ['antigo'], ttl_seconds=0.2)
+    time.sleep(0.3)
+    second.save_to_cache(key, ['renovado'])
+    assert first.get_cached_data(key) == ['renovado']
+    assert os.path.exists(first._path(key))
+    print("✓ disco: entrada renovada por outro processo é preservada")
+
+    # O limite de entradas vale só para a memória de cada processo: os arquivos
+    # continuam para os outros e só a limpeza (por validade) remove do disco
+    small = CacheManager(cache_dir=cache_dir, max_entries=2)
+    keys = [small.get_cache_key(f"loja {number}", "", namespace="test") for number in range(3)]
+    for number, key in enumerate(keys):
+        small.save_to_cache(key, [f"loja {number}"], ttl_seconds=100 + number)
+    assert small.stats()['entries'] == 2 and small.stats()['evictions'] == 1
+    assert os.path.exists(small._path(keys[0])) and second.get_cached_data(keys[0]) == ['loja 0']
+    assert small.get_cached_data(keys[0]) == ['loja 0'], "entrada fora da memória volta do disco"
+
+    sizes = sum(os.path.getsize(small._path(key)) for key in keys)
+    small.max_bytes = sizes - 1
+    assert small.sweep()['removed'] == 2, "acima do limite saem as que vencem antes"
+    assert not os.path.exists(small._path(keys[0])) and os.path.exists(small._path(keys[2]))
+    print("✓ disco: o limite de entradas não apaga arquivos; a limpeza respeita max_bytes")
+
+
+def test_redis_cache():
+    print("\n=== Testando cache no Redis ===")
+    cache = RedisCacheManager(client=redis_client(), compress=True, prefix="geo_ads_test:", lock_timeout=5)
+    check_roundtrip(cache, "redis")
+
+    # Duas "instâncias" fazendo a mesma busca: só uma executa
+    key = cache.get_cache_key("mesma busca", "", namespace="test")
+    cache.delete(key)
+    executions = []
+    results = []
+
+    def search():
+        executions.append(1)
+        time.sleep(0.5)
+        ads = [{'ad_text': 'resultado'}]
+        cache.save_to_cache(key, ads)
+        return ads
+
+    threads = [threading.Thread(target=lambda: results.append(cache.coordinate(key, search))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(executions) == 1, f"busca executada {len(executions)} vezes"
+    assert all(result == [{'ad_text': 'resultado'}] for result in results)
+    print(f"✓ redis: busca coordenada executada uma vez para {len(results)} chamadas")
+
+    # Quem espera a busca de outra instância não passa do próprio prazo
+    cache.delete(key)
+    leader = threading.Thread(target=lambda: cache.coordinate(key, search))
+    leader.start()
+    time.sleep(0.1)
+    started = time.monotonic()
+    try:
+        cache.coordinate(key, search, deadline=Deadline(0.2))
+        raise AssertionError("a espera deveria terminar com o prazo")
+    except DeadlineExceeded:
+        waited = time.monotonic() - started
+    leader.join()
+    assert waited < 0.45, f"espera de {waited:.2f}s passou do prazo"
+    assert len(executions) == 2, "a chamada com o prazo esgotado não deve executar a busca"
+    print(f"✓ redis: espera pela outra instância encerrada pelo prazo em {waited:.2f}s")
+    print(f"  Estatísticas: {cache.stats()}")
+
+
+def test_redis_lock_lasts_the_leader_deadline():
+    print("\n=== Testando lock no Redis durante uma busca longa ===")
+    # lock_timeout curto: sem prazo o lock venceria no meio da busca
+    cache = RedisCacheManager(client=redis_client(), prefix="geo_ads_test:", lock_timeout=0.2, lock_margin=0.5)
+    key = cache.get_cache_key("busca longa", "", namespace="test")
+    cache.delete(key)
+    executions = []
+
+    def search():
+        executions.append(1)
+        time.sleep(0.6)
+        ads = [{'ad_text': 'resultado'}]
+        cache.save_to_cache(key, ads)
+        return ads
+
+    # O lock de quem busca dura o prazo dele; quem chega depois espera em vez de repetir a busca
+    leader = threading.Thread(target=lambda: cache.coordinate(key, search, deadline=Deadline(5)))
+    leader.start()
+    time.sleep(0.1)
+    result = cache.coordinate(key, search, deadline=Deadline(5))
+    leader.join()
+    assert result == [{'ad_text': 'resultado'}] and len(executions) == 1, executions
+
+    # Lock de um processo que morreu: vence com o prazo dele e outro assume
+    cache.delete(key)
+    lock_key = f"{cache.prefix}lock:{key}"
+    cache.client.set(lock_key, "processo-morto", nx=True, px=300)
+    started = time.monotonic()
+    result = cache.coordinate(key, search, deadline=Deadline(5))
+    assert len(executions) == 2 and time.monotonic() - started < 2
+    print(f"✓ redis: busca de 0.6s com lock_timeout de 0.2s executada uma vez; lock órfão assumido")
+
+
+if __name__ == "__main__":
+    test_memory_and_file_cache()
+    test_redis_cache()
+    test_redis_lock_lasts_the_leader_deadline()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Script para testar os prazos das requisições (Deadline, SingleFlight e /api/has-ads)
+"""
+
+import time
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from utils import CacheManager, Deadline, DeadlineExceeded, SingleFlight
+
+
+def test_deadline():
+    print("=== Testando Deadline ===")
+    unbounded = Deadline(None)
+    assert not unbounded.bounded and not unbounded.expired()
+    assert unbounded.remaining() == float('inf') and unbounded.clamp(10) == 10
+    unbounded.check("qualquer etapa")
+
+    deadline = Deadline(0.2)
+    assert deadline.bounded and not deadline.expired()
+    assert deadline.clamp(10) <= 0.2 and deadline.clamp(0.05) == 0.05
+    time.sleep(0.25)
+    assert deadline.expired() and deadline.remaining() == 0.0 and deadline.clamp(10) == 0.0
+    try:
+        deadline.check("rolar a página")
+        raise AssertionError("check deveria levantar DeadlineExceeded")
+    except DeadlineExceeded as e:
+        assert "rolar a página" in str(e)
+        print(f"✓ {e}")
+
+
+def test_single_flight():
+    print("\n=== Testando SingleFlight com prazo ===")
+    flights = SingleFlight()
+    executions = []
+    release = threading.Event()
+
+    def search():
+        executions.append(1)
+        release.wait(2)
+        return ['anúncio']
+
+    leader = threading.Thread(target=lambda: flights.do('padaria', search))
+    leader.start()
+    time.sleep(0.05)
+
+    # Quem aguarda a mesma busca não passa do próprio prazo
+    started = time.monotonic()
+    try:
+        flights.do('padaria', search, deadline=Deadline(0.2))
+        raise AssertionError("a espera deveria terminar com o prazo")
+    except DeadlineExceeded:
+        waited = time.monotonic() - started
+    assert waited < 0.45, f"espera de {waited:.2f}s"
+    print(f"✓ espera encerrada pelo prazo em {waited:.2f}s")
+
+    # Com tempo suficiente recebe o resultado sem executar de novo
+    results = []
+    follower = threading.Thread(target=lambda: results.append(flights.do('padaria', search, deadline=Deadline(5))))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+    assert results == [['anúncio']] and len(executions) == 1
+    stats = flights.stats()
+    assert stats['coalesced'] == 2 and stats['expired'] == 1 and stats['in_flight'] == 0, stats
+    print(f"✓ resultado compartilhado: {stats}")
+
+
+def test_single_flight_takeover():
+    print("\n=== Testando quem aguarda com prazo depois que o líder desiste ===")
+    flights = SingleFlight()
+    executions = []
+
+    def search(deadline):
+        executions.append(deadline.seconds)
+        time.sleep(0.3)
+        # Busca cortada pelo prazo: nada encontrado até então
+        return [] if deadline.expired() else ['anúncio']
+
+    def call(seconds, results):
+        deadline = Deadline(seconds)
+        try:
+            results.append(flights.do('padaria', lambda: search(deadline), deadline=deadline, conclusive=bool))
+        except DeadlineExceeded as e:
+            results.append(e)
+
+    # O líder tem só 0.1s; quem chega depois tem tempo de sobra e refaz a busca
+    leader_results, follower_results = [], []
+    leader = threading.Thread(target=call, args=(0.1, leader_results))
+    leader.start()
+    time.sleep(0.05)
+    follower = threading.Thread(target=call, args=(5, follower_results))
+    follower.start()
+    leader.join()
+    follower.join()
+    assert leader_results == [[]], leader_results
+    assert follower_results == [['anúncio']], follower_results
+    assert executions == [0.1, 5], executions
+    stats = flights.stats()
+    assert stats['retried'] == 1 and stats['in_flight'] == 0, stats
+    print(f"✓ resultado parcial do líder não passou para quem tinha prazo: {stats}")
+
+    # Um resultado conclusivo, mesmo fora do prazo do líder, vale para todos
+    flights = SingleFlight()
+    flight, _ = flights.join('padaria')
+    flights.land('padaria', flight, ['anúncio'], retry=False)
+    assert not flights.should_retry(flight, Deadline(5))
+
+    # Erro de cancelamento: quem tem prazo executa; quem não tem recebe o erro
+    flight, _ = flights.join('padaria')
+    flights.land('padaria', flight, error=RuntimeError("Busca cancelada"), retry=True)
+    expired = Deadline(0.01)
+    time.sleep(0.02)
+    assert flights.should_retry(flight, Deadline(5)) and not flights.should_retry(flight, expired)
+    print("✓ cancelamento repassado só a quem já está sem prazo")
+
+
+def test_has_ads_deadline_is_not_a_cached_false():
+    print("\n=== Testando /api/has-ads com o prazo esgotado ===")
+    import facebook_ads_scraper
+
+    scraper = facebook_ads_scraper.FacebookAdsLibraryScraper()
+
+    def partial_results(strategies, lean_page, match_only=False):
+        # Busca cortada pelo prazo, só com anúncios de outros anunciantes e sem falhas
+        time.sleep(0.3)
+        yield 0, [{'advertiser_name': 'Outra Loja', 'ad_text': 'roupas', 'ad_id': '1'}]
+
+    scraper._run_search_strategies = partial_results
+
+    @contextmanager
+    def acquire(timeout=None):
+        yield scraper
+
+    cache = CacheManager(cache_dir=None)
+    pool = facebook_ads_scraper.driver_pool
+    original = pool.acquire, facebook_ads_scraper.search_cache
+    pool.acquire, facebook_ads_scraper.search_cache = acquire, cache
+    try:
+        response = facebook_ads_scraper.app.test_client().post('/api/has-ads', json={
+            'maps_address': 'Padaria Pão Bom - R. X, 1 - Copacabana, Rio de Janeiro - RJ',
+            'deadline_seconds': 0.2
+        })
+    finally:
+        pool.acquire, facebook_ads_scraper.search_cache = original
+
+    assert response.status_code == 504, (response.status_code, response.json)
+    assert response.json['timed_out'] is True
+    assert cache.stats()['entries'] == 0, "resultado cortado pelo prazo não pode ir para o cache"
+    print(f"✓ {response.status_code}: {response.json['error']}")
+
+
+def test_search_ads_parsing_respects_deadline():
+    print("\n=== Testando /api/search-ads com o parsing mais longo que o prazo ===")
+    import facebook_ads_scraper
+
+    scraper = facebook_ads_scraper.FacebookAdsLibraryScraper()
+    # Snapshot capturado, mas o processo de parsing nunca termina
+    parsing = Future()
+    scraper.submit_search_ads_by_location_and_type = lambda *args: parsing
+
+    @contextmanager
+    def acquire(timeout=None):
+        yield scraper
+
+    pool = facebook_ads_scraper.driver_pool
+    original = pool.acquire, facebook_ads_scraper.search_cache
+    pool.acquire, facebook_ads_scraper.search_cache = acquire, None
+    started = time.monotonic()
+    try:
+        response = facebook_ads_scraper.app.test_client().post('/api/search-ads', json={
+            'location': 'Copacabana', 'business_type': 'padaria', 'deadline_seconds': 0.2
+        })
+    finally:
+        pool.acquire, facebook_ads_scraper.search_cache = original
+    elapsed = time.monotonic() - started
+
+    assert response.status_code == 504, (response.status_code, response.json)
+    assert response.json['timed_out'] is True and elapsed < 1, elapsed
+    print(f"✓ {response.status_code} em {elapsed:.2f}s: {response.json['error']}")
+
+
+if __name__ == "__main__":
+    test_deadline()
+    test_single_flight()
+    test_single_flight_takeover()
+    test_has_ads_deadline_is_not_a_cached_false()
+    test_search_ads_parsing_respects_deadline()
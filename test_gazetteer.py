@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Script para testar a interpretação de endereços pelo gazetteer (Gazetteer.parse)
+"""
+
+import time
+
+from gazetteer import get_gazetteer
+
+
+def check(address, **expected):
+    result = get_gazetteer().parse(address)
+    for field, value in expected.items():
+        assert result[field] == value, f"{address!r}: {field} = {result[field]!r}, esperado {value!r}"
+    print(f"✓ {address} -> {result}")
+    return result
+
+
+def test_google_maps_addresses():
+    print("=== Testando endereços no formato do Google Maps ===")
+    check("Padaria Pão Bom - R. Barata Ribeiro, 111 - Copacabana, Rio de Janeiro - RJ, 22040-001",
+          city="Rio de Janeiro", state="RJ", neighborhood="Copacabana")
+    check("Salão Bela - Rua E, 5 - Jardim América, São José dos Campos - SP",
+          city="São José dos Campos", state="SP", neighborhood="Jardim América", category="salão")
+    # Fora das capitais e grandes cidades
+    check("Lanchonete X - Rua C, 3 - Centro, Itaquaquecetuba - SP",
+          city="Itaquaquecetuba", state="SP", category="restaurante")
+    check("Clínica Vida - Rua G, 7 - Centro, Macapá - AP, 68900-000, Brasil",
+          city="Macapá", state="AP", category="clínica")
+
+
+def test_accents_and_case():
+    print("\n=== Testando endereços sem acentos e em minúsculas ===")
+    # A cidade volta com a grafia oficial; o bairro, como está no endereço
+    check("Lanchonete X - Rua C, 3 - centro, sao paulo - sp", city="São Paulo", state="SP", neighborhood="centro")
+    check("Bar do Zé, Goiania", city="Goiânia", state="GO")
+
+
+def test_ambiguous_names():
+    print("\n=== Testando municípios homônimos e nomes no estabelecimento ===")
+    # Bom Jesus existe em vários estados: a UF decide
+    check("Mercado Bom - Rua D, 4 - Centro, Bom Jesus - PI", city="Bom Jesus", state="PI")
+    check("Mercado Bom - Rua D, 4 - Centro, Bom Jesus - RS", city="Bom Jesus", state="RS")
+    # O nome do estabelecimento (primeiro trecho) não é usado como cidade
+    check("Rio de Janeiro Burguer - Rua F, 6 - Centro, Niterói - RJ", city="Niterói", state="RJ")
+    check("Loja São Paulo - Rua B, 2 - Savassi, Belo Horizonte - MG",
+          city="Belo Horizonte", state="MG", neighborhood="Savassi")
+    # Santa Maria do DF é região administrativa, não município
+    check("Restaurante Sabor - Rua A, 10 - Centro, Santa Maria - DF", city="", state="DF")
+
+
+def test_empty_and_speed():
+    print("\n=== Testando endereço vazio e tempo por endereço ===")
+    assert get_gazetteer().parse("") == {'city': '', 'state': '', 'neighborhood': '', 'category': ''}
+    assert get_gazetteer() is get_gazetteer(), "o índice deve ser montado uma única vez"
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        get_gazetteer().parse("Mercado Bom - Rua D, 4 - Centro, Bom Jesus - RS")
+    per_address = (time.perf_counter() - started) / 1000
+    print(f"✓ {per_address * 1e6:.0f} µs por endereço")
+
+
+if __name__ == "__main__":
+    test_google_maps_addresses()
+    test_accents_and_case()
+    test_ambiguous_names()
+    test_empty_and_speed()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Script para testar o endpoint /api/has-ads/batch (NDJSON) sem abrir o Chrome
+"""
+
+import io
+import json
+
+import facebook_ads_scraper
+from config import ScraperConfig
+from utils import DeadlineExceeded
+
+PADARIA = "Padaria Pão Bom - R. Barata Ribeiro, 111 - Copacabana, Rio de Janeiro - RJ"
+SALAO = "Salão Bela - Rua E, 5 - Jardim América, São José dos Campos - SP"
+CLINICA = "Clínica Vida - Rua G, 7 - Centro, Macapá - AP"
+
+# Resultado de cada endereço; uma exceção simula a falha da verificação
+RESULTS = {
+    PADARIA: True,
+    SALAO: False,
+    CLINICA: RuntimeError("Chrome encerrado"),
+}
+
+
+def post_batch(**kwargs):
+    """Envia o lote com run_has_ads substituído e devolve (status, linhas, endereços verificados)"""
+    checked = []
+
+    def fake_run_has_ads(maps_address, lean_page=True, deadline=None):
+        checked.append(maps_address)
+        result = RESULTS[maps_address.strip()]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    original = facebook_ads_scraper.run_has_ads
+    facebook_ads_scraper.run_has_ads = fake_run_has_ads
+    try:
+        response = facebook_ads_scraper.app.test_client().post('/api/has-ads/batch', **kwargs)
+        body = response.get_data(as_text=True)
+    finally:
+        facebook_ads_scraper.run_has_ads = original
+
+    lines = [json.loads(line) for line in body.splitlines() if line] if response.status_code == 200 else []
+    return response.status_code, lines, checked
+
+
+def by_address(lines):
+    return {line['maps_address']: line for line in lines if 'summary' not in line}
+
+
+def test_duplicates_and_errors():
+    print("=== Testando endereços repetidos e falha de um endereço ===")
+    # A mesma padaria com outra grafia (caixa e espaços) conta como repetida
+    addresses = [PADARIA, SALAO, PADARIA.upper(), CLINICA, f"  {PADARIA}  "]
+    status, lines, checked = post_batch(json=addresses)
+    assert status == 200, status
+
+    results = by_address(lines)
+    assert len(checked) == 3, f"cada endereço único é verificado uma vez: {checked}"
+    assert results[PADARIA] == {'maps_address': PADARIA, 'inputs': [0, 2, 4], 'has_ads': True}, results[PADARIA]
+    assert results[SALAO]['inputs'] == [1] and results[SALAO]['has_ads'] is False
+    # A falha vira uma linha com o erro e o lote continua
+    assert results[CLINICA]['has_ads'] is None and 'Chrome encerrado' in results[CLINICA]['error']
+    print(f"✓ {len(addresses)} endereços, {len(checked)} verificações; falha: {results[CLINICA]['error']}")
+
+    # O resumo é sempre a última linha
+    summary = lines[-1]['summary']
+    assert summary['total'] == 5 and summary['unique'] == 3 and summary['failed'] == 1, summary
+    print(f"✓ resumo: {summary}")
+
+
+def test_timed_out_address():
+    print("\n=== Testando endereço com o prazo esgotado ===")
+    RESULTS[SALAO] = DeadlineExceeded("Prazo de 45s esgotado")
+    try:
+        status, lines, _ = post_batch(json={'maps_addresses': [PADARIA, SALAO]})
+    finally:
+        RESULTS[SALAO] = False
+    line = by_address(lines)[SALAO]
+    assert status == 200 and line['has_ads'] is None and line['timed_out'] is True, line
+    print(f"✓ {line}")
+
+
+def test_input_formats():
+    print("\n=== Testando formatos de entrada ===")
+    expected = {PADARIA: True, SALAO: False}
+    uploads = {
+        'array JSON': dict(json=[PADARIA, SALAO]),
+        'objeto JSON': dict(json={'maps_addresses': [PADARIA, SALAO]}),
+        'arquivo JSON': dict(data={'file': (io.BytesIO(json.dumps([PADARIA, SALAO]).encode()), 'lote.json')}),
+        'arquivo CSV': dict(data={'file': (
+            io.BytesIO(f'nome,maps_address\nPadaria,"{PADARIA}"\nSalão,"{SALAO}"\n'.encode('utf-8-sig')), 'lote.csv'
+        )}),
+        'arquivo texto': dict(data={'file': (io.BytesIO(f"{PADARIA}\n\n{SALAO}\n".encode()), 'lote.txt')}),
+    }
+    for name, kwargs in uploads.items():
+        status, lines, _ = post_batch(**kwargs)
+        results = {address: line['has_ads'] for address, line in by_address(lines).items()}
+        assert status == 200 and results == expected, (name, status, results)
+        assert lines[-1]['summary']['total'] == 2, (name, lines[-1])
+        print(f"✓ {name}")
+
+
+def test_rejected_input():
+    print("\n=== Testando lotes recusados ===")
+    original = ScraperConfig.BATCH_MAX_ADDRESSES
+    ScraperConfig.BATCH_MAX_ADDRESSES = 2
+    try:
+        status, _, checked = post_batch(json=[PADARIA, SALAO, CLINICA])
+    finally:
+        ScraperConfig.BATCH_MAX_ADDRESSES = original
+    assert status == 413 and not checked, (status, checked)
+    print("✓ acima do limite: 413 sem verificar nenhum endereço")
+
+    for name, kwargs in {'lote vazio': dict(json=[]), 'formato inválido': dict(json={'maps_addresses': 'texto'})}.items():
+        status, _, checked = post_batch(**kwargs)
+        assert status == 400 and not checked, (name, status)
+        print(f"✓ {name}: 400")
+
+
+if __name__ == "__main__":
+    test_duplicates_and_errors()
+    test_timed_out_address()
+    test_input_formats()
+    test_rejected_input()
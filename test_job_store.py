@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Script para testar a fila de jobs assíncronos (JobStore + JobRunner)
+"""
+
+import os
+import time
+import tempfile
+
+from job_store import JobRunner, JobStore
+
+
+class NoDriverAvailable(Exception):
+    pass
+
+
+def wait_finished(store, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} não terminou")
+
+
+def test_jobs_run_and_persist():
+    print("=== Testando execução e persistência dos jobs ===")
+    db_path = os.path.join(tempfile.mkdtemp(), "jobs.db")
+    store = JobStore(db_path)
+
+    attempts = []
+
+    def flaky(payload):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise NoDriverAvailable("nenhum driver livre")
+        return {'has_ads': True, 'address': payload['maps_address']}
+
+    def broken(payload):
+        raise RuntimeError("falha na busca")
+
+    runner = JobRunner(store, {'has_ads': flaky, 'broken': broken}, workers=2, retry_on=(NoDriverAvailable,))
+    runner.start()
+
+    ok = runner.submit('has_ads', {'maps_address': 'Padaria Pão Bom - Copacabana'})
+    failed = runner.submit('broken', {})
+
+    job = wait_finished(store, ok)
+    assert job['status'] == 'done' and job['result']['has_ads'] is True, job
+    assert job['attempts'] == 2, "job deveria voltar para a fila quando não há driver"
+    print(f"✓ job concluído após {job['attempts']} tentativas: {job['result']}")
+
+    job = wait_finished(store, failed)
+    assert job['status'] == 'failed' and 'falha na busca' in job['error'], job
+    print(f"✓ job com erro marcado como falho: {job['error']}")
+
+    # Um novo processo lê os resultados do mesmo banco
+    assert JobStore(db_path).get(ok)['result'] == {'has_ads': True, 'address': 'Padaria Pão Bom - Copacabana'}
+    print("✓ resultados sobrevivem a um reinício")
+
+
+def test_unfinished_jobs_resume():
+    print("\n=== Testando retomada de jobs interrompidos ===")
+    db_path = os.path.join(tempfile.mkdtemp(), "jobs.db")
+    store = JobStore(db_path)
+
+    # Simula um processo que parou no meio de um job
+    interrupted = store.create('has_ads', {'maps_address': 'Academia Fit'})
+    assert store.claim_next()['job_id'] == interrupted
+    waiting = store.create('has_ads', {'maps_address': 'Pizzaria Bella'})
+
+    runner = JobRunner(JobStore(db_path), {'has_ads': lambda payload: {'has_ads': False}}, workers=1)
+    runner.start()
+
+    for job_id in (interrupted, waiting):
+        job = wait_finished(store, job_id)
+        assert job['status'] == 'done', job
+    print(f"✓ jobs retomados após reinício: {store.stats()}")
+
+
+def test_shared_queue():
+    print("\n=== Testando fila compartilhada entre processos ===")
+    db_path = os.path.join(tempfile.mkdtemp(), "jobs.db")
+    executions = []
+
+    def handler(payload):
+        executions.append(payload['n'])
+        time.sleep(0.01)
+        return payload['n']
+
+    # Dois runners no mesmo banco, como dois workers do gunicorn
+    runners = [JobRunner(JobStore(db_path), {'count': handler}, workers=3, poll_interval=0.05) for _ in range(2)]
+    for runner in runners:
+        runner.start(resume=False)
+    job_ids = [runners[n % 2].submit('count', {'n': n}) for n in range(30)]
+
+    store = JobStore(db_path)
+    for job_id in job_ids:
+        assert wait_finished(store, job_id)['status'] == 'done'
+    for runner in runners:
+        runner.stop()
+
+    assert sorted(executions) == list(range(30)), "cada job deve executar exatamente uma vez"
+    print(f"✓ {len(job_ids)} jobs executados uma única vez por {len(runners)} runners")
+
+
+if __name__ == "__main__":
+    test_jobs_run_and_persist()
+    test_unfinished_jobs_resume()
+    test_shared_queue()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Script para testar as buscas em abas (search_keywords_in_tabs) e o agrupamento
+das buscas iguais (keyword_flights) sem abrir o Chrome
+"""
+
+import itertools
+import threading
+from concurrent.futures import Future
+
+import facebook_ads_scraper
+from facebook_ads_scraper import FacebookAdsLibraryScraper, SearchError, keyword_flights
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind):
+        handle = f"aba-{next(self.driver.ids)}"
+        self.driver.handles.append(handle)
+        self.driver.current_window_handle = handle
+
+    def window(self, handle):
+        assert handle in self.driver.handles, handle
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """Só as janelas: o conteúdo das abas vem dos métodos substituídos no scraper"""
+
+    def __init__(self):
+        self.ids = itertools.count()
+        self.handles = ['principal']
+        self.current_window_handle = 'principal'
+        self.switch_to = FakeSwitchTo(self)
+
+    def close(self):
+        self.handles.remove(self.current_window_handle)
+
+
+def make_scraper(parse_together):
+    """Scraper cujas abas carregam na hora e cujo parsing termina só quando
+    ``parse_together`` snapshots foram capturados (todos ao mesmo tempo)"""
+    scraper = FacebookAdsLibraryScraper()
+    scraper.driver = FakeDriver()
+    scraper.navigate = lambda url, wait=True: None
+    scraper._set_blocked_urls = lambda enabled: True
+    scraper.get_page_state = lambda driver: {'ad_count': 1, 'height': 100, 'no_results': False}
+
+    pending = []
+
+    def submit(state, max_results, match_only=False):
+        future = Future()
+        pending.append(future)
+        if len(pending) == parse_together:
+            for number, done in enumerate(pending):
+                done.set_result([{'advertiser_name': f'Anunciante {number}', 'ad_text': 'Promoção', 'ad_id': str(number)}])
+        return future
+
+    scraper._submit_keyword_results = submit
+    return scraper
+
+
+def test_closing_after_first_result_lands_every_flight():
+    print("=== Testando encerrar o gerador no primeiro resultado ===")
+    original_cache = facebook_ads_scraper.search_cache
+    facebook_ads_scraper.search_cache = None
+    try:
+        scraper = make_scraper(parse_together=2)
+        results = scraper.search_keywords_in_tabs(['padaria pão bom', 'padaria pão bom rio de janeiro'])
+
+        # Como has_ads faz ao encontrar uma correspondência
+        index, ads = next(results)
+        results.close()
+    finally:
+        facebook_ads_scraper.search_cache = original_cache
+
+    assert ads, ads
+    assert keyword_flights.stats()['in_flight'] == 0, keyword_flights.stats()
+    assert scraper.driver.handles == ['principal'], scraper.driver.handles
+    print(f"✓ busca {index} entregue e nenhuma busca presa: {keyword_flights.stats()}")
+
+
+def test_cancelled_search_in_other_thread_is_redone():
+    print("\n=== Testando busca de outra thread cancelada no meio ===")
+    original_cache = facebook_ads_scraper.search_cache
+    facebook_ads_scraper.search_cache = None
+    try:
+        scraper = make_scraper(parse_together=1)
+        query = 'padaria pão bom copacabana'
+        # Outra thread (com outro prazo) já está fazendo a mesma busca e é cancelada
+        key = scraper._keyword_flight_key(query, 20, False, False)
+        flight, leader = keyword_flights.join(key)
+        assert leader
+        cancel = threading.Timer(0.1, lambda: keyword_flights.land(
+            key, flight, error=SearchError(f"Busca cancelada: {query}"), retry=True))
+        cancel.start()
+        results = list(scraper.search_keywords_in_tabs([query], report_errors=True))
+        cancel.join()
+    finally:
+        facebook_ads_scraper.search_cache = original_cache
+
+    # O cancelamento não chega a quem ainda tem prazo: a busca é refeita numa aba
+    assert len(results) == 1 and results[0][1], results
+    assert keyword_flights.stats()['in_flight'] == 0, keyword_flights.stats()
+    print(f"✓ busca refeita em aba: {results[0][1][0]['advertiser_name']}")
+
+
+if __name__ == "__main__":
+    test_closing_after_first_result_lands_every_flight()
+    test_cancelled_search_in_other_thread_is_redone()
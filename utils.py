@@ -1,10 +1,20 @@
 import json
 import csv
 import pandas as pd
-from datetime import datetime
-from typing import List, Dict
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import gzip
 import hashlib
+import logging
 import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+import uuid
+
+logger = logging.getLogger(__name__)
 
 class DataExporter:
     """Classe para exportar dados em diferentes formatos"""
@@ -34,34 +44,637 @@ class DataExporter:
         df.to_excel(filename, index=False)
 
 class CacheManager:
-    """Gerencia cache para evitar requisições desnecessárias"""
+    """Gerencia cache para evitar requisições desnecessárias
+    
+    Cada entrada expira após ``ttl_seconds`` e é gravada em disco em um arquivo
+    próprio, em subdiretórios por prefixo da chave (``ab/cd/<chave>.json``) para
+    que nenhum diretório cresça demais. A gravação é atômica (arquivo temporário
+    + rename) e o horário de modificação do arquivo guarda a validade, então a
+    limpeza só precisa de ``stat``. Um índice LRU em memória guarda até
+    ``max_entries`` entradas; quando o limite é atingido a menos usada sai da
+    memória, mas o arquivo fica (o diretório é compartilhado pelos processos e
+    outro pode estar usando a entrada): o espaço em disco é limitado só por
+    ``sweep``. Com ``cache_dir=None`` o cache fica só em memória.
+    """
     
-    def __init__(self, cache_dir: str = "cache"):
+    def __init__(self, cache_dir: str = "cache", ttl_seconds: float = 24 * 3600,
+                 max_entries: int = 1000, compress: bool = False, max_bytes: int = 0,
+                 sweep_interval: float = 0):
         self.cache_dir = cache_dir
-        if not os.path.exists(cache_dir):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        if cache_dir and not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
+        
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # chave -> (expira em, dados)
+        self._sweeper = None
+        self._stop_sweeper = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.corrupted = 0
+        self.swept = 0
     
-    def get_cache_key(self, query: str, location: str) -> str:
-        """Gera chave única para cache"""
-        key_string = f"{query}_{location}_{datetime.now().strftime('%Y-%m-%d')}"
+    def get_cache_key(self, query: str, location: str, namespace: str = "") -> str:
+        """Gera chave única para cache (a validade é controlada pelo TTL)"""
+        key_string = f"{namespace}_{query}_{location}"
         return hashlib.md5(key_string.encode()).hexdigest()
     
-    def get_cached_data(self, cache_key: str) -> Dict:
-        """Recupera dados do cache"""
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
+    def get_cached_data(self, cache_key: str) -> Optional[Any]:
+        """Recupera dados do cache, ou None se não existem ou expiraram"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+        
+        if entry:
+            # Só a cópia em memória expirou: outro processo pode ter renovado o arquivo
+            with self._lock:
+                if self._entries.get(cache_key) is entry:
+                    del self._entries[cache_key]
+        
+        stored = self._read_file(cache_key)
+        if stored is not None and stored[0] <= now:
+            self._remove_expired_file(cache_key, now)
+        with self._lock:
+            if stored is None or stored[0] <= now:
+                self.misses += 1
                 return None
-        return None
+            self.hits += 1
+        
+        self._remember(cache_key, *stored)
+        return stored[1]
+    
+    def save_to_cache(self, cache_key: str, data: Any, ttl_seconds: Optional[float] = None):
+        """Salva dados no cache (``ttl_seconds`` substitui o TTL padrão)"""
+        expires_at = time.time() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        if self.cache_dir:
+            try:
+                self._write_file(cache_key, expires_at, data)
+            except Exception as e:
+                logger.error(f"Erro ao salvar cache: {e}")
+        
+        self._remember(cache_key, expires_at, data)
+    
+    def coordinate(self, cache_key: str, fn: Callable[[], Any], deadline: Optional["Deadline"] = None) -> Any:
+        """Executa ``fn`` (cache local: não há outros processos para coordenar)"""
+        return fn()
+    
+    def delete(self, cache_key: str):
+        """Remove uma entrada do cache"""
+        with self._lock:
+            self._entries.pop(cache_key, None)
+        self._remove_file(cache_key)
+    
+    def _remember(self, cache_key: str, expires_at: float, data: Any):
+        """Coloca a entrada no índice LRU, tirando da memória as menos usadas acima do limite"""
+        with self._lock:
+            self._entries[cache_key] = (expires_at, data)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def _path(self, cache_key: str) -> str:
+        extension = '.json.gz' if self.compress else '.json'
+        return os.path.join(self.cache_dir, cache_key[:2], cache_key[2:4], f"{cache_key}{extension}")
+    
+    def _write_file(self, cache_key: str, expires_at: float, data: Any):
+        """Grava em um temporário no mesmo diretório, com fsync, e troca com os.replace (atômico)"""
+        path = self._path(cache_key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        
+        payload = json.dumps({'expires_at': expires_at, 'data': data},
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if self.compress:
+            payload = gzip.compress(payload, compresslevel=5)
+        
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                # Dados no disco antes do rename: uma queda não deixa um arquivo vazio no lugar
+                f.flush()
+                os.fsync(f.fileno())
+            # A validade fica no mtime para a limpeza não precisar abrir o arquivo
+            os.utime(temp_path, (expires_at, expires_at))
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _read_file(self, cache_key: str) -> Optional[Tuple[float, Any]]:
+        if not self.cache_dir:
+            return None
+        path = self._path(cache_key)
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Erro ao ler cache {cache_key}: {e}")
+            return None
+        
+        try:
+            if self.compress:
+                payload = gzip.decompress(payload)
+            stored = json.loads(payload.decode('utf-8'))
+            return stored['expires_at'], stored['data']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Entrada de cache corrompida removida ({cache_key}): {e}")
+            with self._lock:
+                self.corrupted += 1
+            self._remove_file(cache_key)
+            return None
+    
+    def _remove_expired_file(self, cache_key: str, now: float):
+        """Remove o arquivo só se a validade dele (mtime) também passou"""
+        path = self._path(cache_key)
+        try:
+            if os.stat(path).st_mtime <= now:
+                os.remove(path)
+        except OSError:
+            pass
+    
+    def _remove_file(self, cache_key: str):
+        if not self.cache_dir:
+            return
+        try:
+            os.remove(self._path(cache_key))
+        except OSError:
+            pass
+    
+    def start_sweeper(self):
+        """Inicia a limpeza periódica em segundo plano (TTL e limite de bytes)"""
+        if not self.cache_dir or self.sweep_interval <= 0 or (self._sweeper and self._sweeper.is_alive()):
+            return
+        self._stop_sweeper.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="cache-sweeper", daemon=True)
+        self._sweeper.start()
+    
+    def stop_sweeper(self):
+        self._stop_sweeper.set()
+    
+    def _sweep_loop(self):
+        while not self._stop_sweeper.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Erro na limpeza do cache: {e}")
+    
+    def sweep(self) -> Dict:
+        """Remove entradas expiradas e, acima de ``max_bytes``, as que expiram antes"""
+        now = time.time()
+        removed = 0
+        live = []  # (expira em, tamanho, caminho)
+        
+        for path, stat in self._iter_files():
+            if path.endswith('.tmp'):
+                # Sobra de uma gravação interrompida
+                if now - stat.st_ctime > 3600:
+                    removed += self._unlink(path)
+            elif stat.st_mtime <= now:
+                removed += self._unlink(path)
+            else:
+                live.append((stat.st_mtime, stat.st_size, path))
+        
+        total_bytes = sum(size for _, size, _ in live)
+        if self.max_bytes and total_bytes > self.max_bytes:
+            live.sort()
+            for expires_at, size, path in live:
+                if total_bytes <= self.max_bytes:
+                    break
+                if self._unlink(path):
+                    removed += 1
+                    total_bytes -= size
+        
+        with self._lock:
+            self.swept += removed
+        if removed:
+            logger.info(f"Limpeza do cache: {removed} arquivos removidos, {total_bytes / 1024 / 1024:.1f} MB em uso")
+        return {'removed': removed, 'bytes': total_bytes}
+    
+    def _iter_files(self):
+        """Percorre os arquivos dos subdiretórios do cache (ignora outros arquivos da raiz)"""
+        for first in os.scandir(self.cache_dir):
+            if not (first.is_dir() and len(first.name) == 2):
+                continue
+            for second in os.scandir(first.path):
+                if not second.is_dir():
+                    continue
+                for entry in os.scandir(second.path):
+                    if entry.is_file():
+                        try:
+                            yield entry.path, entry.stat()
+                        except OSError:
+                            continue
+    
+    @staticmethod
+    def _unlink(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': 'file' if self.cache_dir else 'memory',
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'corrupted': self.corrupted,
+                'swept': self.swept
+            }
+
+class RedisCacheManager:
+    """Cache compartilhado no Redis, com a mesma interface do CacheManager
+    
+    Vários containers da API usam as mesmas entradas (a validade fica no TTL da
+    chave no Redis). ``coordinate`` usa um lock no Redis para que só um processo
+    faça a mesma busca por vez: os outros esperam o resultado aparecer no cache.
+    O lock dura o prazo de quem faz a busca mais ``lock_margin`` (para salvar o
+    resultado); ``lock_timeout`` vale para quem não tem prazo.
+    Falhas de conexão são tratadas como cache vazio, sem derrubar a requisição.
+    O pacote ``redis`` só é necessário quando nenhum ``client`` é informado.
+    """
+    
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl_seconds: float = 24 * 3600,
+                 compress: bool = False, prefix: str = "geo_ads:", lock_timeout: float = 600,
+                 lock_margin: float = 15, client: Any = None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url, socket_timeout=5, socket_connect_timeout=5)
+        
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.compress = compress
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self.lock_margin = lock_margin
+        
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.coordinated = 0
+    
+    def get_cache_key(self, query: str, location: str, namespace: str = "") -> str:
+        """Gera chave única para cache (a validade é controlada pelo TTL)"""
+        key_string = f"{namespace}_{query}_{location}"
+        return hashlib.md5(key_string.encode()).hexdigest()
+    
+    def get_cached_data(self, cache_key: str) -> Optional[Any]:
+        """Recupera dados do cache, ou None se não existem ou expiraram"""
+        data = self._get(cache_key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+    
+    def save_to_cache(self, cache_key: str, data: Any, ttl_seconds: Optional[float] = None):
+        """Salva dados no cache (``ttl_seconds`` substitui o TTL padrão)"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+        
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if self.compress:
+            payload = gzip.compress(payload, compresslevel=5)
+        try:
+            self.client.set(self._key(cache_key), payload, px=int(ttl * 1000))
+        except Exception as e:
+            self._error("salvar", e)
+    
+    def delete(self, cache_key: str):
+        """Remove uma entrada do cache"""
+        try:
+            self.client.delete(self._key(cache_key))
+        except Exception as e:
+            self._error("remover", e)
+    
+    def coordinate(self, cache_key: str, fn: Callable[[], Any], deadline: Optional["Deadline"] = None) -> Any:
+        """Executa ``fn`` com um lock distribuído por chave
+        
+        Quem não obtém o lock espera (até o fim do ``deadline`` ou, sem prazo, até
+        ``lock_timeout``) o resultado do processo que está fazendo a busca. O lock
+        de quem executa vence junto com o ``deadline`` dele (mais ``lock_margin``),
+        e não no meio da busca; o de um processo que morreu dura só até esse prazo.
+        Se a busca terminar sem salvar nada (resultado vazio ou erro) ou o lock
+        expirar, o chamador executa ``fn`` por conta própria; se o prazo acabar
+        antes, levanta DeadlineExceeded.
+        A espera não deve ocorrer com um driver emprestado: coordene antes de obtê-lo.
+        """
+        lock_key = f"{self.prefix}lock:{cache_key}"
+        token = uuid.uuid4().hex
+        ttl = deadline.remaining() + self.lock_margin if deadline and deadline.bounded else self.lock_timeout
+        try:
+            acquired = self.client.set(lock_key, token, nx=True, px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            self._error("obter lock", e)
+            return fn()
+        
+        if acquired:
+            try:
+                return fn()
+            finally:
+                self._release(lock_key, token)
+        
+        # Espera enquanto o lock existir (ele vence com o prazo de quem o obteve), até o próprio prazo
+        wait_until = time.monotonic() + (deadline.remaining() if deadline and deadline.bounded else self.lock_timeout)
+        while time.monotonic() < wait_until:
+            time.sleep(min(0.25, max(wait_until - time.monotonic(), 0)))
+            data = self._get(cache_key)
+            if data is not None:
+                with self._lock:
+                    self.coordinated += 1
+                    self.hits += 1
+                return data
+            try:
+                if not self.client.exists(lock_key):
+                    break
+            except Exception as e:
+                self._error("consultar lock", e)
+                break
+        
+        if deadline:
+            deadline.check("receber o resultado da mesma busca em outro processo")
+        return fn()
+    
+    def _release(self, lock_key: str, token: str):
+        """Libera o lock só se ele ainda for nosso (pode ter expirado e sido pego por outro)"""
+        try:
+            current = self.client.get(lock_key)
+            if current is not None and _as_text(current) == token:
+                self.client.delete(lock_key)
+        except Exception as e:
+            self._error("liberar lock", e)
+    
+    def _key(self, cache_key: str) -> str:
+        return f"{self.prefix}cache:{cache_key}"
+    
+    def _get(self, cache_key: str) -> Optional[Any]:
+        try:
+            payload = self.client.get(self._key(cache_key))
+        except Exception as e:
+            self._error("ler", e)
+            return None
+        if payload is None:
+            return None
+        
+        try:
+            if self.compress:
+                payload = gzip.decompress(payload)
+            return json.loads(payload)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrada de cache corrompida no Redis ({cache_key}): {e}")
+            self.delete(cache_key)
+            return None
+    
+    def _error(self, action: str, error: Exception):
+        with self._lock:
+            self.errors += 1
+        logger.warning(f"Erro ao {action} no cache Redis: {error}")
+    
+    def start_sweeper(self):
+        """Nada a fazer: o Redis expira as chaves sozinho"""
+    
+    def stop_sweeper(self):
+        pass
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': 'redis',
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'coordinated': self.coordinated,
+                'errors': self.errors
+            }
+
+def _as_text(value: Any) -> str:
+    return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+def create_cache_manager(backend: str = "file", cache_dir: str = "cache", ttl_seconds: float = 24 * 3600,
+                         max_entries: int = 1000, compress: bool = False, max_bytes: int = 0,
+                         sweep_interval: float = 0, redis_url: str = "redis://localhost:6379/0",
+                         lock_timeout: float = 600):
+    """Cria o cache do backend escolhido ("file", "memory" ou "redis")
+    
+    Se o Redis não puder ser usado (pacote ausente), cai para o cache em disco.
+    """
+    if backend == "redis":
+        try:
+            return RedisCacheManager(redis_url, ttl_seconds=ttl_seconds, compress=compress,
+                                     lock_timeout=lock_timeout)
+        except ImportError:
+            logger.warning("Pacote redis não instalado; usando cache em disco")
+            backend = "file"
     
-    def save_to_cache(self, cache_key: str, data: Dict):
-        """Salva dados no cache"""
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
+    if backend not in ("file", "memory"):
+        raise ValueError(f"Backend de cache desconhecido: {backend}")
+    
+    return CacheManager(
+        cache_dir=cache_dir if backend == "file" else None,
+        ttl_seconds=ttl_seconds,
+        max_entries=max_entries,
+        compress=compress,
+        max_bytes=max_bytes,
+        sweep_interval=sweep_interval
+    )
+
+def normalize_query(text: str) -> str:
+    """Normaliza uma consulta para comparação (minúsculas, sem acentos e espaços extras)"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+class _Flight:
+    """Chamada em andamento compartilhada pelos chamadores da mesma chave"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # O líder desistiu (cancelado ou sem prazo) antes de um resultado conclusivo
+        self.retry = False
+
+class SingleFlight:
+    """Agrupa chamadas simultâneas com a mesma chave em uma única execução
+    
+    O primeiro chamador executa a função; quem chega com a mesma chave enquanto
+    ela está em andamento espera e recebe o mesmo resultado (ou a mesma exceção).
+    A espera respeita o ``deadline`` de cada chamador (DeadlineExceeded quando
+    termina antes). Se o líder foi cancelado ou o prazo dele terminou antes de um
+    resultado conclusivo, quem ainda tem prazo não herda o erro nem o resultado
+    parcial: executa de novo (ou aguarda quem assumiu a execução). O resultado é
+    compartilhado entre os chamadores e não deve ser alterado.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.retried = 0
+    
+    def do(self, key: Hashable, fn: Callable[[], Any], deadline: Optional["Deadline"] = None,
+           conclusive: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Executa ``fn`` ou aguarda (até o ``deadline``) a execução já em andamento para ``key``
+        
+        ``conclusive`` diz se um resultado obtido com o prazo do líder esgotado vale
+        para os demais (sem ele, nenhum resultado obtido fora do prazo vale).
+        """
+        while True:
+            flight, leader = self.join(key)
+            if leader:
+                break
+            self._await(flight, deadline)
+            if not self.should_retry(flight, deadline):
+                if flight.error:
+                    raise flight.error
+                return flight.result
+        
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            result = fn()
         except Exception as e:
-            print(f"Erro ao salvar cache: {e}")
\ No newline at end of file
+            self.land(key, flight, error=e,
+                      retry=isinstance(e, DeadlineExceeded) or bool(deadline and deadline.expired()))
+            raise
+        except BaseException as e:
+            # Interrompido (KeyboardInterrupt, encerramento do worker): outros podem assumir
+            self.land(key, flight, error=e, retry=True)
+            raise
+        expired = bool(deadline and deadline.expired())
+        self.land(key, flight, result, retry=expired and not (conclusive and conclusive(result)))
+        return result
+    
+    def join(self, key: Hashable) -> Tuple[_Flight, bool]:
+        """Entra na execução de ``key`` sem bloquear
+        
+        Retorna (execução, True) quando o chamador é o primeiro e deve executar
+        a busca e encerrá-la com ``land``; senão, a execução em andamento, cujo
+        ``done`` indica quando o resultado está disponível (conferir antes
+        ``should_retry``). Usado por quem não pode bloquear, como o escalonador de abas.
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.executed += 1
+            return flight, True
+    
+    def wait(self, flight: _Flight, deadline: Optional["Deadline"] = None) -> Any:
+        """Aguarda o resultado de uma execução em andamento (ou levanta a sua exceção)"""
+        self._await(flight, deadline)
+        if flight.error:
+            raise flight.error
+        return flight.result
+    
+    def _await(self, flight: _Flight, deadline: Optional["Deadline"]):
+        timeout = deadline.remaining() if deadline and deadline.bounded else None
+        if not flight.done.wait(timeout):
+            with self._lock:
+                self.expired += 1
+            raise DeadlineExceeded(f"Prazo de {deadline.seconds:g}s esgotado aguardando a mesma busca em andamento")
+    
+    def should_retry(self, flight: _Flight, deadline: Optional["Deadline"] = None) -> bool:
+        """Indica se quem aguardou ``flight`` deve executar de novo em vez de usar o resultado
+        
+        Só quando o líder desistiu antes de um resultado conclusivo e quem aguardou
+        ainda tem prazo (com o prazo esgotado, o resultado parcial é o que sobra).
+        """
+        if not flight.retry or (deadline and deadline.expired()):
+            return False
+        with self._lock:
+            self.retried += 1
+        return True
+    
+    def land(self, key: Hashable, flight: _Flight, result: Any = None, error: Optional[BaseException] = None,
+             retry: bool = False):
+        """Encerra a execução iniciada com ``join`` e entrega o resultado a quem espera
+        
+        ``retry`` marca o resultado (ou erro) como não conclusivo: quem aguardava
+        com prazo restante executa de novo.
+        """
+        flight.result = result
+        flight.error = error
+        flight.retry = retry
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'expired': self.expired,
+                'retried': self.retried,
+                'in_flight': len(self._flights)
+            }
+
+class DeadlineExceeded(Exception):
+    """O prazo da requisição terminou antes de a operação concluir"""
+
+class Deadline:
+    """Prazo de uma requisição, consultado entre as etapas do scraping
+    
+    ``Deadline(None)`` não expira. As esperas do scraper usam ``clamp`` para não
+    passar do tempo restante e os laços (scroll, extração, estratégias) param
+    quando ``expired()`` fica verdadeiro, devolvendo o que já foi coletado.
+    """
+    
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+    
+    @property
+    def bounded(self) -> bool:
+        return self.expires_at is not None
+    
+    def remaining(self) -> float:
+        """Segundos restantes (infinito quando não há prazo)"""
+        if self.expires_at is None:
+            return float('inf')
+        return max(self.expires_at - time.monotonic(), 0.0)
+    
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+    
+    def clamp(self, timeout: float) -> float:
+        """Limita uma espera ao tempo restante"""
+        return min(timeout, self.remaining())
+    
+    def check(self, step: str):
+        """Levanta DeadlineExceeded se o prazo terminou antes de ``step``"""
+        if self.expired():
+            raise DeadlineExceeded(f"Prazo de {self.seconds:g}s esgotado antes de {step}")